@@ -0,0 +1,215 @@
+"""Gráficos del juego, cargados una sola vez por proceso.
+
+Cada recurso (casillas, animaciones, trampa, corazones, energía) se carga,
+convierte y escala la primera vez que se pide y después se devuelve el
+mismo objeto, así cambiar de modo no vuelve a leer ningún PNG.
+
+Los archivos con el mismo contenido y el mismo tamaño final comparten una
+sola Surface (varios cuadros de las animaciones son idénticos, y jugador y
+enemigo usan el mismo cargador).
+
+Si existe ATLAS_FILE (armado con `python atlas.py`) las imágenes salen de
+ahí: el archivo se lee de una vez y cada imagen es una subsurface de una
+hoja ya escalada. Lo que no esté en el atlas se carga del PNG como siempre.
+
+Mientras se muestra el menú, prewarm_step() va cargando un recurso por
+cuadro para que al elegir un modo ya esté todo listo.
+"""
+import hashlib
+import io
+import json
+import struct
+import zlib
+
+import pygame
+
+from tiles import CAMINO, MURO, TUNEL, LIANA, SALIDA
+from constants import *
+
+ANIMACIONES = (
+    "idle",          # 0
+    "running_up",    # 1
+    "running_down",  # 2
+    "running_left",  # 3
+    "running_right"  # 4
+)
+FRAMES_POR_ANIMACION = 4
+
+_por_ruta = {}        # (ruta, tamaño) -> Surface
+_por_contenido = {}   # (hash del archivo, tamaño) -> Surface
+_recursos = {}        # nombre -> recurso ya armado
+_atlas = None         # (ruta, tamaño) -> subsurface del atlas; None = sin leer
+
+# formato del atlas:
+#   cabecera : ATLAS_MAGIA + largo del índice (uint32)
+#   índice   : JSON con las hojas (tamaño, alfa, largo comprimido) y las
+#              imágenes [ruta, tamaño, hoja, x, y, ancho, alto]
+#   datos    : píxeles de cada hoja (RGBA o RGB) comprimidos con zlib
+ATLAS_MAGIA = b"LABATLS1"
+ATLAS_CABECERA = struct.Struct("<8sI")
+
+
+# ---------- ATLAS ----------
+def read_atlas(path=ATLAS_FILE):
+    """{(ruta, tamaño): Surface} con las imágenes del atlas."""
+    with open(path, "rb") as f:
+        datos = f.read()
+    magia, largo = ATLAS_CABECERA.unpack_from(datos, 0)
+    if magia != ATLAS_MAGIA:
+        raise ValueError(f"{path} no es un atlas de gráficos")
+    inicio = ATLAS_CABECERA.size
+    indice = json.loads(datos[inicio:inicio + largo])
+
+    hojas = []
+    offset = inicio + largo
+    for hoja in indice["sheets"]:
+        pixeles = zlib.decompress(datos[offset:offset + hoja["len"]])
+        offset += hoja["len"]
+        if hoja["alpha"]:
+            img = pygame.image.frombuffer(pixeles, hoja["size"], "RGBA")
+            hojas.append(img.convert_alpha())
+        else:
+            # casillas opacas: sin canal alfa, el blit es una copia directa
+            img = pygame.image.frombuffer(pixeles, hoja["size"], "RGB")
+            hojas.append(img.convert())
+
+    imagenes = {}
+    subsurfaces = {}
+    for ruta, size, hoja, x, y, w, h in indice["images"]:
+        rect = (hoja, x, y, w, h)
+        if rect not in subsurfaces:
+            subsurfaces[rect] = hojas[hoja].subsurface((x, y, w, h))
+        imagenes[(ruta, tuple(size) if size else None)] = subsurfaces[rect]
+    return imagenes
+
+
+def _imagen_atlas(clave):
+    global _atlas
+    if _atlas is None:
+        try:
+            _atlas = read_atlas()
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Atlas {ATLAS_FILE} ignorado: {e}")
+            _atlas = {}
+    return _atlas.get(clave)
+
+
+# ---------- IMÁGENES ----------
+def image(path, size=None):
+    """Imagen convertida (y escalada a `size` si se da), cacheada."""
+    clave = (path, size)
+    img = _por_ruta.get(clave)
+    if img is not None:
+        return img
+
+    img = _imagen_atlas(clave)
+    if img is not None:
+        _por_ruta[clave] = img
+        return img
+
+    with open(path, "rb") as f:
+        datos = f.read()
+    clave_contenido = (hashlib.blake2b(datos, digest_size=16).digest(), size)
+    img = _por_contenido.get(clave_contenido)
+    if img is None:
+        img = pygame.image.load(io.BytesIO(datos), path).convert_alpha()
+        if size is not None:
+            img = pygame.transform.scale(img, size)
+        _por_contenido[clave_contenido] = img
+
+    _por_ruta[clave] = img
+    return img
+
+
+def _recurso(nombre, cargar):
+    valor = _recursos.get(nombre)
+    if valor is None:
+        valor = _recursos[nombre] = cargar()
+    return valor
+
+
+# ---------- RECURSOS ----------
+def tiles():
+    def cargar():
+        size = (TILE_SIZE, TILE_SIZE)
+        return {
+            CAMINO: image("assets/tiles/1.png", size),
+            MURO:   image("assets/tiles/7.png", size),
+            TUNEL:  image("assets/tiles/8.png", size),
+            LIANA:  image("assets/tiles/0.png", size),
+            SALIDA: image("assets/tiles/9.png", size),
+        }
+    return _recurso("tiles", cargar)
+
+
+def animations(folder_name):
+    """Lista [animación][cuadro] de assets/<folder_name>/<animación>/<i>.png."""
+    def cargar():
+        size = (TILE_SIZE * PLAYER_SCALE, TILE_SIZE * PLAYER_SCALE)
+        return [[image(f"assets/{folder_name}/{anim_name}/{i}.png", size)
+                 for i in range(FRAMES_POR_ANIMACION)]
+                for anim_name in ANIMACIONES]
+    return _recurso(("animations", folder_name), cargar)
+
+
+def player_animations():
+    return animations("player")
+
+
+def enemy_animations():
+    return animations("enemies")
+
+
+def trap_sprite():
+    return _recurso("trap", lambda: image("assets/tiles/2.png",
+                                          (TILE_SIZE, TILE_SIZE)))
+
+
+def hearts():
+    return _recurso("hearts", lambda: {
+        "full":  image("assets/hearts/0.png"),
+        "half":  image("assets/hearts/1.png"),
+        "empty": image("assets/hearts/2.png"),
+    })
+
+
+def energy_frames():
+    return _recurso("energy", lambda: [image(f"assets/energy/{i}.png")
+                                       for i in range(ENERGY_FRAMES)])
+
+
+# ---------- PRECARGA ----------
+_TODOS = (tiles, player_animations, enemy_animations, trap_sprite,
+          hearts, energy_frames)
+_PRECARGA = list(_TODOS)
+
+
+def prewarm_step():
+    """Carga el siguiente recurso que falte. Devuelve True si quedan más."""
+    if not _PRECARGA:
+        return False
+    _PRECARGA.pop(0)()
+    return bool(_PRECARGA)
+
+
+def prewarm():
+    """Carga todo de una vez."""
+    while prewarm_step():
+        pass
+
+
+def loaded_images():
+    """{(ruta, tamaño): Surface} de todo lo cargado hasta ahora."""
+    return dict(_por_ruta)
+
+
+def clear(use_atlas=True):
+    """Olvida todo lo cargado (p. ej. si cambia el modo de video). Con
+    use_atlas=False lo próximo se carga de los PNG aunque haya atlas."""
+    global _atlas
+    _atlas = None if use_atlas else {}
+    _por_ruta.clear()
+    _por_contenido.clear()
+    _recursos.clear()
+    _PRECARGA[:] = _TODOS
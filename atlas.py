@@ -0,0 +1,137 @@
+"""Atlas de gráficos: todos los PNG de assets/ ya escalados en un archivo.
+
+Arma las mismas imágenes que pide assets.py (con los tamaños de
+constants.py), las acomoda en dos hojas (una RGB para las casillas opacas y
+otra RGBA para lo que tiene transparencia) y las guarda con su índice en
+ATLAS_FILE. Al arrancar, assets.py lee ese archivo de una vez en vez de abrir,
+decodificar y escalar cada PNG. El formato está en assets.py.
+
+Hay que volver a armarlo si cambian los PNG, TILE_SIZE o PLAYER_SCALE (lo
+que no coincida se sigue cargando de los PNG).
+
+Uso:
+    python atlas.py build
+    python atlas.py info
+"""
+import argparse
+import json
+import os
+import zlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import assets
+from constants import ATLAS_FILE
+
+ANCHO_HOJA = 512
+
+
+def _es_opaca(surf):
+    w, h = surf.get_size()
+    return pygame.mask.from_surface(surf, 254).count() == w * h
+
+
+def _empaquetar(tamaños, ancho):
+    """Acomoda rectángulos en estantes. Devuelve las posiciones (en el
+    orden de `tamaños`) y el tamaño de la hoja."""
+    ancho = max([ancho] + [w for w, _ in tamaños])
+    orden = sorted(range(len(tamaños)), key=lambda i: -tamaños[i][1])
+
+    posiciones = [None] * len(tamaños)
+    x = y = alto_estante = 0
+    for i in orden:
+        w, h = tamaños[i]
+        if x + w > ancho:
+            x, y = 0, y + alto_estante
+            alto_estante = 0
+        posiciones[i] = (x, y)
+        x += w
+        alto_estante = max(alto_estante, h)
+    return posiciones, (ancho, y + alto_estante)
+
+
+def build(path=ATLAS_FILE, ancho=ANCHO_HOJA):
+    """Carga todo de los PNG y escribe el atlas. Devuelve el índice."""
+    assets.clear(use_atlas=False)
+    assets.prewarm()
+    imagenes = assets.loaded_images()
+    assets.clear()
+
+    # imágenes repetidas ya son la misma Surface: una sola vez en la hoja
+    unicas = list({id(s): s for s in imagenes.values()}.values())
+    grupos = {False: [], True: []}
+    for surf in unicas:
+        grupos[not _es_opaca(surf)].append(surf)
+
+    hojas, blobs = [], []
+    lugar = {}   # id(surf) -> (hoja, x, y)
+    for alpha, surfs in grupos.items():
+        if not surfs:
+            continue
+        posiciones, size = _empaquetar([s.get_size() for s in surfs], ancho)
+        if alpha:
+            hoja = pygame.Surface(size, pygame.SRCALPHA, 32)
+        else:
+            hoja = pygame.Surface(size, 0, 24)
+        for surf, (x, y) in zip(surfs, posiciones):
+            # MAX sobre la hoja en cero copia los píxeles tal cual, sin mezclar
+            hoja.blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            lugar[id(surf)] = (len(hojas), x, y)
+
+        blob = zlib.compress(
+            pygame.image.tobytes(hoja, "RGBA" if alpha else "RGB"), 9)
+        hojas.append({"size": list(size), "alpha": alpha, "len": len(blob)})
+        blobs.append(blob)
+
+    indice = {
+        "sheets": hojas,
+        "images": [[ruta, list(size) if size else None, *lugar[id(surf)],
+                    *surf.get_size()]
+                   for (ruta, size), surf in sorted(
+                       imagenes.items(), key=lambda kv: kv[0][0])],
+    }
+    datos_indice = json.dumps(indice, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(assets.ATLAS_CABECERA.pack(assets.ATLAS_MAGIA,
+                                           len(datos_indice)))
+        f.write(datos_indice)
+        for blob in blobs:
+            f.write(blob)
+    return indice
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Atlas de gráficos")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_build = sub.add_parser("build", help="armar el atlas desde assets/")
+    p_build.add_argument("path", nargs="?", default=ATLAS_FILE)
+    p_build.add_argument("--width", type=int, default=ANCHO_HOJA)
+
+    p_info = sub.add_parser("info", help="mostrar el contenido")
+    p_info.add_argument("path", nargs="?", default=ATLAS_FILE)
+
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    if args.cmd == "build":
+        indice = build(args.path, args.width)
+        print(f"{len(indice['images'])} imágenes en {args.path} "
+              f"({os.path.getsize(args.path)} bytes)")
+        for i, hoja in enumerate(indice["sheets"]):
+            print(f"  hoja {i}: {hoja['size'][0]}x{hoja['size'][1]} "
+                  f"{'RGBA' if hoja['alpha'] else 'RGB'}")
+    else:
+        imagenes = assets.read_atlas(args.path)
+        unicas = {id(s) for s in imagenes.values()}
+        print(f"{len(imagenes)} imágenes ({len(unicas)} distintas)")
+        for ruta, size in sorted(imagenes, key=lambda k: k[0])[:10]:
+            print(f"  {ruta} {size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Muchas partidas sin pantalla en paralelo, para ajustar la dificultad.
+
+Cada partida es independiente (su mapa, su semilla, sus constantes), así que
+se reparten entre procesos con multiprocessing.Pool. Con --set se prueba una
+grilla de valores de constants.py; todas las combinaciones juegan las mismas
+semillas, así las diferencias entre filas vienen de las constantes y no del
+azar:
+
+    python batch.py --mode escapa --games 500 --set ENEMY_SPEED=60,80,100 \\
+                    --set TRAP_COOLDOWN=3,5
+
+Al final imprime una tabla por combinación: victorias, muertes, tiempo de
+supervivencia, kills, salidas (cazador) y puntaje medio, y avisa si alguna
+constante de la grilla no cambió ningún resultado.
+"""
+import argparse
+import ast
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import constants
+from simulation import SIMULACIONES, ENTRADAS, create_world
+from constants import *
+
+_RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+# ---------- CONSTANTES ----------
+def leidas_al_jugar():
+    """Nombres que alguna función del juego lee al ejecutarse. Un override
+    solo tiene efecto en esos: los que se usan como valor por defecto de un
+    argumento o al importar un módulo quedan fijos antes de cambiarlos."""
+    nombres = set()
+    for archivo in sorted(os.listdir(_RAIZ)):
+        if not archivo.endswith(".py") or archivo == "constants.py":
+            continue
+        with open(os.path.join(_RAIZ, archivo), encoding="utf-8") as f:
+            arbol = ast.parse(f.read(), archivo)
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for sentencia in nodo.body:
+                    for n in ast.walk(sentencia):
+                        if isinstance(n, ast.Name) and \
+                                isinstance(n.ctx, ast.Load):
+                            nombres.add(n.id)
+    return nombres
+
+
+def parse_override(texto, leidas=None):
+    """"NOMBRE=v1,v2" -> (NOMBRE, [v1, v2]). Los valores son literales de
+    Python (80, 1.5, "dfs"). `leidas` es leidas_al_jugar(), para no
+    recalcularlo en cada --set."""
+    nombre, _, valores = texto.partition("=")
+    nombre = nombre.strip()
+    if not nombre.isupper() or not hasattr(constants, nombre):
+        raise ValueError(f"{nombre!r} no es una constante de constants.py")
+    if leidas is None:
+        leidas = leidas_al_jugar()
+    if nombre not in leidas:
+        raise ValueError(f"{nombre} no se puede cambiar desde batch: solo se "
+                         f"lee al importar o como valor por defecto")
+    lista = []
+    for v in valores.split(","):
+        try:
+            lista.append(ast.literal_eval(v.strip()))
+        except (ValueError, SyntaxError):
+            lista.append(v.strip())   # texto sin comillas
+    return nombre, lista
+
+
+def _modulos_del_juego():
+    for modulo in list(sys.modules.values()):
+        ruta = getattr(modulo, "__file__", None)
+        if ruta and os.path.dirname(os.path.abspath(ruta)) == _RAIZ:
+            yield modulo
+
+
+@contextmanager
+def overridden(overrides):
+    """Cambia constantes mientras dura el with. Los módulos hacen
+    `from constants import *`, así que se cambian en cada uno que las tenga
+    (las derivadas, como MAX_HEALTH, no se recalculan)."""
+    viejos = []
+    try:
+        for nombre, valor in overrides:
+            for modulo in _modulos_del_juego():
+                if hasattr(modulo, nombre):
+                    viejos.append((modulo, nombre, getattr(modulo, nombre)))
+                    setattr(modulo, nombre, valor)
+        yield
+    finally:
+        for modulo, nombre, valor in reversed(viejos):
+            setattr(modulo, nombre, valor)
+
+
+# ---------- UNA PARTIDA ----------
+def play_game(tarea):
+    """Juega una partida. `tarea` es (combinación, modo, semilla, overrides,
+    ticks, entrada, enemigos, motor); devuelve (combinación, resultado)."""
+    combinacion, mode, seed, overrides, ticks, entrada, num_enemies, engine = tarea
+    politica = ENTRADAS[entrada]
+    with overridden(overrides):
+        world = create_world(seed)
+        sim = SIMULACIONES[mode](world, seed=seed, num_enemies=num_enemies,
+                                 engine=engine)
+        rng = random.Random(seed)
+        for _ in range(ticks):
+            if sim.step(SIM_DT, politica(sim, rng)):
+                break
+
+    if mode == "escapa":
+        resultado = {
+            "won": sim.won,
+            "died": sim.player.is_dead(),
+            "kills": sim.enemies_killed_by_trap,
+            "exits": 0,
+            "score": sim.final_score(),
+        }
+    else:
+        resultado = {
+            "won": False,
+            "died": sim.player.is_dead(),
+            "kills": sim.kills,
+            "exits": sim.exits,
+            "score": sim.score,
+        }
+    resultado["time"] = sim.time
+    resultado["ticks"] = sim.ticks
+    return combinacion, resultado
+
+
+# ---------- LOTE ----------
+def run_batch(mode="escapa", games=100, seed=0, grid=(), ticks=7200,
+              entrada="exit", num_enemies=None, engine=None, workers=None):
+    """Juega `games` partidas por cada combinación de `grid` (lista de
+    (nombre, [valores])) repartidas en `workers` procesos (None = todos los
+    núcleos, 1 = en este proceso). Sin `num_enemies`/`engine` se usan
+    NUM_ENEMIES y ENEMY_ENGINE con los overrides de la combinación.
+    Devuelve (filas, dict con totales)."""
+    nombres = [nombre for nombre, _ in grid]
+    combinaciones = list(itertools.product(*(valores for _, valores in grid)))
+    tareas = [(c, mode, seed + i, tuple(zip(nombres, valores)), ticks,
+               entrada, num_enemies, engine)
+              for c, valores in enumerate(combinaciones)
+              for i in range(games)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tareas)))
+
+    acumulado = [[] for _ in combinaciones]
+    t0 = time.perf_counter()
+    if workers == 1:
+        resultados = map(play_game, tareas)
+        for c, r in resultados:
+            acumulado[c].append(r)
+    else:
+        # varias partidas por envío para no pagar el viaje entre procesos
+        # en cada una, pero no tantas como para que un proceso quede al final
+        # con todo el trabajo
+        chunk = max(1, len(tareas) // (workers * 8))
+        with multiprocessing.Pool(workers) as pool:
+            for c, r in pool.imap_unordered(play_game, tareas, chunk):
+                acumulado[c].append(r)
+    segundos = time.perf_counter() - t0
+
+    filas = []
+    for valores, partidas in zip(combinaciones, acumulado):
+        n = len(partidas)
+        filas.append({
+            "overrides": dict(zip(nombres, valores)),
+            "games": n,
+            "win_rate": sum(p["won"] for p in partidas) / n,
+            "death_rate": sum(p["died"] for p in partidas) / n,
+            "mean_time": sum(p["time"] for p in partidas) / n,
+            "mean_kills": sum(p["kills"] for p in partidas) / n,
+            "mean_exits": sum(p["exits"] for p in partidas) / n,
+            "mean_score": sum(p["score"] for p in partidas) / n,
+        })
+
+    total_ticks = sum(p["ticks"] for partidas in acumulado for p in partidas)
+    totales = {
+        "no_effect": sin_efecto(filas, nombres),
+        "mode": mode,
+        "games": len(tareas),
+        "workers": workers,
+        "seconds": segundos,
+        "games_per_second": len(tareas) / segundos if segundos else 0.0,
+        "ticks_per_second": total_ticks / segundos if segundos else 0.0,
+    }
+    return filas, totales
+
+
+def sin_efecto(filas, nombres):
+    """Constantes de la grilla que no cambiaron ningún resultado: con las
+    demás fijas, todos sus valores dan la misma fila."""
+    claves = ("win_rate", "death_rate", "mean_time", "mean_kills",
+              "mean_exits", "mean_score")
+    nulas = []
+    for nombre in nombres:
+        grupos = {}
+        for f in filas:
+            resto = tuple(v for k, v in f["overrides"].items() if k != nombre)
+            grupos.setdefault(resto, set()).add(tuple(f[k] for k in claves))
+        if len(grupos) < len(filas) and all(len(g) == 1 for g in grupos.values()):
+            nulas.append(nombre)
+    return nulas
+
+
+def format_table(filas, mode="escapa"):
+    encabezado = ["combinación", "partidas", "victorias", "muertes",
+                  "tiempo", "kills"]
+    if mode == "cazador":
+        encabezado.append("salidas")
+    encabezado.append("puntaje")
+
+    tabla = [encabezado]
+    for f in filas:
+        fila = [" ".join(f"{k}={v}" for k, v in f["overrides"].items())
+                or "(base)",
+                str(f["games"]),
+                f"{f['win_rate']:.1%}",
+                f"{f['death_rate']:.1%}",
+                f"{f['mean_time']:.1f}s",
+                f"{f['mean_kills']:.2f}"]
+        if mode == "cazador":
+            fila.append(f"{f['mean_exits']:.2f}")
+        fila.append(f"{f['mean_score']:.1f}")
+        tabla.append(fila)
+
+    anchos = [max(len(fila[i]) for fila in tabla) for i in range(len(encabezado))]
+    lineas = []
+    for j, fila in enumerate(tabla):
+        celdas = [fila[0].ljust(anchos[0])]
+        celdas += [c.rjust(a) for c, a in zip(fila[1:], anchos[1:])]
+        lineas.append("  ".join(celdas))
+        if j == 0:
+            lineas.append("  ".join("-" * a for a in anchos))
+    return "\n".join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partidas en paralelo para "
+                                                 "ajustar la dificultad")
+    parser.add_argument("--mode", choices=sorted(SIMULACIONES), default="escapa")
+    parser.add_argument("--games", type=int, default=100,
+                        help="partidas por combinación")
+    parser.add_argument("--ticks", type=int, default=7200,
+                        help="ticks máximos por partida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--input", choices=sorted(ENTRADAS), default="exit")
+    parser.add_argument("--enemies", type=int, default=None,
+                        help="por defecto NUM_ENEMIES (se puede usar --set)")
+    parser.add_argument("--engine", choices=("objects", "swarm"), default=None,
+                        help="por defecto ENEMY_ENGINE")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--set", action="append", default=[], metavar="NOMBRE=V1,V2",
+                        help="valores a probar de una constante (repetible)")
+    args = parser.parse_args(argv)
+
+    try:
+        leidas = leidas_al_jugar()
+        grid = [parse_override(s, leidas) for s in args.set]
+    except ValueError as e:
+        parser.error(str(e))
+
+    filas, r = run_batch(args.mode, args.games, args.seed, grid, args.ticks,
+                         args.input, args.enemies, args.engine, args.workers)
+    print(format_table(filas, args.mode))
+    print(f"\n{r['games']} partidas en {r['seconds']:.1f} s con "
+          f"{r['workers']} procesos -> {r['games_per_second']:.1f} partidas/s, "
+          f"{r['ticks_per_second']:.0f} ticks/s")
+    for nombre in r["no_effect"]:
+        print(f"aviso: {nombre} no cambió ningún resultado", file=sys.stderr)
+    return filas, r
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark de generación de mapas.
+
+Mide, para cada generador y tamaño, el tiempo del laberinto, el del post-paso
+de túneles/lianas y la memoria pico (tracemalloc, en una pasada aparte para
+no inflar los tiempos).
+
+Uso:
+    python benchmarks/bench_generation.py
+    python benchmarks/bench_generation.py --sizes 35x25 501x501 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import GENERADORES, generar_tuneles_y_lianas
+
+SIZES = ["35x25", "101x101", "501x501", "1001x1001", "2001x2001"]
+
+
+def parse_size(texto):
+    w, h = texto.lower().split("x")
+    return int(w), int(h)
+
+
+def generar(nombre, w, h, seed):
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    grid = GENERADORES[nombre](w, h, rng)
+    t1 = time.perf_counter()
+    generar_tuneles_y_lianas(grid, w, h, rng, excluir=((1, 1), (w - 2, h - 2)))
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1
+
+
+def memoria_pico(nombre, w, h, seed):
+    tracemalloc.start()
+    generar(nombre, w, h, seed)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def medir(nombre, w, h, seed, repeat):
+    laberinto = []
+    post = []
+    for i in range(repeat):
+        t_lab, t_post = generar(nombre, w, h, seed + i)
+        laberinto.append(t_lab)
+        post.append(t_post)
+    return {
+        "generator": nombre,
+        "size": f"{w}x{h}",
+        "maze_ms": min(laberinto) * 1000,
+        "post_ms": min(post) * 1000,
+        "peak_kb": memoria_pico(nombre, w, h, seed) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=SIZES)
+    parser.add_argument("--generators", nargs="+", default=list(GENERADORES))
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'generador':<10} {'tamaño':>10} {'laberinto ms':>13} "
+          f"{'post ms':>9} {'pico KB':>10}")
+    resultados = []
+    for size in args.sizes:
+        w, h = parse_size(size)
+        for nombre in args.generators:
+            r = medir(nombre, w, h, args.seed, args.repeat)
+            resultados.append(r)
+            print(f"{r['generator']:<10} {r['size']:>10} {r['maze_ms']:>13.1f} "
+                  f"{r['post_ms']:>9.1f} {r['peak_kb']:>10.0f}")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
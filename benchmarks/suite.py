@@ -0,0 +1,293 @@
+"""Microbenchmarks de los caminos calientes del juego.
+
+Corre sin ventana (driver de video "dummy" de SDL) y mide:
+generación de mapas, Enemy.update / update_cazador con varias cantidades de
+enemigos, la reaparición de un enemigo, Player.move, la pasada de
+colisiones trampa/enemigo, World.draw (a escala del mundo y directo en
+pantalla) y el pygame.transform.scale de pantalla completa de cada cuadro.
+
+Cada caso reporta el mejor tiempo por operación (µs) de varias rondas. Los
+resultados se pueden guardar en JSON y comparar contra una línea base:
+
+    python benchmarks/suite.py --out baseline.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.15
+
+Con --compare el proceso termina con código 1 si algún caso quedó más
+lento que la base en más de --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pygame
+
+from world import World
+from camera import Camera
+from simulation import EscapaSim, CazadorSim, Trap
+from swarm import HAY_NUMPY
+from constants import *
+
+MAP_SIZES = [(35, 25), (101, 101), (301, 301)]
+ENEMY_COUNTS = [10, 100, 500]
+SWARM_COUNTS = [1000, 5000]
+SEED = 1234
+
+
+# ---------- MEDICIÓN ----------
+def medir(fn, min_time, repeat):
+    """Mejor tiempo por llamada (segundos). Calibra la cantidad de llamadas
+    para que cada ronda dure al menos `min_time`."""
+    fn()   # calentar (cachés, campos, primera capa dibujada)
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        t = time.perf_counter() - t0
+        if t >= min_time:
+            break
+        n *= 2 if t == 0 else max(2, int(min_time / t * 1.2))
+
+    mejor = t / n
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        mejor = min(mejor, (time.perf_counter() - t0) / n)
+    return mejor, n
+
+
+# ---------- CASOS ----------
+# cada caso es (nombre, función sin argumentos); la preparación se hace al
+# construir la lista, fuera de la medición
+def casos_generacion():
+    for w, h in MAP_SIZES:
+        for generador in ("dfs", "eller"):
+            def fn(w=w, h=h, generador=generador):
+                World(w, h, SEED).generate(generador)
+            yield f"generate/{generador}/{w}x{h}", fn
+
+
+def _sim(clase, num_enemies, size=(101, 101), engine="objects"):
+    world = World(size[0], size[1], SEED)
+    world.generate()
+    enemy_animations = _animaciones()
+    return clase(world, _animaciones(), enemy_animations, seed=SEED,
+                 num_enemies=num_enemies, engine=engine)
+
+
+def casos_enemigos():
+    for modo, clase in (("escapa", EscapaSim), ("cazador", CazadorSim)):
+        for n in ENEMY_COUNTS:
+            sim = _sim(clase, n)
+
+            def fn(sim=sim):
+                sim.world.pathfinder().begin_tick()
+                sim._update_enemies(SIM_DT, ENEMY_SPEED)
+            yield f"enemy_update/{modo}/{n}", fn
+
+        if not HAY_NUMPY:
+            continue
+        for n in SWARM_COUNTS:
+            sim = _sim(clase, n, size=(301, 301), engine="swarm")
+
+            def fn(sim=sim):
+                sim._update_enemies(SIM_DT, ENEMY_SPEED)
+            yield f"enemy_update/swarm/{modo}/{n}", fn
+
+    # reaparición: sacar un enemigo y hacer aparecer otro (pool + índice de
+    # casillas)
+    for n in ENEMY_COUNTS:
+        sim = _sim(CazadorSim, n)
+
+        def fn(sim=sim):
+            sim._respawn(sim.enemies[0])
+        yield f"enemy_respawn/{n}", fn
+
+
+def casos_jugador():
+    sim = _sim(EscapaSim, 0)
+    player = sim.player
+    direcciones = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    paso = [0]
+
+    def fn():
+        # cambia de dirección cada tanto para no quedar contra una pared
+        paso[0] += 1
+        dx, dy = direcciones[(paso[0] // 30) % 4]
+        player.apply_input(dx, dy, paso[0] % 90 < 20)
+        player.move(SIM_DT, sim.world, paso[0] * 16)
+    yield "player_move", fn
+
+
+def casos_trampas():
+    for n in ENEMY_COUNTS:
+        sim = _sim(EscapaSim, n)
+        rng = random.Random(SEED)
+        world = sim.world
+        # trampas donde no hay enemigos: la pasada no cambia el estado
+        while len(sim.traps) < MAX_TRAPS:
+            x, y = rng.randrange(world.width), rng.randrange(world.height)
+            trap = Trap(x, y)
+            if world.player_can_pass(x, y) and \
+                    not sim.enemy_hash.query(trap.rect):
+                sim.traps.append(trap)
+
+        def fn(sim=sim):
+            sim.trap_collisions(sim.time)
+        yield f"trap_collision/{n}", fn
+
+
+def casos_dibujo(screen):
+    render_w = VIEW_TILES_W * TILE_SIZE
+    render_h = VIEW_TILES_H * TILE_SIZE
+    render_surface = pygame.Surface((render_w, render_h))
+    sprites = _sprites_tiles()
+
+    for w, h in MAP_SIZES:
+        world = World(w, h, SEED)
+        world.generate()
+        camera = Camera(render_w, render_h, w * TILE_SIZE, h * TILE_SIZE)
+        camera.center_on(pygame.Rect(w * TILE_SIZE // 2, h * TILE_SIZE // 2,
+                                     TILE_SIZE, TILE_SIZE))
+
+        def fn(world=world, camera=camera):
+            world.draw(render_surface, sprites, camera)
+        yield f"world_draw/{w}x{h}", fn
+
+        def fn(world=world, camera=camera):
+            world.invalidar_capa()
+            world.draw(render_surface, sprites, camera)
+        yield f"world_draw_cold/{w}x{h}", fn
+
+        # directo en pantalla con la cámara escalada (RENDER_NATIVE)
+        nativa = Camera(render_w, render_h, w * TILE_SIZE, h * TILE_SIZE,
+                        (SCREEN_WIDTH / render_w, SCREEN_HEIGHT / render_h))
+        nativa.center_on(camera.rect)
+
+        def fn(world=world, camera=nativa):
+            world.draw(screen, sprites, camera)
+        yield f"world_draw_native/{w}x{h}", fn
+
+    def fn():
+        scaled = pygame.transform.scale(render_surface,
+                                        (SCREEN_WIDTH, SCREEN_HEIGHT))
+        screen.blit(scaled, (0, 0))
+    yield f"scale/{render_w}x{render_h}", fn
+
+    def fn():
+        pygame.transform.scale(render_surface, screen.get_size(), screen)
+    yield f"scale_into/{render_w}x{render_h}", fn
+
+
+GRUPOS = {
+    "generate": casos_generacion,
+    "enemy": casos_enemigos,
+    "player": casos_jugador,
+    "trap": casos_trampas,
+    "draw": casos_dibujo,
+}
+
+
+# ---------- RECURSOS SIN ARCHIVOS ----------
+def _animaciones():
+    img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    return [[img] * 4 for _ in range(5)]
+
+
+def _sprites_tiles():
+    sprites = {}
+    for codigo, color in enumerate([(40, 40, 40), (90, 90, 90), (0, 90, 0),
+                                    (0, 0, 120), (200, 200, 0)]):
+        img = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        img.fill(color)
+        sprites[codigo] = img
+    return sprites
+
+
+# ---------- COMPARACIÓN ----------
+def comparar(actual, base, threshold):
+    """Imprime la comparación y devuelve los nombres que empeoraron."""
+    peores = []
+    print(f"\n{'caso':<36} {'base µs':>12} {'actual µs':>12} {'cambio':>8}")
+    for nombre, r in actual["results"].items():
+        b = base["results"].get(nombre)
+        if b is None:
+            print(f"{nombre:<36} {'-':>12} {r['us']:>12.1f} {'nuevo':>8}")
+            continue
+        cambio = r["us"] / b["us"] - 1 if b["us"] else 0.0
+        marca = ""
+        if cambio > threshold:
+            peores.append(nombre)
+            marca = "  <-- regresión"
+        print(f"{nombre:<36} {b['us']:>12.1f} {r['us']:>12.1f} "
+              f"{cambio:>+8.1%}{marca}")
+    return peores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", nargs="+", choices=list(GRUPOS),
+                        default=list(GRUPOS))
+    parser.add_argument("--filter", default="",
+                        help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="segundos mínimos por ronda")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="guardar resultados en este JSON")
+    parser.add_argument("--compare", help="JSON de línea base")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="empeoramiento tolerado (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    resultados = {}
+    print(f"{'caso':<36} {'µs/op':>12} {'ops':>8}")
+    for grupo in args.groups:
+        fabrica = GRUPOS[grupo]
+        casos = fabrica(screen) if grupo == "draw" else fabrica()
+        for nombre, fn in casos:
+            if args.filter not in nombre:
+                continue
+            t, n = medir(fn, args.min_time, args.repeat)
+            resultados[nombre] = {"us": t * 1e6, "ops": n}
+            print(f"{nombre:<36} {t * 1e6:>12.1f} {n:>8}")
+
+    salida = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": resultados,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(salida, f, indent=2, sort_keys=True)
+
+    codigo = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        peores = comparar(salida, base, args.threshold)
+        if peores:
+            print(f"\n{len(peores)} caso(s) más lentos que la base")
+            codigo = 1
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import pygame
+
+from constants import *
+
+
+class Camera:
+    """Vista rectangular sobre el mundo (en píxeles del mundo).
+
+    Sigue al jugador con una zona muerta de SCROLL_THRESH píxeles desde cada
+    borde: mientras el objetivo esté dentro de esa zona la cámara no se mueve.
+
+    Con `scale` la vista se dibuja agrandada o achicada directo en la
+    superficie de salida: las posiciones se escalan al convertirlas y
+    sprite() da cada imagen ya escalada (una sola vez por imagen). Los bordes
+    se redondean desde coordenadas absolutas del mundo, así dos cosas
+    pegadas en el mundo quedan pegadas en pantalla.
+    """
+
+    def __init__(self, view_w, view_h, world_w, world_h, scale=(1.0, 1.0)):
+        self.rect = pygame.Rect(0, 0, view_w, view_h)
+        self.world_w = world_w
+        self.world_h = world_h
+
+        self.sx, self.sy = scale
+        self.escalada = scale != (1.0, 1.0)
+        self._sprites = {}   # Surface original -> Surface escalada
+
+    # ---------- SEGUIMIENTO ----------
+    def _clamp(self):
+        # si el mundo es más chico que la vista, se centra
+        if self.world_w <= self.rect.width:
+            self.rect.x = (self.world_w - self.rect.width) // 2
+        else:
+            self.rect.x = max(0, min(self.rect.x, self.world_w - self.rect.width))
+
+        if self.world_h <= self.rect.height:
+            self.rect.y = (self.world_h - self.rect.height) // 2
+        else:
+            self.rect.y = max(0, min(self.rect.y, self.world_h - self.rect.height))
+
+    def center_on(self, target_rect):
+        self.rect.center = target_rect.center
+        self._clamp()
+
+    def follow(self, target_rect):
+        thresh_x = min(SCROLL_THRESH, self.rect.width // 2)
+        thresh_y = min(SCROLL_THRESH, self.rect.height // 2)
+
+        if target_rect.right > self.rect.right - thresh_x:
+            self.rect.right = target_rect.right + thresh_x
+        elif target_rect.left < self.rect.left + thresh_x:
+            self.rect.left = target_rect.left - thresh_x
+
+        if target_rect.bottom > self.rect.bottom - thresh_y:
+            self.rect.bottom = target_rect.bottom + thresh_y
+        elif target_rect.top < self.rect.top + thresh_y:
+            self.rect.top = target_rect.top - thresh_y
+
+        self._clamp()
+
+    # ---------- CONVERSIONES ----------
+    def scale_pos(self, x, y):
+        """Punto del mundo -> punto escalado (sin restar la cámara)."""
+        return round(x * self.sx), round(y * self.sy)
+
+    def apply(self, rect):
+        """Rect del mundo -> rect en la superficie de la vista."""
+        if not self.escalada:
+            return rect.move(-self.rect.x, -self.rect.y)
+        x0, y0 = self.apply_pos(rect.left, rect.top)
+        x1, y1 = self.apply_pos(rect.right, rect.bottom)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def apply_pos(self, x, y):
+        if not self.escalada:
+            return x - self.rect.x, y - self.rect.y
+        return (round(x * self.sx) - round(self.rect.x * self.sx),
+                round(y * self.sy) - round(self.rect.y * self.sy))
+
+    def to_world(self, x, y):
+        """Punto de la vista -> punto del mundo."""
+        return x / self.sx + self.rect.x, y / self.sy + self.rect.y
+
+    def sprite(self, img):
+        """La imagen a la escala de la vista (la misma si no hay escala)."""
+        if not self.escalada:
+            return img
+        escalada = self._sprites.get(img)
+        if escalada is None:
+            w, h = img.get_size()
+            escalada = self._sprites[img] = pygame.transform.scale(
+                img, (round(w * self.sx), round(h * self.sy)))
+        return escalada
+
+    # ---------- CULLING ----------
+    def visible(self, rect):
+        return self.rect.colliderect(rect)
+
+    def tile_range(self, tile_size, width, height):
+        """Rango de tiles (x0, y0, x1, y1) que toca la vista, x1/y1 exclusivos."""
+        x0 = max(0, self.rect.left // tile_size)
+        y0 = max(0, self.rect.top // tile_size)
+        x1 = min(width, (self.rect.right + tile_size - 1) // tile_size)
+        y1 = min(height, (self.rect.bottom + tile_size - 1) // tile_size)
+        return x0, y0, x1, y1
@@ -0,0 +1,238 @@
+import random
+import zlib
+from collections import OrderedDict
+
+from world import World, TILE_SIZE, _TABLA_JUGADOR, _TABLA_ENEMIGO
+from spawn import SpawnService
+from vision import ChunkVisionTable
+from tiles import *
+from generators import get_generador, generar_tuneles_y_lianas
+from constants import CHUNK_SIZE, MAX_CHUNKS, MAZE_GENERATOR
+
+
+class _Chunk:
+    __slots__ = ("grid", "paso_jugador", "paso_enemigo")
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.paso_jugador = grid.translate(_TABLA_JUGADOR)
+        self.paso_enemigo = grid.translate(_TABLA_ENEMIGO)
+
+
+class ChunkedWorld(World):
+    """Mundo dividido en chunks de CHUNK_SIZE x CHUNK_SIZE tiles.
+
+    Cada chunk es un laberinto perfecto propio, generado de forma determinista
+    a partir de (seed, cx, cy) la primera vez que se consulta. Cada chunk abre
+    un paso en su borde oeste y otro en su borde norte, así el laberinto global
+    sigue conectado sin conocer a los vecinos.
+
+    Los chunks lejanos se descartan (LRU). Si un chunk fue modificado con
+    set_tile se guarda comprimido en lugar de perderse.
+    """
+
+    def __init__(self, chunks_w, chunks_h, seed=None,
+                 chunk_size=None, max_chunks=None, generador=None):
+        super().__init__(0, 0, seed)
+        if chunk_size is None:
+            chunk_size = CHUNK_SIZE
+        if max_chunks is None:
+            max_chunks = MAX_CHUNKS
+        if generador is None:
+            generador = MAZE_GENERATOR
+
+        if chunk_size % 2 != 0:
+            raise ValueError("chunk_size debe ser par")
+
+        self.chunks_w = chunks_w
+        self.chunks_h = chunks_h
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.generador = generador
+
+        # +1: la última columna/fila es el muro exterior
+        self.width = chunks_w * chunk_size + 1
+        self.height = chunks_h * chunk_size + 1
+
+        self._chunks = OrderedDict()   # (cx, cy) -> _Chunk
+        self._compactados = {}         # (cx, cy) -> bytes comprimidos
+        self._modificados = set()
+        self._versiones = {}           # (cx, cy) -> cambios con set_tile
+
+        self.start = (1, 1)
+        self.end = (self.width - 2, self.height - 2)
+
+    # ------------------------------------------------------------
+    # CHUNKS
+    # ------------------------------------------------------------
+    def _chunk(self, cx, cy):
+        clave = (cx, cy)
+        chunk = self._chunks.get(clave)
+        if chunk is not None:
+            self._chunks.move_to_end(clave)
+            return chunk
+
+        datos = self._compactados.pop(clave, None)
+        if datos is not None:
+            chunk = _Chunk(bytearray(zlib.decompress(datos)))
+        else:
+            chunk = _Chunk(self._generar_chunk(cx, cy))
+
+        self._chunks[clave] = chunk
+        self._evict()
+        return chunk
+
+    def _evict(self):
+        while len(self._chunks) > self.max_chunks:
+            clave, chunk = self._chunks.popitem(last=False)
+            if clave in self._modificados:
+                self._compactados[clave] = zlib.compress(bytes(chunk.grid))
+
+    def chunks_cargados(self):
+        return len(self._chunks)
+
+    def version_chunk(self, cx, cy):
+        """Cuántas veces se modificó el chunk (cx, cy) desde generate()."""
+        return self._versiones.get((cx, cy), 0)
+
+    def ensure_around(self, rects, radius=1):
+        """Genera (o mantiene vivos) los chunks cerca de cada rect."""
+        paso = self.chunk_size * TILE_SIZE
+        for rect in rects:
+            ccx = rect.centerx // paso
+            ccy = rect.centery // paso
+            for cy in range(ccy - radius, ccy + radius + 1):
+                if not 0 <= cy < self.chunks_h:
+                    continue
+                for cx in range(ccx - radius, ccx + radius + 1):
+                    if 0 <= cx < self.chunks_w:
+                        self._chunk(cx, cy)
+
+    # ------------------------------------------------------------
+    # GENERACIÓN DE UN CHUNK
+    # ------------------------------------------------------------
+    def _generar_chunk(self, cx, cy):
+        c = self.chunk_size
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")
+
+        # laberinto local de (c+1)x(c+1): la última fila/columna es el muro
+        # que ya pertenece al chunk vecino, así que se descarta
+        local = get_generador(self.generador)(c + 1, c + 1, rng)
+        grid = bytearray()
+        for y in range(c):
+            grid += local[y * (c + 1):y * (c + 1) + c]
+
+        # pasos hacia el chunk de la izquierda y el de arriba
+        if cx > 0:
+            grid[rng.randrange(1, c, 2) * c] = CAMINO
+        if cy > 0:
+            grid[rng.randrange(1, c, 2)] = CAMINO
+
+        # túneles y lianas (solo con vecinos dentro del chunk)
+        x0 = cx * c
+        y0 = cy * c
+        excluir = [(x - x0, y - y0) for x, y in (self.start, self.end)]
+        generar_tuneles_y_lianas(grid, c, c, rng, excluir=excluir)
+
+        ex, ey = self.end
+        if ex // c == cx and ey // c == cy:
+            grid[(ey - y0) * c + (ex - x0)] = SALIDA
+
+        return grid
+
+    def generate(self, generador=None, seed=None):
+        # nada se genera por adelantado: solo el chunk inicial
+        if generador is not None:
+            get_generador(generador)
+            self.generador = generador
+        if seed is not None:
+            self.seed = seed
+        self._chunks.clear()
+        self._compactados.clear()
+        self._modificados.clear()
+        self._versiones.clear()
+        self._vision = None
+        self.version += 1
+        self.invalidar_capa()
+        self._chunk(0, 0)
+
+    # ------------------------------------------------------------
+    # ACCESO A CASILLAS
+    # ------------------------------------------------------------
+    def _local(self, x, y):
+        """(chunk, índice local) de una casilla, o (None, None) en el borde."""
+        c = self.chunk_size
+        cx = x // c
+        cy = y // c
+        if cx >= self.chunks_w or cy >= self.chunks_h:
+            return None, None
+        return self._chunk(cx, cy), (y - cy * c) * c + (x - cx * c)
+
+    def get_codigo(self, x, y):
+        chunk, i = self._local(x, y)
+        if chunk is None:
+            return MURO
+        return chunk.grid[i]
+
+    def set_codigo(self, x, y, codigo):
+        chunk, i = self._local(x, y)
+        if chunk is None:
+            return
+        chunk.grid[i] = codigo
+        chunk.paso_jugador[i] = _TABLA_JUGADOR[codigo]
+        chunk.paso_enemigo[i] = _TABLA_ENEMIGO[codigo]
+        self.version += 1
+        clave = (x // self.chunk_size, y // self.chunk_size)
+        self._modificados.add(clave)
+        self._versiones[clave] = self._versiones.get(clave, 0) + 1
+        if self._capa:
+            self._tiles_sucios.add((x, y))
+
+    def fila_codigos(self, y, x0, x1):
+        return bytes(self.get_codigo(x, y) for x in range(x0, x1))
+
+    def player_can_pass(self, x, y):
+        chunk, i = self._local(x, y)
+        return chunk is not None and chunk.paso_jugador[i] == 1
+
+    def enemy_can_pass(self, x, y):
+        chunk, i = self._local(x, y)
+        return chunk is not None and chunk.paso_enemigo[i] == 1
+
+    def campo_salida(self):
+        # un campo completo no cabe en un mundo sin límite: los enemigos
+        # vuelven a ir en línea recta hacia la salida
+        return None
+
+    def vision(self):
+        # sin grid plano: la tabla lee las casillas chunk por chunk
+        if self._vision is None:
+            self._vision = ChunkVisionTable(self)
+        return self._vision
+
+    def spawns(self):
+        # sin grid plano no hay lista de casillas: se sortea con rechazo
+        if self._spawns is None:
+            self._spawns = SpawnService(self, indexar=False)
+        return self._spawns
+
+    # ------------------------------------------------------------
+    # COLISIONES
+    # ------------------------------------------------------------
+    def can_player_rect_move(self, rect):
+        tile_x = rect.centerx // TILE_SIZE
+        tile_y = rect.centery // TILE_SIZE
+
+        if not self.inside(tile_x, tile_y):
+            return False
+
+        return self.player_can_pass(tile_x, tile_y)
+
+    def can_enemy_rect_move(self, rect):
+        tile_x = rect.centerx // TILE_SIZE
+        tile_y = rect.centery // TILE_SIZE
+
+        if not self.inside(tile_x, tile_y):
+            return False
+
+        return self.enemy_can_pass(tile_x, tile_y)
@@ -2,7 +2,25 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
-FPS = 60
+FPS = 60                 # límite de cuadros dibujados por segundo
+IDLE_WAIT_MS = 500       # menús y pausa: espera máxima de event.wait
+
+# --- SIMULACIÓN (PASO FIJO) ---
+SIM_DT = 1.0 / 60        # la lógica avanza siempre de a este dt
+MAX_SIM_STEPS = 5        # pasos máximos por cuadro (si no alcanza, se pierde tiempo)
+MAX_FRAME_TIME = 0.25    # un tirón más largo que esto cuenta como 0.25 s
+
+# --- PERFILADOR (F3 muestra los tiempos por fase) ---
+# apagado al jugar hasta apretar F3; con `python main.py --profile` o con la
+# variable de entorno LABERINTO_PROFILE=1 (PROFILER_ENV) mide desde el
+# principio y guarda el reporte
+PROFILER_ENABLED = False
+PROFILER_ENV = "LABERINTO_PROFILE"
+PROFILE_DIR = "profiles"  # reportes de cada partida (p50/p95/p99)
+
+# --- CACHÉ DE TEXTOS (ver text_cache.py) ---
+TEXT_CACHE_SIZE = 256    # textos rasterizados que se guardan
+PANEL_CACHE_SIZE = 8     # pantallas de texto completas (cada una ocupa la pantalla)
 
 TILE_SIZE = 32
 
@@ -10,11 +28,44 @@ SCROLL_THRESH = 150
 
 PLAYER_SCALE = 2
 
-SCORES_FILE = "scores_escapa.txt"
+SCORES_FILE = "scores_escapa.txt"      # log de todas las partidas (ver scores.py)
+SCORES_INDEX = "scores_index.json"     # top por modo, se rehace desde el log
+SCORES_TOP_K = 5
+
+# grabación de partidas (ver replay.py): cada partida jugada queda en
+# REPLAY_DIR y se puede repetir con `python main.py --replay <archivo>`
+REPLAY_RECORD = True
+REPLAY_DIR = "replays"
 
 WORLD_W = 35
 WORLD_H = 25
 
+# generador de laberinto: "dfs" o "eller" (ver generators.py)
+MAZE_GENERATOR = "dfs"
+
+# paquete de mapas pre-generados (ver maps.py); con DAILY_CHALLENGE se juega
+# el mapa del día del paquete en vez de generar uno nuevo
+MAP_PACK_FILE = "mapas.pack"
+DAILY_CHALLENGE = False
+
+# atlas de gráficos ya escalados (ver atlas.py); si no existe se cargan los
+# PNG de assets/ uno por uno
+ATLAS_FILE = "assets.atlas"
+
+# --- MUNDO POR CHUNKS (mapas muy grandes) ---
+WORLD_CHUNKED = False
+CHUNK_SIZE = 32          # tiles por lado de cada chunk (par)
+WORLD_CHUNKS_W = 64
+WORLD_CHUNKS_H = 64
+MAX_CHUNKS = 1024        # chunks en memoria antes de descartar los lejanos
+
+# tamaño de la vista de la cámara (en tiles); el mundo puede ser más grande
+VIEW_TILES_W = 35
+VIEW_TILES_H = 25
+# dibujar directo en pantalla escalando sprites y mapa una sola vez; con False
+# se dibuja a escala del mundo y se escala la vista entera cada cuadro
+RENDER_NATIVE = True
+
 # --- ANIMACIONES JUGADOR ---
 ANIM_IDLE = 0
 ANIM_RUN_UP = 1
@@ -33,12 +84,35 @@ ENEMY_RUN_RIGHT = 4
 ENEMY_SPEED = 80                     
 ENEMY_VISION_RADIUS = 3 * TILE_SIZE  
 PATROL_RADIUS_TILES = 3            
+PATROL_PATH_STEPS = 24     # pasos máximos por el laberinto hasta un punto de patrulla
 ANIM_COOLDOWN = 150    
 
 DAMAGE_COOLDOWN = 1.2
 
+# --- PATHFINDING (A*) ---
+PATHFIND_TICK_BUDGET = 4000  # nodos que puede expandir A* por tick (todos los enemigos)
+PATH_CACHE_SIZE = 512      # caminos (inicio, destino) guardados
+PATH_SEARCH_LIMIT = 256    # nodos máximos de una búsqueda de persecución/patrulla
+
+# modo escapa: pasos que cubre el campo de persecución alrededor del jugador
+PURSUIT_FIELD_RADIUS = 12
+
+# modo cazador: radio (en tiles) en el que el enemigo huye del jugador
+FEAR_RADIUS_TILES = 5
+# pasos que cubre el mapa de huida alrededor del jugador
+FLEE_FIELD_RADIUS = 2 * FEAR_RADIUS_TILES
+
 NUM_ENEMIES = 6
 
+# los enemigos (al empezar y al reaparecer) no aparecen a menos de estas
+# casillas del jugador (0 = en cualquier lado)
+SPAWN_MIN_DISTANCE = 4
+
+# motor de enemigos: "objects" (un Enemy por enemigo, con A*) o "swarm"
+# (todos en arrays de numpy, para miles de enemigos; sin numpy o con mundo
+# por chunks se usa "objects")
+ENEMY_ENGINE = "objects"
+
 # --- VIDA (CORAZONES) ---
 HEART_SIZE = 32
 
@@ -65,6 +139,11 @@ MAX_TRAPS = 3
 TRAP_COOLDOWN = 5.0      
 ENEMY_RESPAWN_TIME = 10.0
 
+# --- DIFICULTAD ESCAPA ---
+DIFF_STEP_SECONDS = 20.0    # cada cuánto sube una etapa
+DIFF_MAX_STAGE = 3          # etapa máxima (daño por golpe = 1 + etapa)
+DIFF_SPEED_STEP = 0.18      # velocidad extra de los enemigos por etapa
+
 # --- PUNTAJE ---
 SCORE_TRAP_KILL = 50        
 SCORE_TIME_FACTOR = 1000    
@@ -75,4 +154,5 @@ SCORE_TRAP_USED_PENALTY = 5
 CAZADOR_KILL_SCORE = 50      
 CAZADOR_EXIT_PENALTY = 30    
 CAZADOR_TIME_LIMIT = 30
+CAZADOR_KILL_SPEEDUP = 0.12  # velocidad extra de los enemigos por kill
 TIME_LIMIT = 30.0
\ No newline at end of file
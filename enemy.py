@@ -3,35 +3,55 @@ import random
 import math
 
 from world import TILE_SIZE
+from fields import CampoDistancias, INALCANZABLE
 from constants import *
 
 
 class Enemy:
-    def __init__(self, x_tile, y_tile, animation_frames, world):
+    def __init__(self, x_tile, y_tile, animation_frames, world,
+                 now=None, rng=None):
+        # reloj (ms) y azar: los de la simulación si los da, si no pygame/random
+        self.rng = random if rng is None else rng
         self.animation_list = animation_frames
-        self.action = ENEMY_IDLE
-        self.frame_index = 0
-        self.last_anim_update = pygame.time.get_ticks()
-        self.image = self.animation_list[self.action][self.frame_index]
 
         # ---------- CAJA VERDE: COLISIÓN ----------
-        cx = x_tile * TILE_SIZE
-        cy = y_tile * TILE_SIZE
-        self.collision_rect = pygame.Rect(cx, cy, TILE_SIZE, TILE_SIZE)
-        self.px = float(self.collision_rect.x)
-        self.py = float(self.collision_rect.y)
+        self.collision_rect = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)
 
         # ---------- CAJA ROJA: HITBOX ----------
         shrink = int(TILE_SIZE * 0.3)
         self.hitbox_rect = self.collision_rect.inflate(-shrink, -shrink)
 
+        self.reset(x_tile, y_tile, world, now)
+
+    def reset(self, x_tile, y_tile, world, now=None):
+        """Deja al enemigo como recién creado en (x_tile, y_tile). Así la
+        simulación reusa los enemigos eliminados en vez de crear otros."""
+        self.now = pygame.time.get_ticks() if now is None else now
+
+        self.action = ENEMY_IDLE
+        self.frame_index = 0
+        self.last_anim_update = self.now
+        self.image = self.animation_list[self.action][self.frame_index]
+
+        self.collision_rect.topleft = (x_tile * TILE_SIZE, y_tile * TILE_SIZE)
+        self.hitbox_rect.center = self.collision_rect.center
+        self.px = float(self.collision_rect.x)
+        self.py = float(self.collision_rect.y)
+        self.prev_px = self.px
+        self.prev_py = self.py
+
         self.vx = 0.0
         self.vy = 0.0
         self.speed = ENEMY_SPEED
 
         # movimiento aleatorio cuando no tiene buena patrulla
-        self.dir = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
-        self.last_dir_change = pygame.time.get_ticks()
+        self.dir = self.rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+        self.last_dir_change = self.now
+
+        # camino A* que está siguiendo (tiles) y su destino
+        self.path = None
+        self.path_goal = None
+        self.path_index = 0
 
         # IA
         self.state = "patrol"  # "patrol", "chase", "return"
@@ -43,11 +63,12 @@ class Enemy:
         if self.action != action:
             self.action = action
             self.frame_index = 0
-            self.last_anim_update = pygame.time.get_ticks()
+            self.last_anim_update = self.now
             self.image = self.animation_list[self.action][self.frame_index]
 
     # ---------- GENERAR RUTA DE PATRULLA ALEATORIA ----------
     def _generar_puntos_patrulla(self, x_tile, y_tile, world):
+        """Hasta 4 puntos alcanzables cerca del spawn (más el spawn)."""
         puntos = []
 
         # siempre incluimos el punto de spawn como patrulla
@@ -57,24 +78,34 @@ class Enemy:
         max_intentos = 60
         max_puntos = 4  # además del de spawn
 
+        # casillas alcanzables desde el spawn por el laberinto: un solo BFS
+        # acotado en vez de un A* por cada punto candidato
+        alcanzables = CampoDistancias(world, radio=PATROL_PATH_STEPS)
+        alcanzables.actualizar((x_tile, y_tile))
+
         while len(puntos) < max_puntos + 1 and intentos < max_intentos:
             intentos += 1
 
-            dx = random.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
-            dy = random.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
+            dx = self.rng.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
+            dy = self.rng.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
             nx = x_tile + dx
             ny = y_tile + dy
 
             if not world.inside(nx, ny):
                 continue
 
-            tile = world.tiles[ny][nx]
             # solo usamos tiles donde el enemigo pueda pasar
-            if not tile.puede_pasar_enemigo():
+            if not world.enemy_can_pass(nx, ny):
                 continue
 
-            if (nx, ny) not in puntos:
-                puntos.append((nx, ny))
+            if (nx, ny) in puntos:
+                continue
+
+            # y que se puedan alcanzar desde el spawn por el laberinto
+            if alcanzables.distancia(nx, ny) == INALCANZABLE:
+                continue
+
+            puntos.append((nx, ny))
 
         return puntos
 
@@ -119,21 +150,78 @@ class Enemy:
 
         self.patrol_index = mejor_i
 
+    # ---------- SEGUIR CAMINO A* ----------
+    def _ve(self, tile, world):
+        vision = world.vision()
+        return vision is None or vision.visible(self._tile_actual(), tile)
+
+    def _tile_actual(self):
+        return (self.collision_rect.centerx // TILE_SIZE,
+                self.collision_rect.centery // TILE_SIZE)
+
+    def _set_velocity_towards_tile(self, tile, speed_factor=1.0):
+        self._set_velocity_towards(tile[0] * TILE_SIZE + TILE_SIZE // 2,
+                                   tile[1] * TILE_SIZE + TILE_SIZE // 2,
+                                   speed_factor)
+
+    def _ir_a_tile(self, world, goal, speed_factor):
+        """Moverse hacia `goal` siguiendo un camino A* por el laberinto.
+
+        Devuelve False si no hay camino (o no quedó presupuesto este tick)
+        para que el llamador use la línea recta de siempre.
+        """
+        actual = self._tile_actual()
+
+        # ¿seguimos sobre el camino guardado?
+        if self.path and self.path_goal == goal:
+            fin = min(self.path_index + 3, len(self.path))
+            for i in range(self.path_index, fin):
+                if self.path[i] == actual:
+                    self.path_index = i
+                    break
+            else:
+                self.path = None
+
+        if not self.path or self.path_goal != goal:
+            camino = world.pathfinder().find_path(actual, goal,
+                                                  limite=PATH_SEARCH_LIMIT)
+            if not camino:
+                self.path = None
+                return False
+            self.path = camino
+            self.path_goal = goal
+            self.path_index = 0
+
+        if self.path_index + 1 < len(self.path):
+            self._set_velocity_towards_tile(self.path[self.path_index + 1],
+                                            speed_factor)
+        else:
+            self._set_velocity_towards_tile(goal, speed_factor)
+        return True
+
     # ---------- THINK: DECIDIR ESTADO Y TARGET ----------
-    def _think(self, player):
+    def _think(self, player, world):
         # Distancia al jugador (usar collision_rect del player)
         dx = player.collision_rect.centerx - self.collision_rect.centerx
         dy = player.collision_rect.centery - self.collision_rect.centery
         dist_sq = dx * dx + dy * dy
 
-        # Si el jugador está dentro de visión -> CHASE
-        if dist_sq <= ENEMY_VISION_RADIUS ** 2:
+        tile_jugador = (player.collision_rect.centerx // TILE_SIZE,
+                        player.collision_rect.centery // TILE_SIZE)
+
+        # Si el jugador está dentro de visión (y sin muros en medio) -> CHASE
+        if dist_sq <= ENEMY_VISION_RADIUS ** 2 and \
+                self._ve(tile_jugador, world):
             self.state = "chase"
-            self._set_velocity_towards(
-                player.collision_rect.centerx,
-                player.collision_rect.centery,
-                speed_factor=1.2
-            )
+            # campo de persecución compartido: bajar por el gradiente
+            campo = world.campo_persecucion(tile_jugador)
+            if self._tile_actual() == tile_jugador or \
+                    not self._seguir_campo(campo, 1.2):
+                self._set_velocity_towards(
+                    player.collision_rect.centerx,
+                    player.collision_rect.centery,
+                    speed_factor=1.2
+                )
             return
 
         # Jugador fuera de visión
@@ -144,10 +232,9 @@ class Enemy:
 
         # Si tiene MUY POCA patrulla (0 o 1 punto), usar modo wander
         if len(self.patrol_points) <= 1:
-            now = pygame.time.get_ticks()
-            if now - self.last_dir_change > 800:
-                self.dir = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
-                self.last_dir_change = now
+            if self.now - self.last_dir_change > 800:
+                self.dir = self.rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+                self.last_dir_change = self.now
 
             self.vx = self.dir[0] * self.speed * 0.6
             self.vy = self.dir[1] * self.speed * 0.6
@@ -172,8 +259,9 @@ class Enemy:
             self.vy = 0
             return
 
-        # sino, moverse hacia el punto de patrulla
-        self._set_velocity_towards(tx, ty, speed_factor=0.7)
+        # sino, moverse hacia el punto de patrulla por el laberinto
+        if not self._ir_a_tile(world, (tx_tile, ty_tile), 0.7):
+            self._set_velocity_towards(tx, ty, speed_factor=0.7)
 
     # ---------- MOVIMIENTO CON COLISIÓN ----------
     def _move_axis(self, dt, world, axis):
@@ -203,15 +291,17 @@ class Enemy:
 
     # ---------- ANIMACIÓN ----------
     def _update_animation(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_anim_update > ANIM_COOLDOWN:
+        if self.now - self.last_anim_update > ANIM_COOLDOWN:
             self.frame_index = (self.frame_index + 1) % len(self.animation_list[self.action])
-            self.last_anim_update = now
+            self.last_anim_update = self.now
             self.image = self.animation_list[self.action][self.frame_index]
 
     # ---------- UPDATE GENERAL ----------
-    def update(self, dt, world, player):
-        self._think(player)
+    def update(self, dt, world, player, now=None):
+        self.now = pygame.time.get_ticks() if now is None else now
+        self.prev_px = self.px
+        self.prev_py = self.py
+        self._think(player, world)
         self._move_axis(dt, world, "x")
         self._move_axis(dt, world, "y")
 
@@ -253,11 +343,22 @@ class Enemy:
         self.vx = nx * self.speed * speed_factor
         self.vy = ny * self.speed * speed_factor
 
+    def _seguir_campo(self, campo, speed_factor, alejarse=False):
+        """Ir hacia la casilla vecina que indica el campo. False si no hay."""
+        if campo is None:
+            return False
+        tx, ty = self._tile_actual()
+        paso = campo.siguiente_paso(tx, ty, alejarse)
+        if paso is None:
+            return False
+        self._set_velocity_towards_tile(paso, speed_factor)
+        return True
+
     def _think_cazador(self, world, player):
         """
         Lógica para MODO CAZADOR:
-        - si el jugador está cerca: huir
-        - si está lejos: ir hacia la salida
+        - si el jugador está cerca: huir (subiendo por el mapa de huida)
+        - si está lejos: ir hacia la salida (bajando por el campo de salida)
         """
         # distancia al jugador
         dx = player.collision_rect.centerx - self.collision_rect.centerx
@@ -265,15 +366,21 @@ class Enemy:
         dist_sq = dx * dx + dy * dy
 
         # radio en el que el enemigo se asusta del jugador
-        fear_radius = 5 * TILE_SIZE
+        fear_radius = FEAR_RADIUS_TILES * TILE_SIZE
 
         if dist_sq <= fear_radius * fear_radius:
             # HUIR del jugador (un poco más rápido)
-            self._set_velocity_away_from_player(player, speed_factor=1.1)
+            tile_jugador = (player.collision_rect.centerx // TILE_SIZE,
+                            player.collision_rect.centery // TILE_SIZE)
+            campo = world.campo_huida(tile_jugador)
+            if not self._seguir_campo(campo, 1.1, alejarse=True):
+                self._set_velocity_away_from_player(player, speed_factor=1.1)
             return
 
         # Si está lejos del jugador: ir hacia la salida
         if world.end is not None:
+            if self._seguir_campo(world.campo_salida(), 0.8):
+                return
             ex, ey = world.end
             tx = ex * TILE_SIZE + TILE_SIZE // 2
             ty = ey * TILE_SIZE + TILE_SIZE // 2
@@ -283,8 +390,10 @@ class Enemy:
             self.vx = 0
             self.vy = 0
 
-    def update_cazador(self, dt, world, player):
-
+    def update_cazador(self, dt, world, player, now=None):
+        self.now = pygame.time.get_ticks() if now is None else now
+        self.prev_px = self.px
+        self.prev_py = self.py
         self._think_cazador(world, player)
         self._move_axis(dt, world, "x")
         self._move_axis(dt, world, "y")
@@ -307,6 +416,48 @@ class Enemy:
 
 
     # ---------- DIBUJO ----------
-    def draw(self, surface):
-        img_rect = self.image.get_rect(midbottom=self.collision_rect.midbottom)
+    def draw(self, surface, camera=None, alpha=1.0):
+        # entre la posición del paso anterior y la actual
+        x = int(self.prev_px + (self.px - self.prev_px) * alpha)
+        y = int(self.prev_py + (self.py - self.prev_py) * alpha)
+        img_rect = self.image.get_rect(
+            midbottom=(x + TILE_SIZE // 2, y + TILE_SIZE))
+        if camera is not None:
+            if not camera.visible(img_rect):
+                return
+            img_rect = camera.apply(img_rect)
+            surface.blit(camera.sprite(self.image), img_rect.topleft)
+            return
         surface.blit(self.image, img_rect.topleft)
+
+
+# ---------- POOL ----------
+class EnemyPool:
+    """Enemigos eliminados que se reusan con reset() en vez de crear otros."""
+
+    def __init__(self, animation_frames, world, rng=None):
+        self.animation_frames = animation_frames
+        self.world = world
+        self.rng = rng
+        self._libres = []
+
+        # estadísticas (útiles para benchmarks)
+        self.creados = 0
+        self.reusados = 0
+
+    def acquire(self, x_tile, y_tile, now=None):
+        if self._libres:
+            enemy = self._libres.pop()
+            enemy.reset(x_tile, y_tile, self.world, now)
+            self.reusados += 1
+            return enemy
+        self.creados += 1
+        return Enemy(x_tile, y_tile, self.animation_frames, self.world,
+                     now=now, rng=self.rng)
+
+    def release(self, enemy):
+        self._libres.append(enemy)
+
+    def __len__(self):
+        """Enemigos libres esperando a reusarse."""
+        return len(self._libres)
@@ -0,0 +1,210 @@
+"""Campos de distancia (BFS) sobre las casillas por donde pasa el enemigo.
+
+Un campo guarda, para cada casilla alcanzable, cuántos pasos la separan del
+origen. Un enemigo no busca caminos: mira sus 4 vecinos y va al de menor
+distancia (para acercarse) o al de mayor distancia (para huir), en O(1).
+
+Los campos con radio se actualizan de forma incremental cuando el origen se
+mueve a una casilla vecina: las distancias viejas + 1 siguen siendo cotas
+válidas (se puede ir por el origen anterior), así que basta con propagar
+desde el nuevo origen las casillas que mejoran. El +1 a todo el campo no se
+aplica casilla por casilla: se guarda como un desplazamiento común.
+"""
+from array import array
+from collections import deque
+
+INALCANZABLE = -1
+
+_VECINOS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class CampoDistancias:
+    def __init__(self, world, radio=None, jugador=False):
+        """radio=None: campo completo (array del tamaño del mapa).
+        radio=n: solo las casillas a n pasos o menos (dict, costo O(n²)),
+        sirve también para mundos por chunks.
+        jugador=True: por las casillas del jugador en vez de las del enemigo."""
+        self.world = world
+        self.radio = radio
+        self.jugador = jugador
+        self.origen = None
+        self.version = None
+        self._dist = None
+
+        # modo radio: distancia real = valor guardado + _offset
+        self._offset = 0
+        self._incrementales = 0
+
+    # ---------- CONSTRUCCIÓN ----------
+    def actualizar(self, origen):
+        """Recalcula solo si cambió el origen o el mapa. Devuelve True si
+        hubo que recalcular."""
+        if origen == self.origen and self.version == self.world.version:
+            return False
+        if self._puede_incremental(origen):
+            self.origen = origen
+            self._actualizar_incremental(origen)
+            return True
+
+        self.origen = origen
+        self.version = self.world.version
+        if self.radio is None:
+            self._bfs_completo(origen)
+        else:
+            self._bfs_radio(origen)
+        return True
+
+    def _puede_pasar(self):
+        world = self.world
+        return world.player_can_pass if self.jugador else world.enemy_can_pass
+
+    def _puede_incremental(self, origen):
+        if self.radio is None or self.origen is None:
+            return False
+        if self.version != self.world.version:
+            return False
+        # cada tanto se rehace entero para no acumular entradas viejas
+        if self._incrementales >= 2 * self.radio:
+            return False
+        ox, oy = self.origen
+        if abs(origen[0] - ox) + abs(origen[1] - oy) != 1:
+            return False
+        # el origen viejo tiene que ser transitable para que d+1 sea una cota
+        return self._puede_pasar()(ox, oy)
+
+    def _bfs_completo(self, origen):
+        world = self.world
+        w = world.width
+        paso = world.paso_jugador if self.jugador else world.paso_enemigo
+        dist = array("i", [INALCANZABLE]) * (w * world.height)
+        self._dist = dist
+
+        ox, oy = origen
+        if not world.inside(ox, oy):
+            return
+        inicio = oy * w + ox
+        dist[inicio] = 0
+        cola = deque([inicio])
+        n = len(dist)
+
+        while cola:
+            i = cola.popleft()
+            d = dist[i] + 1
+            x = i % w
+            if x + 1 < w and paso[i + 1] and dist[i + 1] < 0:
+                dist[i + 1] = d
+                cola.append(i + 1)
+            if x > 0 and paso[i - 1] and dist[i - 1] < 0:
+                dist[i - 1] = d
+                cola.append(i - 1)
+            if i + w < n and paso[i + w] and dist[i + w] < 0:
+                dist[i + w] = d
+                cola.append(i + w)
+            if i - w >= 0 and paso[i - w] and dist[i - w] < 0:
+                dist[i - w] = d
+                cola.append(i - w)
+
+    def _bfs_radio(self, origen):
+        world = self.world
+        puede_pasar = self._puede_pasar()
+        dist = {}
+        self._dist = dist
+        self._offset = 0
+        self._incrementales = 0
+
+        if not world.inside(*origen):
+            return
+        dist[origen] = 0
+        cola = deque([origen])
+
+        while cola:
+            x, y = cola.popleft()
+            d = dist[(x, y)]
+            if d >= self.radio:
+                continue
+            for dx, dy in _VECINOS:
+                n = (x + dx, y + dy)
+                if n in dist or not world.inside(*n):
+                    continue
+                if puede_pasar(*n):
+                    dist[n] = d + 1
+                    cola.append(n)
+
+    def _actualizar_incremental(self, origen):
+        world = self.world
+        puede_pasar = self._puede_pasar()
+        dist = self._dist
+        radio = self.radio
+
+        # todas las distancias suben 1 (cota por el origen anterior)
+        self._offset += 1
+        self._incrementales += 1
+        off = self._offset
+
+        dist[origen] = -off
+        cola = deque([origen])
+
+        # BFS que solo avanza por las casillas cuya distancia mejora
+        while cola:
+            x, y = cola.popleft()
+            d = dist[(x, y)] + off
+            if d >= radio:
+                continue
+            for dx, dy in _VECINOS:
+                n = (x + dx, y + dy)
+                guardado = dist.get(n)
+                if guardado is not None:
+                    if guardado + off <= d + 1:
+                        continue
+                elif not (world.inside(*n) and puede_pasar(*n)):
+                    continue
+                dist[n] = d + 1 - off
+                cola.append(n)
+
+    # ---------- CONSULTAS ----------
+    def valores(self):
+        """Campo completo: array('i') con las distancias fila por fila (para
+        leerlo en bloque, p. ej. con numpy.frombuffer). None con radio."""
+        if self.radio is not None:
+            return None
+        return self._dist
+
+    def distancia(self, x, y):
+        if self._dist is None or not self.world.inside(x, y):
+            return INALCANZABLE
+        if self.radio is None:
+            return self._dist[y * self.world.width + x]
+        guardado = self._dist.get((x, y))
+        if guardado is None:
+            return INALCANZABLE
+        d = guardado + self._offset
+        return d if d <= self.radio else INALCANZABLE
+
+    def siguiente_paso(self, x, y, alejarse=False):
+        """Casilla vecina hacia la que moverse, o None si no hay.
+
+        Para acercarse baja por el gradiente; para alejarse sube. Con radio,
+        una casilla transitable fuera del campo cuenta como "más lejos" que
+        todo lo que está dentro.
+        """
+        actual = self.distancia(x, y)
+        if actual == INALCANZABLE:
+            return None
+
+        mejor = None
+        mejor_d = actual
+        for dx, dy in _VECINOS:
+            nx = x + dx
+            ny = y + dy
+            d = self.distancia(nx, ny)
+            if d == INALCANZABLE:
+                if not alejarse or self.radio is None:
+                    continue
+                if not (self.world.inside(nx, ny) and
+                        self._puede_pasar()(nx, ny)):
+                    continue
+                d = self.radio + 1
+            if (d > mejor_d) if alejarse else (d < mejor_d):
+                mejor = (nx, ny)
+                mejor_d = d
+        return mejor
@@ -0,0 +1,193 @@
+"""Generadores de laberinto.
+
+Todos reciben (ancho, alto, rng) y devuelven un bytearray de ancho * alto
+códigos de casilla (solo MURO y CAMINO), con las celdas del laberinto en
+coordenadas impares. rng es un random.Random, así cada mapa es reproducible
+a partir de su semilla.
+"""
+from tiles import CAMINO, MURO, TUNEL, LIANA
+
+
+# ------------------------------------------------------------
+# DFS (backtracking)
+# ------------------------------------------------------------
+def generar_dfs(ancho, alto, rng):
+    grid = bytearray([MURO]) * (ancho * alto)
+
+    if ancho > 2 and alto > 2:
+        inicio = 1 * ancho + 1
+    else:
+        inicio = 0
+    grid[inicio] = CAMINO
+
+    # el propio grid hace de "visitado": una celda en MURO no fue tallada
+    stack = [inicio]
+    choice = rng.choice
+    dos_filas = 2 * ancho
+
+    while stack:
+        i = stack[-1]
+        x = i % ancho
+        y = i // ancho
+
+        vecinos = []
+        if x + 2 < ancho - 1 and grid[i + 2] == MURO:
+            vecinos.append(2)
+        if x - 2 > 0 and grid[i - 2] == MURO:
+            vecinos.append(-2)
+        if y + 2 < alto - 1 and grid[i + dos_filas] == MURO:
+            vecinos.append(dos_filas)
+        if y - 2 > 0 and grid[i - dos_filas] == MURO:
+            vecinos.append(-dos_filas)
+
+        if vecinos:
+            d = choice(vecinos)
+            grid[i + d // 2] = CAMINO
+            grid[i + d] = CAMINO
+            stack.append(i + d)
+        else:
+            stack.pop()
+
+    return grid
+
+
+# ------------------------------------------------------------
+# ELLER (fila por fila)
+# ------------------------------------------------------------
+def eller_filas(ancho, alto, rng):
+    """Genera el laberinto fila a fila con el algoritmo de Eller.
+
+    Solo guarda el estado de la fila actual, así que la memoria es O(ancho)
+    sin importar el alto. Devuelve cada fila del grid (bytes) de arriba abajo.
+    """
+    cols = (ancho - 1) // 2
+    filas = (alto - 1) // 2
+    muro = bytes([MURO]) * ancho
+
+    yield muro
+    if cols == 0 or filas == 0:
+        for _ in range(alto - 1):
+            yield muro
+        return
+
+    conjuntos = list(range(cols))      # conjunto de cada celda de la fila
+    siguiente_id = cols
+
+    for fila in range(filas):
+        ultima = (fila == filas - 1)
+        celdas = bytearray(muro)
+        for c in range(cols):
+            celdas[2 * c + 1] = CAMINO
+
+        # miembros de cada conjunto dentro de la fila
+        miembros = {}
+        for c, s in enumerate(conjuntos):
+            miembros.setdefault(s, []).append(c)
+
+        # 1) uniones horizontales
+        for c in range(cols - 1):
+            a = conjuntos[c]
+            b = conjuntos[c + 1]
+            if a == b:
+                continue
+            if ultima or rng.random() < 0.5:
+                celdas[2 * c + 2] = CAMINO
+                # fusionar el conjunto chico dentro del grande
+                if len(miembros[a]) < len(miembros[b]):
+                    a, b = b, a
+                for m in miembros.pop(b):
+                    conjuntos[m] = a
+                    miembros[a].append(m)
+
+        yield bytes(celdas)
+
+        if ultima:
+            break
+
+        # 2) bajadas: al menos una por conjunto
+        abajo = bytearray(muro)
+        nuevos = [-1] * cols
+        for s, cs in miembros.items():
+            obligada = rng.choice(cs)
+            for c in cs:
+                if c == obligada or rng.random() < 0.3:
+                    abajo[2 * c + 1] = CAMINO
+                    nuevos[c] = s
+        yield bytes(abajo)
+
+        for c in range(cols):
+            if nuevos[c] == -1:
+                nuevos[c] = siguiente_id
+                siguiente_id += 1
+        conjuntos = nuevos
+
+    # muro inferior (y una fila extra si el alto es par)
+    for _ in range(alto - 2 * filas):
+        yield muro
+
+
+def generar_eller(ancho, alto, rng):
+    grid = bytearray()
+    for fila in eller_filas(ancho, alto, rng):
+        grid += fila
+    return grid
+
+
+GENERADORES = {
+    "dfs": generar_dfs,
+    "eller": generar_eller,
+}
+
+
+def get_generador(nombre):
+    try:
+        return GENERADORES[nombre]
+    except KeyError:
+        raise ValueError(f"generador desconocido: {nombre!r} "
+                         f"(opciones: {', '.join(GENERADORES)})")
+
+
+# ------------------------------------------------------------
+# TÚNELES Y LIANAS (POST-PASO VECTORIZADO)
+# ------------------------------------------------------------
+_ES_MURO = bytes(1 if c == MURO else 0 for c in range(256))
+_ES_CAMINO = bytes(1 if c == CAMINO else 0 for c in range(256))
+
+
+def generar_tuneles_y_lianas(grid, ancho, alto, rng, excluir=()):
+    """Convierte algunos muros entre dos caminos (arriba y abajo) en
+    túnel o liana.
+
+    Cada fila se compara entera: las máscaras 0/1 de muro y camino se pasan a
+    enteros y se combinan con AND, así el bucle en Python solo recorre las
+    casillas candidatas y no todo el mapa.
+    """
+    excluir = set(excluir)
+
+    def mascara(y, tabla):
+        fila = y * ancho
+        return int.from_bytes(grid[fila:fila + ancho].translate(tabla), "big")
+
+    # los túneles/lianas salen de muros, así que las máscaras de camino
+    # no cambian al modificar el grid y se pueden ir reutilizando
+    camino_arriba = mascara(0, _ES_CAMINO) if alto > 2 else 0
+    camino_fila = mascara(1, _ES_CAMINO) if alto > 2 else 0
+
+    for y in range(1, alto - 1):
+        fila = y * ancho
+        camino_abajo = mascara(y + 1, _ES_CAMINO)
+        muro = mascara(y, _ES_MURO)
+
+        candidatos = (muro & camino_arriba & camino_abajo).to_bytes(ancho, "big")
+        x = candidatos.find(1, 1, ancho - 1)
+        while x != -1:
+            if (x, y) not in excluir:
+                r = rng.random()
+                if r < 0.06:
+                    grid[fila + x] = TUNEL
+                elif r < 0.12:
+                    grid[fila + x] = LIANA
+            x = candidatos.find(1, x + 1, ancho - 1)
+
+        camino_arriba = camino_fila
+        camino_fila = camino_abajo
@@ -1,119 +1,129 @@
-import pygame
-import random
+import argparse
 import os
 
-from world import World
-from tiles import CAMINO, MURO, TUNEL, LIANA, SALIDA, Salida
-from player import Player
-from enemy import Enemy
-from constants import *
-
+import pygame
 
-# ---------- TRAMPA SENCILLA ----------
-class Trap:
-    def __init__(self, tile_x, tile_y):
-        self.tile_x = tile_x
-        self.tile_y = tile_y
-        self.rect = pygame.Rect(
-            tile_x * TILE_SIZE,
-            tile_y * TILE_SIZE,
-            TILE_SIZE,
-            TILE_SIZE
-        )
+import assets
+import scores
+from camera import Camera
+from swarm import EnemySwarm
+from profiler import FrameProfiler, NULL_PROFILER
+from text_cache import TEXTOS
+from replay import Recorder, NULL_RECORDER, load as load_replay
+from simulation import (EscapaSim, CazadorSim, FixedStep, create_world,
+                        input_from_keys)
+from constants import *
 
 
-# ---------- GESTIÓN DE SCORES ----------
-def load_scores(mode=None):
-    """Si mode = 'ESCAPA' o 'CAZADOR', devuelve solo esos.
-       Si mode = None → devuelve todos los registros."""
-    scores = []
-    if not os.path.exists(SCORES_FILE):
-        return scores
+# ---------- DIBUJO DE ENTIDADES ----------
+def draw_traps(surface, traps, trap_img, camera):
+    if not traps:
+        return
+    img = camera.sprite(trap_img)
+    for trap in traps:
+        if camera.visible(trap.rect):
+            surface.blit(img, camera.apply_pos(trap.rect.x, trap.rect.y))
+
+
+def draw_enemies(surface, enemies, camera, alpha=1.0):
+    if isinstance(enemies, EnemySwarm):
+        enemies.draw(surface, camera, alpha)
+        return
+    for enemy in enemies:
+        enemy.draw(surface, camera, alpha)
+
+
+# ---------- VISTA ----------
+def make_view(world):
+    """Cámara y superficie intermedia para dibujar el mundo.
+
+    Con RENDER_NATIVE se dibuja directo en la pantalla: la cámara escala
+    posiciones, bloques del mapa y sprites (cada imagen una sola vez) y no
+    hay superficie intermedia (None). Si no, se dibuja a escala del mundo en
+    una superficie de VIEW_TILES y se escala a la pantalla cada cuadro.
+    """
+    render_w = VIEW_TILES_W * TILE_SIZE
+    render_h = VIEW_TILES_H * TILE_SIZE
+    world_w = world.width * TILE_SIZE
+    world_h = world.height * TILE_SIZE
+    if RENDER_NATIVE:
+        scale = (SCREEN_WIDTH / render_w, SCREEN_HEIGHT / render_h)
+        return Camera(render_w, render_h, world_w, world_h, scale), None
+    return (Camera(render_w, render_h, world_w, world_h),
+            pygame.Surface((render_w, render_h)))
+
+
+def draw_scene(screen, canvas, world, tile_sprites, camera, player, enemies,
+               alpha, traps=(), trap_img=None, profiler=NULL_PROFILER):
+    """Mapa, trampas, jugador y enemigos del cuadro en `screen`."""
+    surface = screen if canvas is None else canvas
+
+    # si el mundo no llena la vista quedan bordes sin mapa que limpiar
+    if camera.world_w < camera.rect.width or camera.world_h < camera.rect.height:
+        surface.fill((0, 0, 0))
+    world.draw(surface, tile_sprites, camera)
+    profiler.mark("world_draw")
+
+    draw_traps(surface, traps, trap_img, camera)
+    player.draw(surface, camera, alpha)
+    draw_enemies(surface, enemies, camera, alpha)
+    profiler.mark("sprites")
+
+    if canvas is not None:
+        # directo sobre la pantalla, sin crear una Surface nueva por cuadro
+        pygame.transform.scale(canvas, screen.get_size(), screen)
+        profiler.mark("scale")
+
+
+# ---------- ESPERA DE EVENTOS ----------
+# las pantallas quietas (menú, nombre, resultados, pausa) no redibujan cada
+# cuadro: dibujan una vez y duermen en event.wait hasta que llegue algo
+def wait_events(timeout=IDLE_WAIT_MS):
+    """Bloquea hasta el próximo evento (o `timeout` ms) y devuelve todos los
+    pendientes. Cierra el juego con QUIT."""
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    events = [event] + pygame.event.get()
+    for event in events:
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            raise SystemExit
+        if event.type == pygame.WINDOWEXPOSED:
+            # la pantalla sigue teniendo el último cuadro compuesto
+            pygame.display.flip()
+    return events
 
-    with open(SCORES_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            parts = line.strip().split(";")
-            if len(parts) != 6:
-                continue
 
-            name, m, score_str, time_str, kills_str, traps_str = parts
-            try:
-                score = int(score_str)
-                time_s = float(time_str)
-                kills = int(kills_str)
-                traps = int(traps_str)
-            except ValueError:
-                continue
-
-            if mode is None or m == mode:
-                scores.append({
-                    "name": name,
-                    "mode": m,
-                    "score": score,
-                    "time": time_s,
-                    "kills": kills,
-                    "traps": traps
-                })
-
-    return scores
-
-
-def save_score(name, mode, score, elapsed_time, kills, traps_used):
-    # 1) Cargar solo scores del modo actual
-    mode_scores = load_scores(mode)
-
-    # 2) Agregar el nuevo
-    mode_scores.append({
-        "name": name,
-        "mode": mode,
-        "score": score,
-        "time": elapsed_time,
-        "kills": kills,
-        "traps": traps_used
-    })
-
-    # 3) Top 5 interno por modo
-    mode_scores.sort(key=lambda s: s["score"], reverse=True)
-    mode_scores = mode_scores[:5]
-
-    # 4) Cargar todos los scores existentes
-    all_scores = load_scores(None)
-
-    # 5) Quitar los viejos de este modo
-    all_scores = [s for s in all_scores if s["mode"] != mode]
-
-    # 6) Agregar el nuevo top5 del modo actual
-    all_scores.extend(mode_scores)
-
-    # 7) Guardar archivo completo
-    with open(SCORES_FILE, "w", encoding="utf-8") as f:
-        for s in all_scores:
-            f.write(f"{s['name']};{s['mode']};{s['score']};"
-                    f"{s['time']:.2f};{s['kills']};{s['traps']}\n")
-
-
-def compute_final_score(elapsed_time, enemies_killed_by_trap, traps_used):
-    base_time_score = int(SCORE_TIME_FACTOR / max(elapsed_time, 1.0))
-    kills_score = enemies_killed_by_trap * SCORE_TRAP_KILL
-    traps_penalty = traps_used * SCORE_TRAP_USED_PENALTY
-
-    total = base_time_score + kills_score - traps_penalty
-    if total < 0:
-        total = 0
-    return total
+def wait_for_key(keys=(pygame.K_RETURN, pygame.K_ESCAPE)):
+    """Espera (sin redibujar) hasta que se pulse una de `keys`."""
+    while True:
+        for event in wait_events():
+            if event.type == pygame.KEYDOWN and event.key in keys:
+                return event.key
 
 
 def get_player_name(screen, font):
-    clock = pygame.time.Clock()
     name = ""
     entering = True
+    redraw = True
 
     while entering:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                raise SystemExit
+        if redraw:
+            screen.fill((0, 0, 0))
+            txt1 = TEXTOS.render(font, "Nombre (ENTER para confirmar):",
+                                 (255, 255, 255))
+            txt2 = TEXTOS.render(font, name, (0, 255, 0))
+
+            screen.blit(txt1, (SCREEN_WIDTH // 2 - txt1.get_width() // 2,
+                               SCREEN_HEIGHT // 2 - 40))
+            screen.blit(txt2, (SCREEN_WIDTH // 2 - txt2.get_width() // 2,
+                               SCREEN_HEIGHT // 2))
 
+            pygame.display.flip()
+            redraw = False
+
+        for event in wait_events():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
                     if name.strip() == "":
@@ -121,314 +131,150 @@ def get_player_name(screen, font):
                     entering = False
                 elif event.key == pygame.K_BACKSPACE:
                     name = name[:-1]
+                    redraw = True
                 else:
                     ch = event.unicode
                     if ch.isalnum() or ch == " ":
                         if len(name) < 12:
                             name += ch
+                            redraw = True
 
-        screen.fill((0, 0, 0))
-        txt1 = font.render("Nombre (ENTER para confirmar):", True, (255, 255, 255))
-        txt2 = font.render(name, True, (0, 255, 0))
+    return name.strip()
 
-        screen.blit(txt1, (SCREEN_WIDTH // 2 - txt1.get_width() // 2,
-                           SCREEN_HEIGHT // 2 - 40))
-        screen.blit(txt2, (SCREEN_WIDTH // 2 - txt2.get_width() // 2,
-                           SCREEN_HEIGHT // 2))
 
-        pygame.display.flip()
-        clock.tick(60)
+def results_lines(titulo, color_titulo, stats, top_scores):
+    """Líneas (texto, color, x, y) de una pantalla de resultados."""
+    y = 40
+    lines = [(titulo, color_titulo, None, y)]
+    y += 40
+    for line in stats:
+        lines.append((line, (255, 255, 255), 40, y))
+        y += 30
+
+    for i, s in enumerate(top_scores):
+        linea = (
+            f"{i+1}. {s['name']} [{s['mode']}]  |  "
+            f"Score: {s['score']}  |  T: {s['time']:.1f}s  |  "
+            f"K: {s['kills']}  |  Traps: {s['traps']}"
+        )
+        lines.append((linea, (200, 200, 200), 60, y))
+        y += 24
 
-    return name.strip()
+    lines.append(("ENTER o ESC para volver al menú", (150, 150, 255), None,
+                  SCREEN_HEIGHT - 40))
+    return tuple(lines)
 
 
 def show_end_screen(screen, font, final_score, elapsed_time,
                     kills, traps_used, win):
-    clock = pygame.time.Clock()
-
     if win:
         name = get_player_name(screen, font)
-        save_score(name, "ESCAPA", final_score, elapsed_time, kills, traps_used)
+        scores.save(name, "ESCAPA", final_score, elapsed_time, kills,
+                    traps_used)
     else:
         name = "-----"
 
-    top_scores = load_scores("ESCAPA")
-
-    showing = True
-    while showing:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                raise SystemExit
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
-                    showing = False
+    top_scores = scores.top("ESCAPA")
 
-        screen.fill((0, 0, 0))
-        y = 40
-
-        titulo_txt = "VICTORIA - MODO ESCAPA" if win else "DERROTA - MODO ESCAPA"
-        color_titulo = (255, 255, 0) if win else (255, 80, 80)
-
-        title = font.render(titulo_txt, True, color_titulo)
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, y))
-        y += 40
-
-        stats = [
-            f"Jugador: {name}",
-            f"Tiempo: {elapsed_time:.1f} s",
-            f"Enemigos eliminados con trampas: {kills}",
-            f"Trampas usadas: {traps_used}",
-            f"Puntaje final: {final_score}",
-            "",
-            "TOP 5 GLOBAL:"
-        ]
-        for line in stats:
-            txt = font.render(line, True, (255, 255, 255))
-            screen.blit(txt, (40, y))
-            y += 30
-
-        for i, s in enumerate(top_scores):
-            linea = (
-                f"{i+1}. {s['name']} [{s['mode']}]  |  "
-                f"Score: {s['score']}  |  T: {s['time']:.1f}s  |  "
-                f"K: {s['kills']}  |  Traps: {s['traps']}"
-            )
-            txt = font.render(linea, True, (200, 200, 200))
-            screen.blit(txt, (60, y))
-            y += 24
-
-        info = font.render("ENTER o ESC para volver al menú", True, (150, 150, 255))
-        screen.blit(info,
-                    (SCREEN_WIDTH // 2 - info.get_width() // 2,
-                     SCREEN_HEIGHT - 40))
+    titulo_txt = "VICTORIA - MODO ESCAPA" if win else "DERROTA - MODO ESCAPA"
+    color_titulo = (255, 255, 0) if win else (255, 80, 80)
+    stats = [
+        f"Jugador: {name}",
+        f"Tiempo: {elapsed_time:.1f} s",
+        f"Enemigos eliminados con trampas: {kills}",
+        f"Trampas usadas: {traps_used}",
+        f"Puntaje final: {final_score}",
+        "",
+        "TOP 5 GLOBAL:"
+    ]
+    lines = results_lines(titulo_txt, color_titulo, stats, top_scores)
 
-        pygame.display.flip()
-        clock.tick(60)
+    screen.blit(TEXTOS.panel(font, lines), (0, 0))
+    pygame.display.flip()
+    wait_for_key()
 
 
 def show_cazador_results(screen, font, score, elapsed_time, kills, exits):
-    clock = pygame.time.Clock()
-    running = True
-
-    top_scores = load_scores("CAZADOR")
+    top_scores = scores.top("CAZADOR")
 
+    stats = [
+        f"Tiempo jugado: {elapsed_time:.1f} s",
+        f"Enemigos atrapados: {kills}",
+        f"Enemigos que alcanzaron la salida: {exits}",
+        f"Puntaje final: {score}",
+        "",
+        "TOP 5 GLOBAL:"
+    ]
+    lines = results_lines("FIN - MODO CAZADOR", (255, 255, 0), stats,
+                          top_scores)
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                raise SystemExit
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
-                    running = False
-
-        screen.fill((0, 0, 0))
-        y = 40
-
-        title = font.render("FIN - MODO CAZADOR", True, (255, 255, 0))
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, y))
-        y += 40
-
-        lines = [
-            f"Tiempo jugado: {elapsed_time:.1f} s",
-            f"Enemigos atrapados: {kills}",
-            f"Enemigos que alcanzaron la salida: {exits}",
-            f"Puntaje final: {score}",
-            "",
-            "TOP 5 GLOBAL:"
-        ]
-        for line in lines:
-            txt = font.render(line, True, (255, 255, 255))
-            screen.blit(txt, (40, y))
-            y += 30
-
-        for i, s in enumerate(top_scores):
-            linea = (
-                f"{i+1}. {s['name']} [{s['mode']}]  |  "
-                f"Score: {s['score']}  |  T: {s['time']:.1f}s  |  "
-                f"K: {s['kills']}  |  Traps: {s['traps']}"
-            )
-            txt = font.render(linea, True, (200, 200, 200))
-            screen.blit(txt, (60, y))
-            y += 24
-
-        info = font.render("ENTER o ESC para volver al menú", True, (150, 150, 255))
-        screen.blit(info,
-                    (SCREEN_WIDTH // 2 - info.get_width() // 2,
-                     SCREEN_HEIGHT - 40))
-
-        pygame.display.flip()
-        clock.tick(60)
+    screen.blit(TEXTOS.panel(font, lines), (0, 0))
+    pygame.display.flip()
+    wait_for_key()
 
 def show_scores_screen(screen, font):
-    clock = pygame.time.Clock()
-
-    escapa_scores = load_scores("ESCAPA")
-    cazador_scores = load_scores("CAZADOR")
-
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                raise SystemExit
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
-                    running = False
-
-        screen.fill((0, 0, 0))
-
-        # ----------------------
-        # TÍTULO GENERAL
-        # ----------------------
-        title = font.render("TOP 5 - ESCAPA y CAZADOR", True, (255, 255, 0))
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
-
-        # ==============================
-        #      SECCIÓN ESCAPA (ARRIBA)
-        # ==============================
-        y = 70
-        txt_e = font.render("MODO ESCAPA (Huir)", True, (0, 255, 0))
-        screen.blit(txt_e, (40, y))
-        y += 35
-
-        if not escapa_scores:
-            screen.blit(font.render("Sin registros", True, (200, 200, 200)), (40, y))
-            y += 30
-        else:
-            for i, s in enumerate(escapa_scores):
-                line = (
-                    f"{i+1}. {s['name']}  | Score: {s['score']}  "
-                    f"| Tiempo: {s['time']:.1f}s  | K: {s['kills']}  "
-                    f"| Trampas: {s['traps']}"
-                )
-                txt = font.render(line, True, (220, 220, 220))
-                screen.blit(txt, (40, y))
-                y += 28
-
-        # espacio entre bloques
-        y += 40
-
-        # ==============================
-        #      SECCIÓN CAZADOR (ABAJO)
-        # ==============================
-        txt_c = font.render("MODO CAZADOR", True, (255, 120, 0))
-        screen.blit(txt_c, (40, y))
-        y += 35
-
-        if not cazador_scores:
-            screen.blit(font.render("Sin registros", True, (200, 200, 200)), (40, y))
-            y += 30
-        else:
-            for i, s in enumerate(cazador_scores):
-                line = (
-                    f"{i+1}. {s['name']}  | Score: {s['score']}  "
-                    f"| Tiempo: {s['time']:.1f}s  | Kills: {s['kills']}"
-                )
-                txt = font.render(line, True, (220, 220, 220))
-                screen.blit(txt, (40, y))
-                y += 28
-
-        # ----------------------
-        # Instrucción para salir
-        # ----------------------
-        info = font.render("ENTER o ESC para volver al menú", True, (150, 150, 255))
-        screen.blit(info,
-                    (SCREEN_WIDTH // 2 - info.get_width() // 2,
-                     SCREEN_HEIGHT - 40))
-
-        pygame.display.flip()
-        clock.tick(60)
-
-
-# ---------- LOADERS ----------
-def load_tiles():
-    sprites = {}
-    sprites[CAMINO] = pygame.image.load("assets/tiles/1.png").convert_alpha()
-    sprites[MURO]   = pygame.image.load("assets/tiles/7.png").convert_alpha()
-    sprites[TUNEL]  = pygame.image.load("assets/tiles/8.png").convert_alpha()
-    sprites[LIANA]  = pygame.image.load("assets/tiles/0.png").convert_alpha()
-    sprites[SALIDA] = pygame.image.load("assets/tiles/9.png").convert_alpha()
-
-    for k, img in sprites.items():
-        sprites[k] = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-    return sprites
-
-
-def load_player_animations(folder_name):
-    animation_list = []
-
-    anims = [
-        "idle",          # 0
-        "running_up",    # 1
-        "running_down",  # 2
-        "running_left",  # 3
-        "running_right"  # 4
-    ]
-
-    for anim_name in anims:
-        frames = []
-        for i in range(4):
-            path = f"assets/{folder_name}/{anim_name}/{i}.png"
-            img = pygame.image.load(path).convert_alpha()
-            img = pygame.transform.scale(
-                img, (TILE_SIZE * PLAYER_SCALE, TILE_SIZE * PLAYER_SCALE)
+    escapa_scores = scores.top("ESCAPA")
+    cazador_scores = scores.top("CAZADOR")
+
+    # ----------------------
+    # TÍTULO GENERAL
+    # ----------------------
+    lines = [("TOP 5 - ESCAPA y CAZADOR", (255, 255, 0), None, 20)]
+
+    # ==============================
+    #      SECCIÓN ESCAPA (ARRIBA)
+    # ==============================
+    y = 70
+    lines.append(("MODO ESCAPA (Huir)", (0, 255, 0), 40, y))
+    y += 35
+
+    if not escapa_scores:
+        lines.append(("Sin registros", (200, 200, 200), 40, y))
+        y += 30
+    else:
+        for i, s in enumerate(escapa_scores):
+            line = (
+                f"{i+1}. {s['name']}  | Score: {s['score']}  "
+                f"| Tiempo: {s['time']:.1f}s  | K: {s['kills']}  "
+                f"| Trampas: {s['traps']}"
             )
-            frames.append(img)
-        animation_list.append(frames)
-
-    return animation_list
+            lines.append((line, (220, 220, 220), 40, y))
+            y += 28
 
+    # espacio entre bloques
+    y += 40
 
-def load_enemy_animations(folder_name):
-    animation_list = []
-
-    anims = [
-        "idle",
-        "running_up",
-        "running_down",
-        "running_left",
-        "running_right"
-    ]
+    # ==============================
+    #      SECCIÓN CAZADOR (ABAJO)
+    # ==============================
+    lines.append(("MODO CAZADOR", (255, 120, 0), 40, y))
+    y += 35
 
-    for anim_name in anims:
-        frames = []
-        for i in range(4):
-            path = f"assets/{folder_name}/{anim_name}/{i}.png"
-            img = pygame.image.load(path).convert_alpha()
-            img = pygame.transform.scale(
-                img, (TILE_SIZE * PLAYER_SCALE, TILE_SIZE * PLAYER_SCALE)
+    if not cazador_scores:
+        lines.append(("Sin registros", (200, 200, 200), 40, y))
+        y += 30
+    else:
+        for i, s in enumerate(cazador_scores):
+            line = (
+                f"{i+1}. {s['name']}  | Score: {s['score']}  "
+                f"| Tiempo: {s['time']:.1f}s  | Kills: {s['kills']}"
             )
-            frames.append(img)
-        animation_list.append(frames)
-
-    return animation_list
+            lines.append((line, (220, 220, 220), 40, y))
+            y += 28
 
+    # ----------------------
+    # Instrucción para salir
+    # ----------------------
+    lines.append(("ENTER o ESC para volver al menú", (150, 150, 255), None,
+                  SCREEN_HEIGHT - 40))
+    lines = tuple(lines)
 
-def load_trap_sprite():
-    img = pygame.image.load("assets/tiles/2.png").convert_alpha()
-    img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-    return img
+    screen.blit(TEXTOS.panel(font, lines), (0, 0))
+    pygame.display.flip()
+    wait_for_key()
 
 
 # ---------- HUD ----------
-def load_hearts_sprites():
-    hearts = {}
-    hearts["full"]  = pygame.image.load("assets/hearts/0.png").convert_alpha()
-    hearts["half"]  = pygame.image.load("assets/hearts/1.png").convert_alpha()
-    hearts["empty"] = pygame.image.load("assets/hearts/2.png").convert_alpha()
-    return hearts
-
-
-def load_energy_frames():
-    frames = []
-    for i in range(ENERGY_FRAMES):
-        img = pygame.image.load(f"assets/energy/{i}.png").convert_alpha()
-        frames.append(img)
-    return frames
-
-
 def draw_hearts(screen, hearts_sprites, current_hp):
     x0 = 10
     y0 = 10
@@ -468,17 +314,12 @@ def draw_hud(screen, hearts_sprites, energy_frames, player, font,
     draw_hearts(screen, hearts_sprites, player.hp)
     draw_energy(screen, energy_frames, player.energy)
 
-    txt = font.render(f"Score: {score}  Tiempo: {elapsed_time:.1f}s",
-                      True, (255, 255, 255))
-    screen.blit(txt, (SCREEN_WIDTH - 260, 10))
+    TEXTOS.draw(screen, font, f"Score: {score}  Tiempo: {elapsed_time:.1f}s",
+                (255, 255, 255), (SCREEN_WIDTH - 260, 10))
 
 
 # ---------- PANELES DE AYUDA ----------
 def draw_help_panel_escapa(screen, font):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
-
     lines = [
         "CONTROLES - MODO ESCAPA",
         "",
@@ -498,6 +339,7 @@ def draw_help_panel_escapa(screen, font):
         "Pulsa H para reanudar."
     ]
 
+    panel = []
     y = 60
     for line in lines:
         if ("CONTROLES" in line or
@@ -506,16 +348,15 @@ def draw_help_panel_escapa(screen, font):
             color = (255, 255, 0)
         else:
             color = (255, 255, 255)
-        txt = font.render(line, True, color)
-        screen.blit(txt, (60, y))
+        panel.append((line, color, 60, y))
         y += 28
 
+    # overlay translúcido y texto en una sola Surface
+    screen.blit(TEXTOS.panel(font, tuple(panel), background=(0, 0, 0, 180)),
+                (0, 0))
 
-def draw_cazador_help_panel(screen, font):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
 
+def draw_cazador_help_panel(screen, font):
     lines = [
         "MODO CAZADOR - CONTROLES Y OBJETIVO",
         "",
@@ -536,6 +377,7 @@ def draw_cazador_help_panel(screen, font):
         "Pulsa H para reanudar."
     ]
 
+    panel = []
     y = 60
     for line in lines:
         if ("MODO CAZADOR" in line or
@@ -544,67 +386,73 @@ def draw_cazador_help_panel(screen, font):
             color = (255, 255, 0)
         else:
             color = (255, 255, 255)
-        txt = font.render(line, True, color)
-        screen.blit(txt, (60, y))
+        panel.append((line, color, 60, y))
         y += 28
 
+    # overlay translúcido y texto en una sola Surface
+    screen.blit(TEXTOS.panel(font, tuple(panel), background=(0, 0, 0, 180)),
+                (0, 0))
+
 
 # ---------- MODO ESCAPA ----------
-def run_escapa(screen, font):
+def read_player_input(camera, trap=False):
+    """Entrada de este frame (teclado + mouse) para la simulación."""
+    keys = pygame.key.get_pressed()
+    mouse_x, mouse_y = pygame.mouse.get_pos()
+    if camera.escalada:
+        # se dibuja directo en pantalla: el mouse ya está en la vista
+        aim = camera.to_world(mouse_x, mouse_y)
+    else:
+        scale_x = SCREEN_WIDTH / camera.rect.width
+        scale_y = SCREEN_HEIGHT / camera.rect.height
+        aim = camera.to_world(mouse_x / scale_x, mouse_y / scale_y)
+    return input_from_keys(keys, aim, trap)
+
+
+def run_escapa(screen, font, profiler=NULL_PROFILER, recorder=NULL_RECORDER,
+               playback=None):
+    """Partida de escapa. Con `playback` (replay.Replay) se repite una
+    partida grabada en vez de leer el teclado."""
     clock = pygame.time.Clock()
 
-    render_w = WORLD_W * TILE_SIZE
-    render_h = WORLD_H * TILE_SIZE
-    render_surface = pygame.Surface((render_w, render_h))
-
-    player_animations = load_player_animations("player")
-    enemy_animations = load_enemy_animations("enemies")
-    hearts_sprites = load_hearts_sprites()
-    energy_frames = load_energy_frames()
-    trap_img = load_trap_sprite()
-
-    # Mundo y estado inicial
-    world = World(WORLD_W, WORLD_H)
-    world.generate()
-    tile_sprites = load_tiles()
-
-    start_x, start_y = world.start
-    player = Player(start_x, start_y, player_animations)
-
-    enemies = []
-    for _ in range(NUM_ENEMIES):
-        while True:
-            x = random.randrange(world.width)
-            y = random.randrange(world.height)
-            tile = world.tiles[y][x]
-            if tile.puede_pasar_enemigo():
-                enemies.append(Enemy(x, y, enemy_animations, world))
-                break
+    player_animations = assets.player_animations()
+    enemy_animations = assets.enemy_animations()
+    hearts_sprites = assets.hearts()
+    energy_frames = assets.energy_frames()
+    trap_img = assets.trap_sprite()
+
+    # Mundo y estado inicial (las reglas están en EscapaSim); `entradas`
+    # graba lo que se juega o devuelve lo grabado
+    fixed = FixedStep()
+    if playback is None:
+        world = create_world()
+        sim = EscapaSim(world, player_animations, enemy_animations,
+                        profiler=profiler)
+        entradas = recorder.begin(sim, fixed.dt)
+    else:
+        sim = playback.create_sim(player_animations, enemy_animations,
+                                  profiler)
+        world = sim.world
+        fixed = FixedStep(playback.dt)
+        entradas = playback.playback()
+    tile_sprites = assets.tiles()
+    player = sim.player
 
-    traps = []
-    trap_cooldown = 0.0
-    respawn_queue = []  # tiempos para respawn de enemigos
+    camera, canvas = make_view(world)
+    camera.center_on(player.collision_rect)
 
-    score = 0
-    traps_used = 0
-    enemies_killed_by_trap = 0
+    # la simulación va con dt fijo; se dibuja interpolando con alpha
+    alpha = 1.0
+    trap_pressed = False
 
-    show_help = False
     paused = False
-    pause_start = 0.0
-
-    start_time = pygame.time.get_ticks() / 1000.0
 
     running = True
-    elapsed_time = 0.0   # <-- NUEVO
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        current_time = pygame.time.get_ticks() / 1000.0
-
-        if not paused:
-            elapsed_time = current_time - start_time
-
+        profiler.begin_frame()
+        frame_dt = clock.tick(FPS) / 1000.0
+        profiler.mark("tick")
 
         # EVENTOS
         for event in pygame.event.get():
@@ -616,231 +464,112 @@ def run_escapa(screen, font):
                 if event.key == pygame.K_ESCAPE:
                     return  # volver al menú
 
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+
                 elif event.key == pygame.K_SPACE:
-                    if trap_cooldown <= 0 and len(traps) < MAX_TRAPS:
-                        tile_x = player.collision_rect.centerx // TILE_SIZE
-                        tile_y = player.collision_rect.centery // TILE_SIZE
-                        traps.append(Trap(tile_x, tile_y))
-                        trap_cooldown = TRAP_COOLDOWN
-                        traps_used += 1
+                    trap_pressed = True
 
                 elif event.key == pygame.K_h:
-                    if not show_help:
-                        show_help = True
-                        paused = True
-                        pause_start = current_time
-                    else:
-                        show_help = False
-                        paused = False
-                        pause_duration = current_time - pause_start
-                        start_time += pause_duration
+                    # en pausa la simulación no avanza (ni su reloj)
+                    paused = True
+        profiler.mark("events")
 
         # Pausa
         if paused:
-            render_surface.fill((0, 0, 0))
-            world.draw(render_surface, tile_sprites)
-            for trap in traps:
-                render_surface.blit(trap_img,
-                                    (trap.tile_x * TILE_SIZE,
-                                     trap.tile_y * TILE_SIZE))
-            player.draw(render_surface)
-            for enemy in enemies:
-                enemy.draw(render_surface)
-
-            scaled = pygame.transform.scale(render_surface,
-                                            (SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+            draw_scene(screen, canvas, world, tile_sprites, camera, player,
+                       sim.enemies, alpha, sim.traps, trap_img)
             draw_hud(screen, hearts_sprites, energy_frames, player,
-                     font, score, elapsed_time)
+                     font, sim.score, sim.time)
             draw_help_panel_escapa(screen, font)
             pygame.display.flip()
+            profiler.mark("paused")
+            profiler.end_frame()
+
+            # el cuadro de pausa queda en pantalla hasta H (seguir) o ESC
+            if wait_for_key((pygame.K_h, pygame.K_ESCAPE)) == pygame.K_ESCAPE:
+                return
+            paused = False
+            clock.tick()   # el tiempo en pausa no cuenta para el paso fijo
             continue
 
-        # cooldown trampas
-        if trap_cooldown > 0:
-            trap_cooldown -= dt
-            if trap_cooldown < 0:
-                trap_cooldown = 0
-
-        # INPUT
-        keys = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
-        scale_x = SCREEN_WIDTH / render_w
-        scale_y = SCREEN_HEIGHT / render_h
-        player.handle_input(keys, mouse_pos, scale_x, scale_y)
-
-        # --------- DIFICULTAD ESCAPA (POR TIEMPO) ---------
-        # Cada 20s sube una "etapa" de dificultad, hasta 3
-        DIFF_STEP_SECONDS = 20.0
-        diff_stage = int(elapsed_time // DIFF_STEP_SECONDS)
-        if diff_stage > 3:
-            diff_stage = 3
-
-        # multiplicador de velocidad: 1.0, 1.18, 1.36, 1.54
-        enemy_speed_mult = 1.0 + 0.18 * diff_stage
-
-        # daño base = 1 (medio corazón)
-        # luego 2,3,4 → hasta 2 corazones por golpe
-        hit_damage = 1 + diff_stage
-
-
-        player.move(dt, world)
-
-        for enemy in enemies:
-            enemy.speed = ENEMY_SPEED * enemy_speed_mult
-            enemy.update(dt, world, player)
-
-
-        # COLISIÓN JUGADOR–ENEMIGO
-        for enemy in enemies:
-            if player.hitbox_rect.colliderect(enemy.hitbox_rect):
-                player.take_damage(hit_damage)
-
-        # COLISIÓN ENEMIGO–TRAMPA
-        enemies_to_kill = []
-        traps_to_remove = []
-
-        for enemy in enemies:
-            for trap in traps:
-                if enemy.hitbox_rect.colliderect(trap.rect):
-                    enemies_to_kill.append(enemy)
-                    traps_to_remove.append(trap)
-                    score += SCORE_TRAP_KILL
-                    enemies_killed_by_trap += 1
-
-        enemies_to_kill = list(set(enemies_to_kill))
-        traps_to_remove = list(set(traps_to_remove))
-
-        for enemy in enemies_to_kill:
-            if enemy in enemies:
-                enemies.remove(enemy)
-                respawn_queue.append(current_time + ENEMY_RESPAWN_TIME)
-
-        for trap in traps_to_remove:
-            if trap in traps:
-                traps.remove(trap)
-
-        # REAPARECER ENEMIGOS
-        new_respawn_queue = []
-        for t_respawn in respawn_queue:
-            if current_time >= t_respawn:
-                while True:
-                    x = random.randrange(world.width)
-                    y = random.randrange(world.height)
-                    tile = world.tiles[y][x]
-                    if tile.puede_pasar_enemigo():
-                        enemies.append(Enemy(x, y, enemy_animations, world))
-                        break
-            else:
-                new_respawn_queue.append(t_respawn)
-        respawn_queue = new_respawn_queue
-
-        # MUERTE → derrota
-        if player.is_dead():
-            final_score = compute_final_score(
-                elapsed_time,
-                enemies_killed_by_trap,
-                traps_used
-            )
-            show_end_screen(screen, font, final_score, elapsed_time,
-                            enemies_killed_by_trap, traps_used, win=False)
-            return
-
-        # VICTORIA → llegar a la salida
-        tile_bajo = world.get_tile_at_rect_center(player.collision_rect)
-        if isinstance(tile_bajo, Salida):
-            final_score = compute_final_score(
-                elapsed_time,
-                enemies_killed_by_trap,
-                traps_used
-            )
-            show_end_screen(screen, font, final_score, elapsed_time,
-                            enemies_killed_by_trap, traps_used, win=True)
+        # INPUT + UPDATE (0, 1 o varios pasos fijos según el tiempo real)
+        entrada = read_player_input(camera, trap_pressed)
+        profiler.mark("input")
+        for _ in range(fixed.advance(frame_dt)):
+            paso = entradas.tick(entrada)
+            if paso is None:
+                return  # fin de la partida grabada
+            if sim.step(fixed.dt, paso):
+                break
+            # la trampa se pone una sola vez, en el primer paso
+            entrada = entrada._replace(trap=False)
+            trap_pressed = False
+        alpha = fixed.alpha
+        camera.follow(player.render_rect(alpha))
+        profiler.mark("camera")
+
+        # MUERTE → derrota / VICTORIA → llegar a la salida
+        if sim.finished:
+            if playback is not None:
+                return
+            show_end_screen(screen, font, sim.final_score(), sim.time,
+                            sim.enemies_killed_by_trap, sim.traps_used,
+                            win=sim.won)
             return
 
         # DIBUJO
-        render_surface.fill((0, 0, 0))
-        world.draw(render_surface, tile_sprites)
-
-        # trampas
-        for trap in traps:
-            render_surface.blit(trap_img,
-                                (trap.tile_x * TILE_SIZE,
-                                 trap.tile_y * TILE_SIZE))
-
-        player.draw(render_surface)
-
-        for enemy in enemies:
-            enemy.draw(render_surface)
-
-        scaled = pygame.transform.scale(render_surface,
-                                        (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(scaled, (0, 0))
+        draw_scene(screen, canvas, world, tile_sprites, camera, player,
+                   sim.enemies, alpha, sim.traps, trap_img, profiler)
 
         draw_hud(screen, hearts_sprites, energy_frames, player,
-                 font, score, elapsed_time)
+                 font, sim.score, sim.time)
+        profiler.draw(screen, font)
+        profiler.mark("hud")
 
         pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
 
 
 # ---------- MODO CAZADOR ----------
-def run_cazador(screen, font):
+def run_cazador(screen, font, profiler=NULL_PROFILER, recorder=NULL_RECORDER,
+                playback=None):
     clock = pygame.time.Clock()
 
-    render_w = WORLD_W * TILE_SIZE
-    render_h = WORLD_H * TILE_SIZE
-    render_surface = pygame.Surface((render_w, render_h))
-
-    player_animations = load_player_animations("player")
-    enemy_animations = load_enemy_animations("enemies")
-    hearts_sprites = load_hearts_sprites()
-    energy_frames = load_energy_frames()
-
-    world = World(WORLD_W, WORLD_H)
-    world.generate()
-    tile_sprites = load_tiles()
-
-    start_x, start_y = world.start
-    player = Player(start_x, start_y, player_animations)
-
-    enemies = []
-    for _ in range(NUM_ENEMIES):
-        while True:
-            x = random.randrange(world.width)
-            y = random.randrange(world.height)
-            tile = world.tiles[y][x]
-            if tile.puede_pasar_enemigo():
-                enemies.append(Enemy(x, y, enemy_animations, world))
-                break
-
-    score = 0
-    kills = 0
-    exits = 0
-    difficulty_level = 0 
+    player_animations = assets.player_animations()
+    enemy_animations = assets.enemy_animations()
+    hearts_sprites = assets.hearts()
+    energy_frames = assets.energy_frames()
+
+    fixed = FixedStep()
+    if playback is None:
+        world = create_world()
+        sim = CazadorSim(world, player_animations, enemy_animations,
+                         profiler=profiler)
+        entradas = recorder.begin(sim, fixed.dt)
+    else:
+        sim = playback.create_sim(player_animations, enemy_animations,
+                                  profiler)
+        world = sim.world
+        fixed = FixedStep(playback.dt)
+        entradas = playback.playback()
+    tile_sprites = assets.tiles()
+    player = sim.player
 
+    camera, canvas = make_view(world)
+    camera.center_on(player.collision_rect)
 
-    TIME_LIMIT = CAZADOR_TIME_LIMIT
-    start_time = pygame.time.get_ticks() / 1000.0
+    alpha = 1.0
 
-    show_help = False
     paused = False
-    pause_start = 0.0
 
     running = True
-    elapsed_time = 0.0   # <-- NUEVO
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        current_time = pygame.time.get_ticks() / 1000.0
-
-        if not paused:
-            elapsed_time = current_time - start_time
-
-        # --------- DIFICULTAD CAZADOR (POR KILLS) ---------
-        # Por cada kill sube un 12% la velocidad de los enemigos
-        enemy_speed_mult = 1.0 + 0.12 * difficulty_level
-
-
+        profiler.begin_frame()
+        frame_dt = clock.tick(FPS) / 1000.0
+        profiler.mark("tick")
 
         # EVENTOS
         for event in pygame.event.get():
@@ -852,185 +581,196 @@ def run_cazador(screen, font):
                 if event.key == pygame.K_ESCAPE:
                     return  # volver al menú
 
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+
                 elif event.key == pygame.K_h:
-                    if not show_help:
-                        show_help = True
-                        paused = True
-                        pause_start = current_time
-                    else:
-                        show_help = False
-                        paused = False
-                        pause_duration = current_time - pause_start
-                        start_time += pause_duration
+                    paused = True
+        profiler.mark("events")
 
         if paused:
-            render_surface.fill((0, 0, 0))
-            world.draw(render_surface, tile_sprites)
-            player.draw(render_surface)
-            for enemy in enemies:
-                enemy.draw(render_surface)
-
-            scaled = pygame.transform.scale(render_surface,
-                                            (SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+            draw_scene(screen, canvas, world, tile_sprites, camera, player,
+                       sim.enemies, alpha)
             draw_hud(screen, hearts_sprites, energy_frames, player,
-                     font, score, elapsed_time)
+                     font, sim.score, sim.time)
             draw_cazador_help_panel(screen, font)
             pygame.display.flip()
+            profiler.mark("paused")
+            profiler.end_frame()
+
+            # el cuadro de pausa queda en pantalla hasta H (seguir) o ESC
+            if wait_for_key((pygame.K_h, pygame.K_ESCAPE)) == pygame.K_ESCAPE:
+                return
+            paused = False
+            clock.tick()   # el tiempo en pausa no cuenta para el paso fijo
             continue
 
-        # INPUT
-        keys = pygame.key.get_pressed()
-        mouse_pos = pygame.mouse.get_pos()
-        scale_x = SCREEN_WIDTH / render_w
-        scale_y = SCREEN_HEIGHT / render_h
-        player.handle_input(keys, mouse_pos, scale_x, scale_y)
-
-        # UPDATE
-        player.move(dt, world)
-        for enemy in enemies:
-            enemy.speed = ENEMY_SPEED * enemy_speed_mult
-            enemy.update_cazador(dt, world, player)
-
-
-        # JUGADOR atrapa enemigo
-        for enemy in list(enemies):
-            if player.hitbox_rect.colliderect(enemy.hitbox_rect):
-                kills += 1
-                score += CAZADOR_KILL_SCORE
-                difficulty_level += 1
-                enemies.remove(enemy)
-
-                # respawn
-                while True:
-                    x = random.randrange(world.width)
-                    y = random.randrange(world.height)
-                    tile = world.tiles[y][x]
-                    if tile.puede_pasar_enemigo():
-                        enemies.append(Enemy(x, y, enemy_animations, world))
-                        break
-
-        # ENEMIGOS que llegan a la salida
-        for enemy in list(enemies):
-            tile_enemy = world.get_tile_at_rect_center(enemy.collision_rect)
-            if isinstance(tile_enemy, Salida):
-                exits += 1
-                score -= CAZADOR_EXIT_PENALTY
-                enemies.remove(enemy)
-                # respawn
-                while True:
-                    x = random.randrange(world.width)
-                    y = random.randrange(world.height)
-                    tile = world.tiles[y][x]
-                    if tile.puede_pasar_enemigo():
-                        enemies.append(Enemy(x, y, enemy_animations, world))
-                        break
+        # INPUT + UPDATE (0, 1 o varios pasos fijos según el tiempo real)
+        entrada = read_player_input(camera)
+        profiler.mark("input")
+        for _ in range(fixed.advance(frame_dt)):
+            paso = entradas.tick(entrada)
+            if paso is None:
+                return  # fin de la partida grabada
+            if sim.step(fixed.dt, paso):
+                break
+        alpha = fixed.alpha
+        camera.follow(player.render_rect(alpha))
+        profiler.mark("camera")
 
         # fin por tiempo
-        if elapsed_time >= TIME_LIMIT:
+        if sim.finished:
+            if playback is not None:
+                return
             name = get_player_name(screen, font)
-            save_score(name, "CAZADOR", score, elapsed_time, kills, 0)
-            show_cazador_results(screen, font, score, elapsed_time, kills, exits)
+            scores.save(name, "CAZADOR", sim.score, sim.time, sim.kills, 0)
+            show_cazador_results(screen, font, sim.score, sim.time,
+                                 sim.kills, sim.exits)
             return
 
         # DIBUJO
-        render_surface.fill((0, 0, 0))
-        world.draw(render_surface, tile_sprites)
-        player.draw(render_surface)
-        for enemy in enemies:
-            enemy.draw(render_surface)
-
-        scaled = pygame.transform.scale(render_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(scaled, (0, 0))
+        draw_scene(screen, canvas, world, tile_sprites, camera, player,
+                   sim.enemies, alpha, profiler=profiler)
 
         # HUD genérico (vidas, energía, score, tiempo jugado)
         draw_hud(screen, hearts_sprites, energy_frames, player,
-                 font, score, elapsed_time)
+                 font, sim.score, sim.time)
 
         # TIEMPO RESTANTE específico de MODO CAZADOR
-        time_left = max(0, TIME_LIMIT - elapsed_time)
-        txt_time = font.render(f"Tiempo restante: {time_left:4.1f}s", True, (255, 255, 0))
-        screen.blit(txt_time, (SCREEN_WIDTH - 260, 30))
+        TEXTOS.draw(screen, font, f"Tiempo restante: {sim.time_left:4.1f}s",
+                    (255, 255, 0), (SCREEN_WIDTH - 260, 30))
+        profiler.draw(screen, font)
+        profiler.mark("hud")
 
         pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
 
 
 
 # ---------- MENÚ PRINCIPAL ----------
+def menu_lines(options, selected):
+    """Líneas (texto, color, x, y) del menú con la opción `selected` marcada."""
+    lines = [("ESCAPA DEL LABERINTO", (255, 255, 0), None, 40)]
+
+    y = 120
+    for i, txt in enumerate(options):
+        color = (255, 255, 255)
+        if i == selected:
+            color = (0, 255, 0)
+        lines.append((txt, color, None, y))
+        y += 40
+
+    # info de modos
+    y += 10
+    info = [
+        "Controles generales: W/A/S/D para moverse, SHIFT para correr.",
+        "ESC para salir, H para ver/ocultar la ayuda en cada modo.",
+        "",
+        "MODO ESCAPA:",
+        "- Objetivo: llegar a la salida sin morir.",
+        "- Los cazadores te persiguen.",
+        "- Puedes colocar trampas (ESPACIO) para eliminarlos.",
+        "",
+        "MODO CAZADOR:",
+        "- Objetivo: en tiempo límite atrapar el máximo de enemigos.",
+        "- Los enemigos huyen de ti y buscan la salida.",
+        "- Si llegan a la salida pierdes puntos; si los cazas, ganas puntos."
+    ]
+    for line in info:
+        col = (255, 255, 255)
+        if "ESCAPA" in line or "CAZADOR" in line:
+            col = (255, 255, 0)
+        lines.append((line, col, 40, y))
+        y += 24
+    return tuple(lines)
+
+
 def show_main_menu(screen, font):
     clock = pygame.time.Clock()
     selected = 0  # 0 = Escapa, 1 = Cazador, 2 = Ver Top 5, 3 = Salir
     options = ["MODO ESCAPA", "MODO CAZADOR", "VER TOP 5", "SALIR"]
 
 
+    redraw = True
+
     while True:
-        for event in pygame.event.get():
+        # mientras se ve el menú, cargar los gráficos de a uno por cuadro
+        cargando = assets.prewarm_step()
+
+        if redraw:
+            # la pantalla entera depende solo de la opción elegida
+            screen.blit(TEXTOS.panel(font, menu_lines(options, selected)),
+                        (0, 0))
+            pygame.display.flip()
+            redraw = False
+
+        if cargando:
+            events = pygame.event.get()
+            clock.tick(60)
+        else:
+            events = wait_events()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
                     selected = (selected - 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_DOWN:
                     selected = (selected + 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_RETURN:
                     return selected
 
-        screen.fill((0, 0, 0))
-
-        title = font.render("ESCAPA DEL LABERINTO", True, (255, 255, 0))
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 40))
-
-        y = 120
-        for i, txt in enumerate(options):
-            color = (255, 255, 255)
-            if i == selected:
-                color = (0, 255, 0)
-            rtxt = font.render(txt, True, color)
-            screen.blit(rtxt, (SCREEN_WIDTH // 2 - rtxt.get_width() // 2, y))
-            y += 40
-
-        # info de modos
-        y += 10
-        lines = [
-            "Controles generales: W/A/S/D para moverse, SHIFT para correr.",
-            "ESC para salir, H para ver/ocultar la ayuda en cada modo.",
-            "",
-            "MODO ESCAPA:",
-            "- Objetivo: llegar a la salida sin morir.",
-            "- Los cazadores te persiguen.",
-            "- Puedes colocar trampas (ESPACIO) para eliminarlos.",
-            "",
-            "MODO CAZADOR:",
-            "- Objetivo: en tiempo límite atrapar el máximo de enemigos.",
-            "- Los enemigos huyen de ti y buscan la salida.",
-            "- Si llegan a la salida pierdes puntos; si los cazas, ganas puntos."
-        ]
-        for line in lines:
-            col = (255, 255, 255)
-            if "ESCAPA" in line or "CAZADOR" in line:
-                col = (255, 255, 0)
-            t = font.render(line, True, col)
-            screen.blit(t, (40, y))
-            y += 24
-
-        pygame.display.flip()
-        clock.tick(60)
-
 
 # ---------- MAIN ----------
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escapa del laberinto")
+    parser.add_argument("--replay", metavar="ARCHIVO",
+                        help="ver una partida grabada (ver replay.py)")
+    parser.add_argument("--profile", action="store_true",
+                        help="medir tiempos por fase (F3) y guardarlos en "
+                             f"{PROFILE_DIR}/")
+    args = parser.parse_args(argv)
+
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Proyecto Laberinto")
     font = pygame.font.SysFont(None, 24)
 
+    # tiempos por fase de cada partida. F3 muestra el overlay (y empieza a
+    # medir si estaba apagado); el reporte se guarda al volver al menú o al
+    # cerrar la ventana, solo si se pidió con --profile.
+    profiler = FrameProfiler(enabled=args.profile or PROFILER_ENABLED or
+                             os.environ.get(PROFILER_ENV) == "1")
+
+    if args.replay:
+        playback = load_replay(args.replay)
+        run = run_escapa if playback.mode == "escapa" else run_cazador
+        run(screen, font, profiler, playback=playback)
+        pygame.quit()
+        return
+
+    # cada partida se graba en REPLAY_DIR al terminar (o al salir con ESC)
+    recorder = Recorder()
+
     while True:
         opcion = show_main_menu(screen, font)
         if opcion == 0:
-            run_escapa(screen, font)
+            try:
+                run_escapa(screen, font, profiler, recorder)
+            finally:
+                profiler.save("escapa")
+                recorder.save()
         elif opcion == 1:
-            run_cazador(screen, font)
+            try:
+                run_cazador(screen, font, profiler, recorder)
+            finally:
+                profiler.save("cazador")
+                recorder.save()
         elif opcion == 2:
             show_scores_screen(screen, font)
         else:
@@ -0,0 +1,122 @@
+"""Paquetes de mapas pre-generados.
+
+Formato del archivo:
+    cabecera  : b"LABPACK1" + cantidad de mapas (uint32)
+    índice    : por mapa, offset (uint64) y largo (uint32)
+    datos     : cada mapa serializado con World.to_bytes()
+
+El archivo se abre con mmap, así cargar un nivel es solo leer su trozo y
+desempaquetarlo, sin generar nada.
+
+Uso:
+    python maps.py build mapas.pack --count 365 --size 35x25 --seed 1
+    python maps.py info mapas.pack
+"""
+import argparse
+import datetime
+import mmap
+import struct
+
+from world import World
+from constants import MAZE_GENERATOR
+
+_MAGIA = b"LABPACK1"
+_CABECERA = struct.Struct("<8sI")
+_ENTRADA = struct.Struct("<QI")
+
+
+def write_pack(path, worlds):
+    blobs = [w.to_bytes() for w in worlds]
+
+    offset = _CABECERA.size + _ENTRADA.size * len(blobs)
+    indice = []
+    for blob in blobs:
+        indice.append(_ENTRADA.pack(offset, len(blob)))
+        offset += len(blob)
+
+    with open(path, "wb") as f:
+        f.write(_CABECERA.pack(_MAGIA, len(blobs)))
+        f.write(b"".join(indice))
+        for blob in blobs:
+            f.write(blob)
+
+
+def build_pack(path, count, width, height, seed=0, generador=MAZE_GENERATOR):
+    """Genera `count` mapas con semillas seed, seed+1, ... y los guarda."""
+    worlds = []
+    for i in range(count):
+        world = World(width, height, seed + i)
+        world.generate(generador)
+        worlds.append(world)
+    write_pack(path, worlds)
+
+
+class MapPack:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magia, self.count = _CABECERA.unpack_from(self._mm, 0)
+        if magia != _MAGIA:
+            self.close()
+            raise ValueError(f"{path} no es un paquete de mapas")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("mapa fuera del paquete")
+        offset, largo = _ENTRADA.unpack_from(
+            self._mm, _CABECERA.size + i * _ENTRADA.size)
+        return World.from_bytes(memoryview(self._mm)[offset:offset + largo])
+
+    def daily(self, date=None):
+        """Mapa del día: el mismo para todos en una fecha dada."""
+        if date is None:
+            date = datetime.date.today()
+        return self[date.toordinal() % self.count]
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paquetes de mapas")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_build = sub.add_parser("build", help="generar un paquete")
+    p_build.add_argument("path")
+    p_build.add_argument("--count", type=int, default=100)
+    p_build.add_argument("--size", default="35x25")
+    p_build.add_argument("--seed", type=int, default=0)
+    p_build.add_argument("--generator", default=MAZE_GENERATOR)
+
+    p_info = sub.add_parser("info", help="mostrar el contenido")
+    p_info.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        build_pack(args.path, args.count, w, h, args.seed, args.generator)
+        print(f"{args.count} mapas de {w}x{h} en {args.path}")
+    else:
+        with MapPack(args.path) as pack:
+            print(f"{len(pack)} mapas")
+            for i in range(min(len(pack), 10)):
+                world = pack[i]
+                print(f"  {i}: {world.width}x{world.height} seed={world.seed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Búsqueda de caminos A* sobre las casillas por donde pasa el enemigo.
+
+El PathFinder es uno por mundo y lo comparten todos los enemigos:
+- cachea los caminos por (tile inicio, tile destino) y los descarta cuando
+  cambia el mapa (world.version);
+- tiene un presupuesto de nodos expandidos por tick de simulación (no por
+  cuadro dibujado: así el juego, la simulación sin pantalla y las
+  repeticiones hacen las mismas búsquedas); si se agota, la búsqueda
+  devuelve None y el enemigo lo reintenta en el tick siguiente.
+"""
+import heapq
+from collections import OrderedDict
+
+from constants import PATHFIND_TICK_BUDGET, PATH_CACHE_SIZE
+
+# camino imposible (se cachea igual que un camino válido)
+SIN_CAMINO = ()
+
+_VECINOS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class PathFinder:
+    def __init__(self, world, budget=None, cache_size=None):
+        """Por defecto PATHFIND_TICK_BUDGET y PATH_CACHE_SIZE."""
+        if budget is None:
+            budget = PATHFIND_TICK_BUDGET
+        if cache_size is None:
+            cache_size = PATH_CACHE_SIZE
+        self.world = world
+        self.budget = budget
+        self.cache_size = cache_size
+        self.restante = budget
+
+        self._cache = OrderedDict()
+        self._version = world.version
+
+        # estadísticas (útiles para benchmarks)
+        self.hits = 0
+        self.misses = 0
+
+    def begin_tick(self):
+        """Recarga el presupuesto de búsqueda. Llamar una vez por tick."""
+        self.restante = self.budget
+
+    def _validar_cache(self):
+        if self._version != self.world.version:
+            self._cache.clear()
+            self._version = self.world.version
+
+    def find_path(self, start, goal, limite=None, usar_presupuesto=True):
+        """Camino de start a goal (tupla de tiles, ambos incluidos).
+
+        Devuelve SIN_CAMINO si no existe (o si necesita expandir más de
+        `limite` nodos) y None si se acabó el presupuesto del tick.
+        """
+        self._validar_cache()
+
+        clave = (start, goal)
+        camino = self._cache.get(clave)
+        if camino is not None:
+            self._cache.move_to_end(clave)
+            self.hits += 1
+            return camino
+
+        max_nodos = limite if limite is not None else float("inf")
+        if usar_presupuesto:
+            if self.restante <= 0:
+                return None
+            max_nodos = min(max_nodos, self.restante)
+
+        camino, expandidos = self._astar(start, goal, max_nodos)
+        if usar_presupuesto:
+            self.restante -= expandidos
+
+        if camino is None:
+            if limite is not None and expandidos > limite:
+                # demasiado lejos: no se cachea, con otro límite podría llegar
+                return SIN_CAMINO
+            return None
+
+        self.misses += 1
+        self._cache[clave] = camino
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return camino
+
+    def _astar(self, start, goal, max_nodos):
+        """(camino, nodos expandidos). camino None = se acabó max_nodos."""
+        world = self.world
+        if not (world.inside(*goal) and world.enemy_can_pass(*goal)):
+            return SIN_CAMINO, 0
+        if start == goal:
+            return (start,), 0
+
+        gx, gy = goal
+        abiertos = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+        costo = {start: 0}
+        padre = {start: None}
+        expandidos = 0
+
+        while abiertos:
+            _, g, actual = heapq.heappop(abiertos)
+            if actual == goal:
+                camino = []
+                while actual is not None:
+                    camino.append(actual)
+                    actual = padre[actual]
+                camino.reverse()
+                return tuple(camino), expandidos
+
+            if g > costo[actual]:
+                continue
+
+            expandidos += 1
+            if expandidos > max_nodos:
+                return None, expandidos
+
+            x, y = actual
+            for dx, dy in _VECINOS:
+                n = (x + dx, y + dy)
+                ng = g + 1
+                if ng >= costo.get(n, ng + 1):
+                    continue
+                if not (world.inside(*n) and world.enemy_can_pass(*n)):
+                    continue
+                costo[n] = ng
+                padre[n] = actual
+                h = abs(n[0] - gx) + abs(n[1] - gy)
+                heapq.heappush(abiertos, (ng + h, ng, n))
+
+        return SIN_CAMINO, expandidos
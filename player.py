@@ -4,12 +4,34 @@ from math import atan2, degrees
 from constants import *
 
 
+def read_keys(keys):
+    """(vx, vy, sprint) a partir del estado del teclado."""
+    vx = 0
+    vy = 0
+
+    # --- MOVIMIENTO POR TECLAS ---
+    if keys[pygame.K_w] or keys[pygame.K_UP]:
+        vy = -1
+    elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
+        vy = 1
+
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        vx = -1
+    elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        vx = 1
+
+    return vx, vy, bool(keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT])
+
+
 class Player:
-    def __init__(self, x_tile, y_tile, animation_list, speed=120):
+    def __init__(self, x_tile, y_tile, animation_list, speed=120, now=None):
+        # reloj (ms): el de la simulación si lo da, si no el de pygame
+        self.now = pygame.time.get_ticks() if now is None else now
+
         self.animation_list = animation_list
         self.action = ANIM_RUN_DOWN          # por defecto mirar hacia abajo
         self.frame_index = 0
-        self.update_time = pygame.time.get_ticks()
+        self.update_time = self.now
         self.image = self.animation_list[self.action][self.frame_index]
 
         # ---------- CAJA VERDE: COLISIÓN (UN TILE ENTERO) ----------
@@ -20,6 +42,9 @@ class Player:
         # posición flotante para movimiento suave
         self.px = float(self.collision_rect.x)
         self.py = float(self.collision_rect.y)
+        # posición del paso anterior (para interpolar al dibujar)
+        self.prev_px = self.px
+        self.prev_py = self.py
 
         # ---------- CAJA ROJA: HITBOX (MÁS PEQUEÑA ADENTRO) ----------
         shrink = int(TILE_SIZE * 0.3)  # reduce ancho/alto
@@ -55,7 +80,7 @@ class Player:
         if self.action != action:
             self.action = action
             self.frame_index = 0
-            self.update_time = pygame.time.get_ticks()
+            self.update_time = self.now
             self.image = self.animation_list[self.action][self.frame_index]
 
     def _update_animation(self):
@@ -71,10 +96,9 @@ class Player:
             return
 
         # si se está moviendo → animación normal
-        current_time = pygame.time.get_ticks()
-        if current_time - self.update_time > animation_cooldown:
+        if self.now - self.update_time > animation_cooldown:
             self.frame_index += 1
-            self.update_time = current_time
+            self.update_time = self.now
 
             if self.frame_index >= len(self.animation_list[self.action]):
                 self.frame_index = 0
@@ -82,24 +106,26 @@ class Player:
             self.image = self.animation_list[self.action][self.frame_index]
 
     # ---------- INPUT ----------
-    def handle_input(self, keys, mouse_pos=None, scale_x=1.0, scale_y=1.0):
-        vx = 0
-        vy = 0
-
-        # --- MOVIMIENTO POR TECLAS ---
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
-            vy = -1
-        elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            vy = 1
-
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            vx = -1
-        elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            vx = 1
-
+    def handle_input(self, keys, mouse_pos=None, scale_x=1.0, scale_y=1.0,
+                     camera=None):
+        vx, vy, sprint = read_keys(keys)
+
+        aim = None
+        if mouse_pos is not None:
+            # convertir mouse (pantalla) a coords del render_surface
+            aim = (mouse_pos[0] / scale_x, mouse_pos[1] / scale_y)
+            # con cámara, la vista está desplazada dentro del mundo
+            if camera is not None:
+                aim = camera.to_world(*aim)
+
+        self.apply_input(vx, vy, sprint, aim)
+
+    def apply_input(self, vx, vy, sprint=False, aim=None):
+        """Aplica una entrada ya leída: dirección (-1, 0, 1 por eje), sprint
+        y punto del mundo al que mirar si está quieto (o None)."""
         self.vx = vx * self.speed
         self.vy = vy * self.speed
-        self.want_sprint = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
+        self.want_sprint = sprint
 
         # 1) SI SE MUEVE → dirección según movimiento
         if vx != 0 or vy != 0:
@@ -120,15 +146,11 @@ class Player:
             return
 
         # 2) SI ESTÁ QUIETO → mirar hacia el mouse (sin caminar)
-        if mouse_pos is None:
+        if aim is None:
             # si no tenemos mouse, se queda mirando como esté
             return
 
-        mx_screen, my_screen = mouse_pos
-
-        # convertir mouse (pantalla) a coords del render_surface
-        mx = mx_screen / scale_x
-        my = my_screen / scale_y
+        mx, my = aim
 
         px = self.collision_rect.centerx
         py = self.collision_rect.centery
@@ -181,7 +203,11 @@ class Player:
         # hitbox roja sigue a la verde
         self.hitbox_rect.center = self.collision_rect.center
 
-    def move(self, dt, world):
+    def move(self, dt, world, now=None):
+        self.now = pygame.time.get_ticks() if now is None else now
+        self.prev_px = self.px
+        self.prev_py = self.py
+
         # ---------- TIMERS ----------
         # cooldown de sprint
         if self.sprint_lock_timer > 0:
@@ -254,8 +280,22 @@ class Player:
             self.energy = MAX_ENERGY
 
     # ---------- DIBUJAR ----------
-    def draw(self, surface):
-        image_rect = self.image.get_rect(midbottom=self.collision_rect.midbottom)
+    def render_rect(self, alpha=1.0):
+        """Caja de colisión entre el paso anterior (alpha=0) y el actual."""
+        if alpha >= 1.0:
+            return self.collision_rect
+        x = self.prev_px + (self.px - self.prev_px) * alpha
+        y = self.prev_py + (self.py - self.prev_py) * alpha
+        return pygame.Rect(int(x), int(y), TILE_SIZE, TILE_SIZE)
+
+    def draw(self, surface, camera=None, alpha=1.0):
+        image_rect = self.image.get_rect(midbottom=self.render_rect(alpha).midbottom)
+        if camera is not None:
+            if not camera.visible(image_rect):
+                return
+            image_rect = camera.apply(image_rect)
+            surface.blit(camera.sprite(self.image), image_rect.topleft)
+            return
         surface.blit(self.image, image_rect.topleft)
         # debug opcional:
         # pygame.draw.rect(surface, (0, 255, 0), self.collision_rect, 1)
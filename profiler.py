@@ -0,0 +1,162 @@
+"""Medición de tiempos por fase de cada cuadro.
+
+El bucle del juego llama a begin_frame() al empezar el cuadro, a
+mark("fase") al terminar cada fase (el tiempo desde la marca anterior se
+suma a esa fase) y a end_frame() al final. Con F3 se ve un resumen en
+pantalla; al terminar la partida save() escribe en PROFILE_DIR un JSON con
+p50/p95/p99 e histograma del cuadro completo y de cada fase.
+
+Desactivado (lo normal al jugar) cada llamada vuelve enseguida y no se
+guarda nada. Con `python main.py --profile` o LABERINTO_PROFILE=1 mide desde
+el principio y guarda el reporte; si no, F3 lo prende recién en el cuadro
+siguiente y solo para el overlay.
+"""
+import json
+import math
+import os
+import time
+from array import array
+from time import perf_counter_ns
+
+from constants import PROFILER_ENABLED, PROFILE_DIR
+
+# bordes de los baldes del histograma, en ms (16.7 = 60 FPS, 33.3 = 30 FPS)
+BORDES_MS = (1, 2, 4, 8, 12, 16.7, 20, 25, 33.3, 50, 100)
+
+_NS_POR_MS = 1_000_000
+
+
+def percentil(ordenados, p):
+    """Percentil p (0..100) por rango más cercano de una lista ordenada."""
+    if not ordenados:
+        return 0
+    i = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[i]
+
+
+def histograma(muestras_ns):
+    """{balde: cantidad} con los BORDES_MS."""
+    etiquetas = [f"<{BORDES_MS[0]}"]
+    for a, b in zip(BORDES_MS, BORDES_MS[1:]):
+        etiquetas.append(f"{a}-{b}")
+    etiquetas.append(f">={BORDES_MS[-1]}")
+
+    cuentas = [0] * len(etiquetas)
+    for ns in muestras_ns:
+        ms = ns / _NS_POR_MS
+        i = 0
+        while i < len(BORDES_MS) and ms >= BORDES_MS[i]:
+            i += 1
+        cuentas[i] += 1
+    return dict(zip(etiquetas, cuentas))
+
+
+def resumen(muestras_ns):
+    ordenados = sorted(muestras_ns)
+    n = len(ordenados)
+    return {
+        "frames": n,
+        "mean_ms": sum(ordenados) / n / _NS_POR_MS if n else 0.0,
+        "p50_ms": percentil(ordenados, 50) / _NS_POR_MS,
+        "p95_ms": percentil(ordenados, 95) / _NS_POR_MS,
+        "p99_ms": percentil(ordenados, 99) / _NS_POR_MS,
+        "max_ms": (ordenados[-1] if n else 0) / _NS_POR_MS,
+        "histogram_ms": histograma(ordenados),
+    }
+
+
+class FrameProfiler:
+    def __init__(self, enabled=PROFILER_ENABLED, ventana=60, con_f3=True):
+        """con_f3: F3 lo prende aunque se haya creado apagado."""
+        self.enabled = enabled
+        self.guardar = enabled   # reporte en disco solo si se pidió al crear
+        self.con_f3 = con_f3
+        self.visible = False     # overlay en pantalla (F3)
+        self.ventana = ventana   # cuadros que promedia el overlay
+        self._encender = False   # F3 pedido: medir desde el próximo cuadro
+
+        self.totales = array("q")   # ns de cada cuadro completo
+        self.fases = {}             # fase -> array("q") con ns por cuadro
+        self._actual = {}
+        self._t_inicio = 0
+        self._t_marca = 0
+
+    # ---------- MEDICIÓN ----------
+    def begin_frame(self):
+        if not self.enabled:
+            if not self._encender:
+                return
+            self.enabled = True
+        self._t_inicio = self._t_marca = perf_counter_ns()
+        self._actual = {}
+
+    def mark(self, fase):
+        if not self.enabled:
+            return
+        t = perf_counter_ns()
+        self._actual[fase] = self._actual.get(fase, 0) + t - self._t_marca
+        self._t_marca = t
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.totales.append(perf_counter_ns() - self._t_inicio)
+        for fase in self._actual:
+            if fase not in self.fases:
+                # fase nueva: 0 en todos los cuadros anteriores
+                self.fases[fase] = array("q", bytes(8 * (len(self.totales) - 1)))
+        for fase, muestras in self.fases.items():
+            muestras.append(self._actual.get(fase, 0))
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and self.con_f3:
+            self._encender = True
+
+    # ---------- OVERLAY ----------
+    def draw(self, screen, font, pos=(10, 90)):
+        if not (self.enabled and self.visible and self.totales):
+            return
+        n = min(self.ventana, len(self.totales))
+        total = sum(self.totales[-n:]) / n
+        lineas = [f"cuadro {total / _NS_POR_MS:6.2f} ms "
+                  f"({_NS_POR_MS * 1000 / total if total else 0:5.1f} fps)"]
+        for fase, muestras in self.fases.items():
+            ultimas = muestras[-n:]
+            lineas.append(f"{fase:<12} {sum(ultimas) / n / _NS_POR_MS:6.2f} ms "
+                          f"máx {max(ultimas) / _NS_POR_MS:6.2f}")
+
+        x, y = pos
+        for linea in lineas:
+            txt = font.render(linea, True, (0, 255, 0), (0, 0, 0))
+            screen.blit(txt, (x, y))
+            y += txt.get_height()
+
+    # ---------- REPORTE ----------
+    def report(self):
+        return {
+            "frame": resumen(self.totales),
+            "phases": {fase: resumen(m) for fase, m in self.fases.items()},
+        }
+
+    def save(self, nombre, directory=PROFILE_DIR):
+        """Escribe el reporte de la sesión y empieza una nueva. Devuelve la
+        ruta del archivo (o None si no había nada medido o no se pidió
+        guardar)."""
+        if not (self.enabled and self.totales):
+            return None
+        path = None
+        if self.guardar:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(
+                directory, f"{nombre}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+
+        self.totales = array("q")
+        self.fases = {}
+        return path
+
+
+# perfilador apagado para quien no recibe uno (simulación sin pantalla)
+NULL_PROFILER = FrameProfiler(enabled=False, con_f3=False)
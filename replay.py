@@ -0,0 +1,271 @@
+"""Grabación y repetición de partidas.
+
+Una partida queda determinada por el mapa, la semilla de la simulación y la
+entrada de cada tick (la simulación no mira el reloj ni el azar global). El
+Recorder guarda eso mientras se juega y al terminar lo escribe en
+REPLAY_DIR; después se puede volver a simular igual, sin pantalla y lo más
+rápido posible:
+
+    python replay.py play replays/escapa_20260101_120000.rep
+    python replay.py info replays/escapa_20260101_120000.rep
+
+o mirarla a velocidad real con `python main.py --replay <archivo>`.
+
+Formato del archivo:
+    cabecera : _CABECERA (modo, motor, tipo de mapa, enemigos, semilla, dt,
+               ticks y puntaje final para detectar desincronizaciones,
+               largos de las dos partes siguientes)
+    mapa     : World.to_bytes(), o la semilla y tamaño si es ChunkedWorld
+    entradas : un byte por tick (más 8 si cambió el aim), comprimido con zlib
+"""
+import argparse
+import itertools
+import os
+import struct
+import sys
+import time
+import zlib
+
+from world import World
+from chunked_world import ChunkedWorld
+from simulation import SIMULACIONES, SimInput, SIN_ANIMACIONES
+from constants import REPLAY_RECORD, REPLAY_DIR, SIM_DT
+
+_MAGIA = b"LABREP01"
+_CABECERA = struct.Struct("<8sBBBIQdIiII")
+_CHUNKED = struct.Struct("<IIIQ")
+_AIM = struct.Struct("<ii")
+
+_MODOS = ("escapa", "cazador")
+_MOTORES = ("objects", "swarm")
+_MAPA_GUARDADO = 0
+_MAPA_CHUNKED = 1
+
+# bits del byte de cada tick: dx + 1 (0..2) y dy + 1 en los dos primeros
+# pares, después sprint, trampa, "sin aim" y "aim nuevo" (le siguen 8 bytes)
+_SPRINT = 1 << 4
+_TRAMPA = 1 << 5
+_SIN_AIM = 1 << 6
+_AIM_NUEVO = 1 << 7
+
+
+def _mapa(world):
+    if isinstance(world, ChunkedWorld):
+        datos = _CHUNKED.pack(world.chunks_w, world.chunks_h,
+                              world.chunk_size, world.seed)
+        return _MAPA_CHUNKED, datos + world.generador.encode("utf-8")
+    return _MAPA_GUARDADO, world.to_bytes()
+
+
+def _puntaje(sim):
+    return sim.final_score() if sim.mode == "escapa" else sim.score
+
+
+# ---------- GRABACIÓN ----------
+class Recorder:
+    """Graba la partida en curso tick a tick.
+
+    tick() devuelve la entrada tal como se guarda (el aim redondeado a
+    enteros) y es esa la que hay que pasarle a la simulación, así jugar y
+    repetir dan exactamente lo mismo.
+    """
+
+    def __init__(self, enabled=REPLAY_RECORD, directory=REPLAY_DIR):
+        self.enabled = enabled
+        self.directory = directory
+        self.sim = None
+
+    def begin(self, sim, dt=SIM_DT):
+        """Empieza a grabar `sim` (recién creada), que avanza de a `dt`.
+        Devuelve el grabador."""
+        if self.enabled:
+            self.sim = sim
+            self.dt = dt
+            self._mapa = _mapa(sim.world)
+            self._datos = bytearray()
+            self._aim = None
+        return self
+
+    def tick(self, entrada):
+        aim = entrada.aim
+        if aim is not None:
+            aim = (int(aim[0]), int(aim[1]))
+            entrada = entrada._replace(aim=aim)
+        if self.sim is None:
+            return entrada
+
+        b = (entrada.dx + 1) | (entrada.dy + 1) << 2
+        if entrada.sprint:
+            b |= _SPRINT
+        if entrada.trap:
+            b |= _TRAMPA
+        if aim is None:
+            b |= _SIN_AIM
+        elif aim != self._aim:
+            b |= _AIM_NUEVO
+        self._datos.append(b)
+        if b & _AIM_NUEVO:
+            self._datos += _AIM.pack(*aim)
+            self._aim = aim
+        return entrada
+
+    def save(self, path=None):
+        """Escribe lo grabado y deja de grabar. Devuelve la ruta (o None si
+        no había nada)."""
+        sim = self.sim
+        if sim is None or sim.ticks == 0:
+            self.sim = None
+            return None
+        if path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path, f = _archivo_nuevo(os.path.join(
+                self.directory,
+                f"{sim.mode}_{time.strftime('%Y%m%d_%H%M%S')}"))
+        else:
+            f = open(path, "wb")
+
+        tipo_mapa, mapa = self._mapa
+        entradas = zlib.compress(bytes(self._datos), 9)
+        with f:
+            f.write(_CABECERA.pack(
+                _MAGIA, _MODOS.index(sim.mode), _MOTORES.index(sim.engine),
+                tipo_mapa, sim.num_enemies, sim.seed, self.dt, sim.ticks,
+                _puntaje(sim),
+                len(mapa), len(entradas)))
+            f.write(mapa)
+            f.write(entradas)
+        self.sim = None
+        return path
+
+
+def _archivo_nuevo(base):
+    """Abre base.rep sin pisar nada: si ya existe (dos partidas en el mismo
+    segundo) prueba base_1.rep, base_2.rep, ... Devuelve (ruta, archivo)."""
+    for n in itertools.count():
+        path = f"{base}_{n}.rep" if n else f"{base}.rep"
+        try:
+            return path, open(path, "xb")
+        except FileExistsError:
+            continue
+
+
+# grabador apagado para quien no recibe uno
+NULL_RECORDER = Recorder(enabled=False)
+
+
+# ---------- REPETICIÓN ----------
+class Replay:
+    def __init__(self, data):
+        data = memoryview(data)
+        (magia, modo, motor, self.tipo_mapa, self.num_enemies, self.seed,
+         self.dt, self.ticks, self.score, largo_mapa,
+         largo_entradas) = _CABECERA.unpack_from(data)
+        if magia != _MAGIA:
+            raise ValueError("no es una partida grabada")
+        self.mode = _MODOS[modo]
+        self.engine = _MOTORES[motor]
+
+        inicio = _CABECERA.size
+        self._mapa = bytes(data[inicio:inicio + largo_mapa])
+        inicio += largo_mapa
+        self._entradas = zlib.decompress(data[inicio:inicio + largo_entradas])
+
+    def create_world(self):
+        if self.tipo_mapa == _MAPA_GUARDADO:
+            return World.from_bytes(self._mapa)
+        chunks_w, chunks_h, chunk_size, seed = _CHUNKED.unpack_from(self._mapa)
+        generador = self._mapa[_CHUNKED.size:].decode("utf-8")
+        world = ChunkedWorld(chunks_w, chunks_h, seed, chunk_size=chunk_size,
+                             generador=generador)
+        world.generate()
+        return world
+
+    def create_sim(self, player_animations=SIN_ANIMACIONES,
+                   enemy_animations=SIN_ANIMACIONES, profiler=None):
+        sim = SIMULACIONES[self.mode](
+            self.create_world(), player_animations, enemy_animations,
+            seed=self.seed, num_enemies=self.num_enemies, engine=self.engine,
+            profiler=profiler)
+        if sim.engine != self.engine:
+            raise RuntimeError(f"la partida se grabó con el motor {self.engine}"
+                               " (¿falta numpy?)")
+        return sim
+
+    def inputs(self):
+        """Entradas de cada tick, en orden."""
+        datos = self._entradas
+        i = 0
+        aim = None
+        while i < len(datos):
+            b = datos[i]
+            i += 1
+            if b & _AIM_NUEVO:
+                aim = _AIM.unpack_from(datos, i)
+                i += _AIM.size
+            yield SimInput((b & 3) - 1, (b >> 2 & 3) - 1, bool(b & _SPRINT),
+                           bool(b & _TRAMPA), None if b & _SIN_AIM else aim)
+
+    def playback(self):
+        """Fuente de entradas para el bucle del juego: tick() ignora la
+        entrada en vivo y devuelve la grabada (None al terminar)."""
+        return _Reproduccion(self.inputs())
+
+
+class _Reproduccion:
+    def __init__(self, entradas):
+        self._entradas = entradas
+
+    def tick(self, entrada):
+        return next(self._entradas, None)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return Replay(f.read())
+
+
+def play_headless(rep):
+    """Vuelve a simular la partida entera lo más rápido posible."""
+    sim = rep.create_sim()
+    t0 = time.perf_counter()
+    for entrada in rep.inputs():
+        sim.step(rep.dt, entrada)
+    segundos = time.perf_counter() - t0
+
+    score = _puntaje(sim)
+    return {
+        "ticks": sim.ticks,
+        "score": score,
+        "seconds": segundos,
+        "ticks_per_second": sim.ticks / segundos if segundos else 0.0,
+        "match": sim.ticks == rep.ticks and score == rep.score,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partidas grabadas")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_play = sub.add_parser("play", help="volver a simular sin pantalla")
+    p_play.add_argument("path")
+    p_info = sub.add_parser("info", help="mostrar la cabecera")
+    p_info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    rep = load(args.path)
+    print(f"{rep.mode}: {rep.ticks} ticks ({rep.ticks * rep.dt:.1f} s), "
+          f"semilla {rep.seed}, {rep.num_enemies} enemigos ({rep.engine}), "
+          f"puntaje {rep.score}")
+    if args.cmd == "info":
+        return 0
+
+    r = play_headless(rep)
+    print(f"simulado: {r['ticks']} ticks en {r['seconds']:.2f} s "
+          f"-> {r['ticks_per_second']:.0f} ticks/s, puntaje {r['score']}")
+    if not r["match"]:
+        print("DESINCRONIZADA: el resultado no coincide con el grabado")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""Puntajes: historial completo en un log que solo crece y un índice con
+el top de cada modo.
+
+- SCORES_FILE es el log: una línea por partida, "nombre;modo;score;tiempo;
+  kills;trampas" (el mismo formato de siempre, así el archivo viejo sirve
+  como comienzo del log). Nunca se reescribe, solo se agregan líneas.
+- SCORES_INDEX es un JSON con el top SCORES_TOP_K de cada modo y hasta qué
+  byte del log está contado. Se escribe en un temporal y se reemplaza con
+  os.replace, así un corte a mitad de escritura deja el índice anterior.
+
+Al abrir se lee el índice y solo la parte del log posterior a él (lo que se
+haya agregado sin llegar a actualizar el índice); sin índice se recorre el
+log una vez. Guardar una partida es O(log k) en memoria (heap por modo) y la
+escritura a disco la hace un hilo aparte para no frenar el juego.
+"""
+import atexit
+import heapq
+import json
+import os
+import queue
+import threading
+
+from constants import SCORES_FILE, SCORES_INDEX, SCORES_TOP_K
+
+_VERSION_INDICE = 1
+
+
+def parse_line(line):
+    """Registro (dict) de una línea del log, o None si está mal formada."""
+    parts = line.strip().split(";")
+    if len(parts) != 6:
+        return None
+
+    name, mode, score_str, time_str, kills_str, traps_str = parts
+    try:
+        return {
+            "name": name,
+            "mode": mode,
+            "score": int(score_str),
+            "time": float(time_str),
+            "kills": int(kills_str),
+            "traps": int(traps_str)
+        }
+    except ValueError:
+        return None
+
+
+def format_line(s):
+    return (f"{s['name']};{s['mode']};{s['score']};"
+            f"{s['time']:.2f};{s['kills']};{s['traps']}\n")
+
+
+class ScoreStore:
+    def __init__(self, log_path=SCORES_FILE, index_path=SCORES_INDEX,
+                 k=SCORES_TOP_K):
+        self.log_path = log_path
+        self.index_path = index_path
+        self.k = k
+
+        # modo -> min-heap de (score, -orden, registro): la raíz es el peor
+        # del top; a igual score sale el más nuevo (como el sort estable)
+        self._tops = {}
+        self._orden = 0         # partidas contadas (orden de llegada)
+        self._log_size = 0      # bytes del log ya contados
+        self._lock = threading.Lock()
+
+        self._cola = queue.Queue()
+        self._hilo = None
+
+        self._cargar()
+
+    # ---------- CARGA ----------
+    def _cargar(self):
+        try:
+            tamaño = os.path.getsize(self.log_path)
+        except OSError:
+            tamaño = 0
+
+        indice = self._leer_indice()
+        if indice is not None and indice["log_size"] <= tamaño:
+            self._orden = indice["count"]
+            self._log_size = indice["log_size"]
+            for mode, registros in indice["top"].items():
+                heap = self._tops.setdefault(mode, [])
+                for orden, s in registros:
+                    heap.append((s["score"], -orden, s))
+                heapq.heapify(heap)
+        # (un log más corto que el índice es otro log: se recuenta entero)
+
+        if tamaño > self._log_size:
+            # lo agregado después del último índice (o todo, si no había);
+            # el índice se pone al día con el próximo guardado
+            self._leer_log_desde(self._log_size)
+
+    def _leer_indice(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                indice = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if indice.get("version") != _VERSION_INDICE or indice.get("k") != self.k:
+            return None
+        return indice
+
+    def _leer_log_desde(self, offset):
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            datos = f.read()
+        # una última línea sin "\n" quedó cortada: no se cuenta
+        completo = datos[:datos.rfind(b"\n") + 1]
+        for line in completo.decode("utf-8", errors="replace").splitlines():
+            s = parse_line(line)
+            if s is not None:
+                self._agregar(s)
+        self._log_size = offset + len(completo)
+
+    # ---------- TOP ----------
+    def _agregar(self, s):
+        self._orden += 1
+        heap = self._tops.setdefault(s["mode"], [])
+        item = (s["score"], -self._orden, s)
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def top(self, mode):
+        """Mejores SCORES_TOP_K de `mode`, de mayor a menor score."""
+        with self._lock:
+            heap = self._tops.get(mode, [])
+            return [s for _, _, s in sorted(heap, reverse=True)]
+
+    def history(self, mode=None):
+        """Todas las partidas del log (opcionalmente de un solo modo)."""
+        self.flush()
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    s = parse_line(line)
+                    if s is not None and (mode is None or s["mode"] == mode):
+                        yield s
+        except FileNotFoundError:
+            return
+
+    # ---------- GUARDADO ----------
+    def save(self, name, mode, score, elapsed_time, kills, traps_used):
+        s = {
+            "name": name,
+            "mode": mode,
+            "score": score,
+            "time": round(elapsed_time, 2),
+            "kills": kills,
+            "traps": traps_used
+        }
+        # juntos bajo el lock: el índice nunca cuenta algo que no esté en la cola
+        with self._lock:
+            self._agregar(s)
+            self._cola.put(format_line(s))
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._escritor, daemon=True,
+                                          name="scores")
+            self._hilo.start()
+            atexit.register(self.flush)
+
+    def flush(self):
+        """Espera a que todo lo guardado esté en disco."""
+        if self._hilo is not None:
+            self._cola.join()
+
+    def _escritor(self):
+        while True:
+            linea = self._cola.get()
+            try:
+                self._append(linea)
+                with self._lock:
+                    # varias partidas seguidas: un solo índice al final
+                    indice = self._indice() if self._cola.empty() else None
+                if indice is not None:
+                    self._escribir_indice(indice)
+            except OSError as e:
+                print(f"No se pudo guardar el puntaje: {e}")
+            finally:
+                self._cola.task_done()
+
+    def _append(self, linea):
+        datos = linea.encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            if f.tell() > self._log_size:
+                # cola de una escritura cortada: se cierra su línea
+                datos = b"\n" + datos
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_size = f.tell()
+
+    def _indice(self):
+        return {
+            "version": _VERSION_INDICE,
+            "k": self.k,
+            "count": self._orden,
+            "log_size": self._log_size,
+            "top": {mode: [[-menos_orden, s]
+                           for _, menos_orden, s in sorted(heap, reverse=True)]
+                    for mode, heap in self._tops.items()},
+        }
+
+    def _escribir_indice(self, indice):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(indice, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+
+# ---------- STORE COMPARTIDO ----------
+_store = None
+
+
+def store():
+    global _store
+    if _store is None:
+        _store = ScoreStore()
+    return _store
+
+
+def top(mode):
+    return store().top(mode)
+
+
+def save(name, mode, score, elapsed_time, kills, traps_used):
+    store().save(name, mode, score, elapsed_time, kills, traps_used)
+
+
+def flush():
+    if _store is not None:
+        _store.flush()
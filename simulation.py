@@ -0,0 +1,503 @@
+"""Reglas de juego de Escapa y Cazador, sin pantalla.
+
+EscapaSim y CazadorSim tienen todo el estado de una partida (jugador,
+enemigos, trampas, puntaje) y avanzan con step(dt, entrada). No leen
+teclado, no dibujan y no miran el reloj de pygame: el tiempo es el de la
+simulación y el azar sale de un random.Random con semilla. main.py los usa
+para jugar; este módulo también se puede correr solo para medir cuántos
+ticks por segundo se simulan:
+
+    python simulation.py --mode escapa --games 20 --ticks 3600 --seed 1
+"""
+import argparse
+import os
+import random
+import time
+from collections import namedtuple
+
+import pygame
+
+from world import World
+from chunked_world import ChunkedWorld
+from maps import MapPack
+from tiles import Salida
+from player import Player, read_keys
+from enemy import EnemyPool
+from spatial import SpatialHash, EntityList
+from fields import CampoDistancias
+from swarm import EnemySwarm, HAY_NUMPY
+from profiler import NULL_PROFILER
+from constants import *
+
+# entrada de un tick: dirección (-1, 0, 1 por eje), sprint, poner trampa y
+# punto del mundo al que mira el jugador si está quieto (o None)
+SimInput = namedtuple("SimInput", "dx dy sprint trap aim",
+                      defaults=(0, 0, False, False, None))
+SIN_ENTRADA = SimInput()
+
+# animaciones vacías para simular sin cargar imágenes
+SIN_ANIMACIONES = [[None]] * 5
+
+
+def input_from_keys(keys, aim=None, trap=False):
+    dx, dy, sprint = read_keys(keys)
+    return SimInput(dx, dy, sprint, trap, aim)
+
+
+# ---------- TRAMPA SENCILLA ----------
+class Trap:
+    def __init__(self, tile_x, tile_y):
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.rect = pygame.Rect(
+            tile_x * TILE_SIZE,
+            tile_y * TILE_SIZE,
+            TILE_SIZE,
+            TILE_SIZE
+        )
+
+
+# ---------- MUNDO ----------
+def create_world(seed=None):
+    """Mundo nuevo. Con reto diario y sin seed (partida normal) es el mapa
+    del día; con seed (headless, batch) cada seed elige un mapa del paquete,
+    así semillas distintas no juegan todas el mismo mapa."""
+    if DAILY_CHALLENGE and os.path.exists(MAP_PACK_FILE):
+        with MapPack(MAP_PACK_FILE) as pack:
+            if seed is None:
+                return pack.daily()
+            return pack[seed % len(pack)]
+
+    if WORLD_CHUNKED:
+        world = ChunkedWorld(WORLD_CHUNKS_W, WORLD_CHUNKS_H, seed)
+    else:
+        world = World(WORLD_W, WORLD_H, seed)
+    world.generate()
+    return world
+
+
+def random_enemy_tile(world, rng, lejos_de=None, min_dist=0):
+    return world.spawns().sample(rng, lejos_de, min_dist)
+
+
+def compute_final_score(elapsed_time, enemies_killed_by_trap, traps_used):
+    base_time_score = int(SCORE_TIME_FACTOR / max(elapsed_time, 1.0))
+    kills_score = enemies_killed_by_trap * SCORE_TRAP_KILL
+    traps_penalty = traps_used * SCORE_TRAP_USED_PENALTY
+
+    total = base_time_score + kills_score - traps_penalty
+    if total < 0:
+        total = 0
+    return total
+
+
+# ---------- SIMULACIÓN BASE ----------
+class _Sim:
+    mode = None
+    cazador = False
+
+    def __init__(self, world, player_animations=SIN_ANIMACIONES,
+                 enemy_animations=SIN_ANIMACIONES, seed=None,
+                 num_enemies=None, engine=None, profiler=None):
+        # sin valor, NUM_ENEMIES y ENEMY_ENGINE del momento (batch.py los
+        # cambia en tiempo de ejecución)
+        if num_enemies is None:
+            num_enemies = NUM_ENEMIES
+        if engine is None:
+            engine = ENEMY_ENGINE
+        self.world = world
+        # la semilla queda guardada para poder repetir la partida (replay.py)
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.num_enemies = num_enemies
+        # marca las fases del paso (jugador, enemigos, colisiones...)
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+        self.enemy_animations = enemy_animations
+
+        self.time = 0.0    # segundos simulados
+        self.ticks = 0
+        self.finished = False
+
+        start_x, start_y = world.start
+        self.player = Player(start_x, start_y, player_animations, now=0)
+
+        # con el motor "swarm" el EnemySwarm es lista y broadphase a la vez
+        if engine == "swarm" and HAY_NUMPY and \
+                not isinstance(world, ChunkedWorld):
+            swarm = EnemySwarm(world, enemy_animations,
+                               capacity=num_enemies, rng=self.rng)
+            self.enemies = self.enemy_hash = swarm
+            self.engine = "swarm"
+        else:
+            self.enemies = EntityList()
+            self.enemy_hash = SpatialHash()
+            self.engine = "objects"
+            # los enemigos eliminados se reusan al reaparecer
+            self.enemy_pool = EnemyPool(enemy_animations, world, self.rng)
+
+        for _ in range(num_enemies):
+            self.spawn_enemy()
+
+    @property
+    def now(self):
+        """Reloj de la simulación en ms (lo que antes era get_ticks())."""
+        return int(self.time * 1000)
+
+    # ---------- ENEMIGOS ----------
+    def spawn_enemy(self):
+        rect = self.player.collision_rect
+        x, y = random_enemy_tile(self.world, self.rng,
+                                 (rect.centerx // TILE_SIZE,
+                                  rect.centery // TILE_SIZE),
+                                 SPAWN_MIN_DISTANCE)
+        if isinstance(self.enemies, EnemySwarm):
+            self.enemies.spawn(x, y, self.now)
+            return
+        enemy = self.enemy_pool.acquire(x, y, self.now)
+        self.enemies.append(enemy)
+        self.enemy_hash.insert(enemy, enemy.hitbox_rect)
+
+    def remove_enemy(self, enemy):
+        self.enemies.remove(enemy)
+        self.enemy_hash.remove(enemy)
+        if not isinstance(self.enemies, EnemySwarm):
+            self.enemy_pool.release(enemy)
+
+    def _update_enemies(self, dt, speed):
+        world, player, now = self.world, self.player, self.now
+        if isinstance(self.enemies, EnemySwarm):
+            self.enemies.update_all(dt, player, speed, self.cazador, now)
+            return
+        for enemy in self.enemies:
+            enemy.speed = speed
+            if self.cazador:
+                enemy.update_cazador(dt, world, player, now)
+            else:
+                enemy.update(dt, world, player, now)
+            self.enemy_hash.update(enemy)
+
+    # ---------- PASO COMÚN ----------
+    def _mover(self, dt, entrada, enemy_speed):
+        world = self.world
+        player = self.player
+        player.apply_input(entrada.dx, entrada.dy, entrada.sprint, entrada.aim)
+
+        if isinstance(world, ChunkedWorld):
+            world.ensure_around([player.collision_rect] +
+                                [e.collision_rect for e in self.enemies])
+        # el presupuesto de A* es por tick: igual con o sin pantalla
+        world.pathfinder().begin_tick()
+        player.move(dt, world, self.now)
+        self.profiler.mark("player")
+        self._update_enemies(dt, enemy_speed)
+        self.profiler.mark("enemies")
+
+
+# ---------- MODO ESCAPA ----------
+class EscapaSim(_Sim):
+    mode = "escapa"
+
+    def __init__(self, world, *args, **kwargs):
+        super().__init__(world, *args, **kwargs)
+        self.traps = EntityList()
+        self.trap_cooldown = 0.0
+        self.respawn_queue = []  # tiempos para respawn de enemigos
+
+        self.score = 0
+        self.traps_used = 0
+        self.enemies_killed_by_trap = 0
+        self.won = False
+
+    def _poner_trampa(self):
+        if self.trap_cooldown <= 0 and len(self.traps) < MAX_TRAPS:
+            tile_x = self.player.collision_rect.centerx // TILE_SIZE
+            tile_y = self.player.collision_rect.centery // TILE_SIZE
+            self.traps.append(Trap(tile_x, tile_y))
+            self.trap_cooldown = TRAP_COOLDOWN
+            self.traps_used += 1
+
+    def trap_collisions(self, current_time):
+        """COLISIÓN ENEMIGO–TRAMPA (solo enemigos cerca de cada trampa)."""
+        enemies_to_kill = {}
+        traps_to_remove = {}
+
+        for trap in self.traps:
+            for enemy in self.enemy_hash.query(trap.rect):
+                enemies_to_kill[enemy] = None
+                traps_to_remove[trap] = None
+                self.score += SCORE_TRAP_KILL
+                self.enemies_killed_by_trap += 1
+
+        for enemy in enemies_to_kill:
+            self.remove_enemy(enemy)
+            self.respawn_queue.append(current_time + ENEMY_RESPAWN_TIME)
+
+        for trap in traps_to_remove:
+            self.traps.remove(trap)
+
+    def step(self, dt, entrada=SIN_ENTRADA):
+        """Avanza un tick. Devuelve True cuando la partida terminó."""
+        if self.finished:
+            return True
+        self.time += dt
+        self.ticks += 1
+        current_time = self.time
+        player = self.player
+
+        if entrada.trap:
+            self._poner_trampa()
+
+        # cooldown trampas
+        if self.trap_cooldown > 0:
+            self.trap_cooldown -= dt
+            if self.trap_cooldown < 0:
+                self.trap_cooldown = 0
+
+        # --------- DIFICULTAD ESCAPA (POR TIEMPO) ---------
+        # Cada DIFF_STEP_SECONDS sube una "etapa" de dificultad, hasta
+        # DIFF_MAX_STAGE
+        diff_stage = int(current_time // DIFF_STEP_SECONDS)
+        if diff_stage > DIFF_MAX_STAGE:
+            diff_stage = DIFF_MAX_STAGE
+
+        # multiplicador de velocidad: 1.0, 1.18, 1.36, 1.54
+        enemy_speed_mult = 1.0 + DIFF_SPEED_STEP * diff_stage
+
+        # daño base = 1 (medio corazón)
+        # luego 2,3,4 → hasta 2 corazones por golpe
+        hit_damage = 1 + diff_stage
+
+        self._mover(dt, entrada, ENEMY_SPEED * enemy_speed_mult)
+
+        # COLISIÓN JUGADOR–ENEMIGO
+        for enemy in self.enemy_hash.query(player.hitbox_rect):
+            player.take_damage(hit_damage)
+
+        self.trap_collisions(current_time)
+        self.profiler.mark("collisions")
+
+        # REAPARECER ENEMIGOS
+        new_respawn_queue = []
+        for t_respawn in self.respawn_queue:
+            if current_time >= t_respawn:
+                self.spawn_enemy()
+            else:
+                new_respawn_queue.append(t_respawn)
+        self.respawn_queue = new_respawn_queue
+        self.profiler.mark("respawn")
+
+        # MUERTE → derrota
+        if player.is_dead():
+            self.finished = True
+            return True
+
+        # VICTORIA → llegar a la salida
+        tile_bajo = self.world.get_tile_at_rect_center(player.collision_rect)
+        if isinstance(tile_bajo, Salida):
+            self.finished = True
+            self.won = True
+        return self.finished
+
+    def final_score(self):
+        return compute_final_score(self.time, self.enemies_killed_by_trap,
+                                   self.traps_used)
+
+
+# ---------- MODO CAZADOR ----------
+class CazadorSim(_Sim):
+    mode = "cazador"
+    cazador = True
+
+    def __init__(self, world, *args, **kwargs):
+        super().__init__(world, *args, **kwargs)
+        self.score = 0
+        self.kills = 0
+        self.exits = 0
+        self.difficulty_level = 0
+
+    @property
+    def time_left(self):
+        return max(0, CAZADOR_TIME_LIMIT - self.time)
+
+    def _respawn(self, enemy):
+        self.remove_enemy(enemy)
+        self.spawn_enemy()
+
+    def step(self, dt, entrada=SIN_ENTRADA):
+        """Avanza un tick. Devuelve True cuando se acabó el tiempo."""
+        if self.finished:
+            return True
+        self.time += dt
+        self.ticks += 1
+
+        # --------- DIFICULTAD CAZADOR (POR KILLS) ---------
+        # Por cada kill sube un 12% la velocidad de los enemigos
+        enemy_speed_mult = 1.0 + CAZADOR_KILL_SPEEDUP * self.difficulty_level
+
+        self._mover(dt, entrada, ENEMY_SPEED * enemy_speed_mult)
+
+        # JUGADOR atrapa enemigo
+        for enemy in self.enemy_hash.query(self.player.hitbox_rect):
+            self.kills += 1
+            self.score += CAZADOR_KILL_SCORE
+            self.difficulty_level += 1
+            self._respawn(enemy)
+
+        # ENEMIGOS que llegan a la salida (solo los que están cerca)
+        world = self.world
+        for enemy in self.enemy_hash.query_tile(*world.end):
+            tile_enemy = world.get_tile_at_rect_center(enemy.collision_rect)
+            if isinstance(tile_enemy, Salida):
+                self.exits += 1
+                self.score -= CAZADOR_EXIT_PENALTY
+                self._respawn(enemy)
+
+        self.profiler.mark("collisions")
+
+        # fin por tiempo
+        if self.time >= CAZADOR_TIME_LIMIT:
+            self.finished = True
+        return self.finished
+
+
+SIMULACIONES = {"escapa": EscapaSim, "cazador": CazadorSim}
+
+
+# ---------- PASO FIJO ----------
+class FixedStep:
+    """Acumulador para correr la simulación con dt fijo sin importar a
+    cuántos cuadros por segundo se dibuje.
+
+    Cada cuadro: pasos = fixed.advance(frame_dt); se hacen esos sim.step(dt)
+    y se dibuja interpolando con fixed.alpha (0..1) entre el estado
+    anterior y el actual.
+    """
+
+    def __init__(self, dt=SIM_DT, max_steps=MAX_SIM_STEPS):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.acumulado = 0.0
+
+    def advance(self, frame_dt):
+        self.acumulado += min(frame_dt, MAX_FRAME_TIME)
+        pasos = 0
+        while self.acumulado >= self.dt and pasos < self.max_steps:
+            self.acumulado -= self.dt
+            pasos += 1
+        # cuadro muy pesado: el tiempo que no se alcanzó a simular se pierde
+        # (mejor ir un poco lento que congelar el dibujo)
+        if self.acumulado >= self.dt:
+            self.acumulado %= self.dt
+        return pasos
+
+    @property
+    def alpha(self):
+        return self.acumulado / self.dt
+
+
+# ---------- ENTRADAS DE PRUEBA ----------
+def entrada_quieta(sim, rng):
+    return SIN_ENTRADA
+
+
+def entrada_aleatoria(sim, rng):
+    """Camina al azar: cambia de dirección cada ~0.5 s y a veces pone trampa."""
+    if sim.ticks % 30 == 0 or not hasattr(sim, "_dir_prueba"):
+        sim._dir_prueba = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (0, 0)])
+    dx, dy = sim._dir_prueba
+    return SimInput(dx, dy, rng.random() < 0.2, rng.random() < 0.01)
+
+
+def entrada_salida(sim, rng):
+    """Va a la salida por el camino más corto (campo de salida), corriendo
+    y poniendo trampas de vez en cuando. Sirve para medir dificultad: con
+    caminar al azar casi nunca se gana."""
+    world = sim.world
+    if isinstance(world, ChunkedWorld) or world.end is None:
+        return entrada_aleatoria(sim, rng)
+    if not hasattr(sim, "_campo_prueba"):
+        # por las casillas del jugador (las lianas solo las cruza el enemigo)
+        sim._campo_prueba = CampoDistancias(world, jugador=True)
+    sim._campo_prueba.actualizar(world.end)
+
+    rect = sim.player.collision_rect
+    paso = sim._campo_prueba.siguiente_paso(rect.centerx // TILE_SIZE,
+                                            rect.centery // TILE_SIZE)
+    if paso is None:
+        return entrada_aleatoria(sim, rng)
+    # hacia la esquina de la casilla siguiente: en un pasillo el eje
+    # de costado se alinea solo (el otro choca contra el muro)
+    x = paso[0] * TILE_SIZE
+    y = paso[1] * TILE_SIZE
+    dx = (x > rect.x) - (x < rect.x)
+    dy = (y > rect.y) - (y < rect.y)
+    return SimInput(dx, dy, True, rng.random() < 0.02)
+
+
+ENTRADAS = {"none": entrada_quieta, "random": entrada_aleatoria,
+            "exit": entrada_salida}
+
+
+# ---------- EJECUCIÓN SIN PANTALLA ----------
+def run_headless(mode="escapa", games=1, ticks=3600, seed=0, dt=SIM_DT,
+                 entrada="random", num_enemies=None, engine=None):
+    """Juega `games` partidas seguidas (semillas seed, seed+1, ...) de hasta
+    `ticks` ticks cada una. Devuelve un dict con los resultados."""
+    clase = SIMULACIONES[mode]
+    politica = ENTRADAS[entrada]
+    total_ticks = 0
+    terminadas = 0
+    puntajes = []
+
+    t0 = time.perf_counter()
+    for i in range(games):
+        world = create_world(seed + i)
+        sim = clase(world, seed=seed + i, num_enemies=num_enemies,
+                    engine=engine)
+        rng = random.Random(seed + i)
+        for _ in range(ticks):
+            if sim.step(dt, politica(sim, rng)):
+                terminadas += 1
+                break
+        total_ticks += sim.ticks
+        puntajes.append(sim.final_score() if mode == "escapa" else sim.score)
+    segundos = time.perf_counter() - t0
+
+    return {
+        "mode": mode,
+        "games": games,
+        "finished": terminadas,
+        "ticks": total_ticks,
+        "seconds": segundos,
+        "ticks_per_second": total_ticks / segundos if segundos else 0.0,
+        "mean_score": sum(puntajes) / len(puntajes) if puntajes else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación sin pantalla")
+    parser.add_argument("--mode", choices=sorted(SIMULACIONES), default="escapa")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=3600,
+                        help="ticks máximos por partida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dt", type=float, default=SIM_DT)
+    parser.add_argument("--input", choices=sorted(ENTRADAS), default="random")
+    parser.add_argument("--enemies", type=int, default=NUM_ENEMIES)
+    parser.add_argument("--engine", choices=("objects", "swarm"),
+                        default=ENEMY_ENGINE)
+    args = parser.parse_args(argv)
+
+    r = run_headless(args.mode, args.games, args.ticks, args.seed, args.dt,
+                     args.input, args.enemies, args.engine)
+    print(f"{r['mode']}: {r['games']} partidas ({r['finished']} terminadas), "
+          f"{r['ticks']} ticks en {r['seconds']:.2f} s "
+          f"-> {r['ticks_per_second']:.0f} ticks/s, "
+          f"puntaje medio {r['mean_score']:.1f}")
+    return r
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Broadphase de colisiones y almacenamiento de entidades.
+
+SpatialHash: grilla uniforme (celdas de TILE_SIZE) que indexa rects. Una
+consulta solo mira las celdas que toca el rect, no todas las entidades.
+
+EntityList: lista con borrado O(1) (se cambia el elemento por el último),
+para poder sacar enemigos y trampas sin recorrer la lista.
+"""
+import pygame
+
+from constants import TILE_SIZE
+
+
+class SpatialHash:
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        # (cx, cy) -> dict de objetos (dict y no set: orden estable entre
+        # ejecuciones, para que las repeticiones sean deterministas)
+        self._celdas = {}
+        self._objetos = {}    # objeto -> (rect, rango de celdas)
+
+    def __len__(self):
+        return len(self._objetos)
+
+    def __contains__(self, obj):
+        return obj in self._objetos
+
+    def _rango(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs,
+                (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def _agregar_celdas(self, obj, rango):
+        x0, y0, x1, y1 = rango
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                celda = self._celdas.get((cx, cy))
+                if celda is None:
+                    celda = self._celdas[(cx, cy)] = {}
+                celda[obj] = None
+
+    def _quitar_celdas(self, obj, rango):
+        x0, y0, x1, y1 = rango
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                celda = self._celdas.get((cx, cy))
+                if celda is not None:
+                    celda.pop(obj, None)
+                    if not celda:
+                        del self._celdas[(cx, cy)]
+
+    # ---------- ALTAS / BAJAS ----------
+    def insert(self, obj, rect):
+        """Indexa `obj` con `rect`. Se guarda la referencia al rect, así que
+        si el rect se mueve basta con llamar a update(obj)."""
+        if obj in self._objetos:
+            self.remove(obj)
+        rango = self._rango(rect)
+        self._objetos[obj] = (rect, rango)
+        self._agregar_celdas(obj, rango)
+
+    def remove(self, obj):
+        datos = self._objetos.pop(obj, None)
+        if datos is not None:
+            self._quitar_celdas(obj, datos[1])
+
+    def update(self, obj, rect=None):
+        """Re-indexa `obj` tras moverse. Si no cambió de celdas no hace nada."""
+        viejo_rect, viejo_rango = self._objetos[obj]
+        if rect is None:
+            rect = viejo_rect
+        rango = self._rango(rect)
+        if rango != viejo_rango:
+            self._quitar_celdas(obj, viejo_rango)
+            self._agregar_celdas(obj, rango)
+        self._objetos[obj] = (rect, rango)
+
+    def clear(self):
+        self._celdas.clear()
+        self._objetos.clear()
+
+    # ---------- CONSULTAS ----------
+    def query(self, rect):
+        """Objetos cuyo rect se superpone con `rect`."""
+        x0, y0, x1, y1 = self._rango(rect)
+        vistos = set()
+        resultado = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                celda = self._celdas.get((cx, cy))
+                if not celda:
+                    continue
+                for obj in celda:
+                    if obj in vistos:
+                        continue
+                    vistos.add(obj)
+                    if self._objetos[obj][0].colliderect(rect):
+                        resultado.append(obj)
+        return resultado
+
+    def query_tile(self, tile_x, tile_y, tile_size=TILE_SIZE):
+        """Objetos que tocan la casilla (tile_x, tile_y)."""
+        return self.query(pygame.Rect(tile_x * tile_size, tile_y * tile_size,
+                                      tile_size, tile_size))
+
+
+class EntityList:
+    """Lista sin orden con alta y baja O(1)."""
+
+    def __init__(self, items=()):
+        self._items = []
+        self._indice = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        self._indice[item] = len(self._items)
+        self._items.append(item)
+
+    def remove(self, item):
+        i = self._indice.pop(item)
+        ultimo = self._items.pop()
+        if ultimo is not item:
+            self._items[i] = ultimo
+            self._indice[ultimo] = i
+
+    def __contains__(self, item):
+        return item in self._indice
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
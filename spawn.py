@@ -0,0 +1,87 @@
+"""Dónde aparecen los enemigos.
+
+SpawnService es uno por mundo (world.spawns()):
+- guarda la lista de casillas por donde pasa el enemigo, así sortear una es
+  O(1) en vez de probar casillas al azar hasta acertar (en mapas con muchos
+  muros eran muchos intentos);
+- opcionalmente descarta las que quedan a menos de `min_dist` casillas del
+  jugador (unos pocos sorteos más; si no sale ninguna se recorre la lista).
+
+Cada enemigo sigue armando su propia patrulla al aparecer (ver
+Enemy._generar_puntos_patrulla).
+
+Todo se rehace cuando cambia el mapa (world.version). En un mundo por
+chunks no hay lista de casillas: se sortea con rechazo como antes.
+
+(Los Enemy eliminados se reusan con enemy.EnemyPool.)
+"""
+import itertools
+from array import array
+
+# sorteos con distancia mínima antes de recorrer la lista entera
+_INTENTOS = 32
+
+
+class SpawnService:
+    def __init__(self, world, indexar=True):
+        self.world = world
+        self.indexar = indexar
+
+        self._version = None
+        self._casillas = None    # array de índices de casillas transitables
+
+    def _validar(self):
+        world = self.world
+        if self._version == world.version:
+            return
+        self._version = world.version
+        if self.indexar:
+            paso = world.paso_enemigo
+            self._casillas = array("i", itertools.compress(range(len(paso)),
+                                                           paso))
+
+    def __len__(self):
+        """Casillas donde puede aparecer un enemigo (0 sin índice)."""
+        self._validar()
+        return len(self._casillas) if self._casillas is not None else 0
+
+    # ---------- SORTEO ----------
+    def sample(self, rng, lejos_de=None, min_dist=0):
+        """Casilla (x, y) al azar por donde pase el enemigo. Con `lejos_de`
+        (tile del jugador) y `min_dist` (casillas) evita las cercanas, salvo
+        que no haya ninguna lejos."""
+        self._validar()
+        if lejos_de is None or min_dist <= 0:
+            return self._sortear(rng)
+
+        lx, ly = lejos_de
+        min_sq = min_dist * min_dist
+        for _ in range(_INTENTOS):
+            x, y = self._sortear(rng)
+            if (x - lx) ** 2 + (y - ly) ** 2 >= min_sq:
+                return x, y
+
+        # casi todo el mapa está cerca: elegir entre las que quedan
+        if self._casillas is None:
+            return x, y
+        w = self.world.width
+        lejos = [i for i in self._casillas
+                 if (i % w - lx) ** 2 + (i // w - ly) ** 2 >= min_sq]
+        if not lejos:
+            return x, y
+        i = rng.choice(lejos)
+        return i % w, i // w
+
+    def _sortear(self, rng):
+        world = self.world
+        casillas = self._casillas
+        if casillas is None:
+            while True:
+                x = rng.randrange(world.width)
+                y = rng.randrange(world.height)
+                if world.enemy_can_pass(x, y):
+                    return x, y
+        if not casillas:
+            raise ValueError("el mapa no tiene casillas para enemigos")
+        i = casillas[rng.randrange(len(casillas))]
+        return i % world.width, i // world.width
@@ -0,0 +1,594 @@
+"""Motor de enemigos vectorizado (opcional, necesita numpy).
+
+En vez de un objeto Enemy por enemigo, EnemySwarm guarda a toda la población
+en arrays (struct of arrays): posición, velocidad, estado, velocidad base,
+animación y puntos de patrulla. Pensar, normalizar velocidades, chocar con
+las casillas y elegir animación se hace con operaciones sobre los arrays
+enteros, sin bucle de Python por enemigo.
+
+Cada enemigo se ve desde afuera como un SwarmEnemy: una vista delgada sobre
+su fila, con los mismos atributos que usa el juego de un Enemy
+(collision_rect, hitbox_rect, speed, state, draw...).
+
+Además EnemySwarm responde como un SpatialHash (insert/update/remove/query),
+así el bucle del juego lo usa a la vez como lista y como broadphase.
+
+Diferencias con Enemy: la patrulla va en línea recta hacia el punto (no
+sigue caminos A*) y solo funciona sobre World, no sobre ChunkedWorld.
+"""
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usa Enemy
+    np = None
+
+from world import TILE_SIZE
+from fields import INALCANZABLE
+from constants import *
+
+HAY_NUMPY = np is not None
+
+# estados (el mismo texto que Enemy.state)
+PATRULLA = 0
+PERSIGUE = 1
+VUELVE = 2
+_NOMBRES_ESTADO = ("patrol", "chase", "return")
+
+MAX_PUNTOS_PATRULLA = 5   # el spawn + 4
+
+_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_VECINOS_X = (1, -1, 0, 0)   # mismo orden que fields._VECINOS
+_VECINOS_Y = (0, 0, 1, -1)
+
+# distancia "muy lejos" para casillas fuera del campo al acercarse
+_LEJOS = 1 << 30
+
+# arrays por enemigo: nombre -> dtype (los puntos de patrulla van aparte)
+_CAMPOS = {
+    "px": "f8", "py": "f8",
+    "prev_px": "f8", "prev_py": "f8",   # paso anterior (interpolación)
+    "vx": "f8", "vy": "f8",
+    "speed": "f8",
+    "state": "i1",
+    "action": "i1",
+    "frame_index": "i2",
+    "last_anim_update": "i8",
+    "dir_x": "i1", "dir_y": "i1",
+    "last_dir_change": "i8",
+    "n_puntos": "i1",
+    "patrol_index": "i1",
+}
+
+
+class SwarmEnemy:
+    """Vista de una fila de EnemySwarm con la interfaz de Enemy."""
+
+    __slots__ = ("swarm", "fila")
+
+    def __init__(self, swarm, fila):
+        self.swarm = swarm
+        self.fila = fila   # None cuando el enemigo ya no existe
+
+    def _get(nombre):
+        return property(
+            lambda self: getattr(self.swarm, nombre)[self.fila].item(),
+            lambda self, v: getattr(self.swarm, nombre).__setitem__(self.fila, v))
+
+    px = _get("px")
+    py = _get("py")
+    vx = _get("vx")
+    vy = _get("vy")
+    speed = _get("speed")
+    action = _get("action")
+    frame_index = _get("frame_index")
+    patrol_index = _get("patrol_index")
+    del _get
+
+    @property
+    def state(self):
+        return _NOMBRES_ESTADO[self.swarm.state[self.fila]]
+
+    @property
+    def patrol_points(self):
+        n = self.swarm.n_puntos[self.fila]
+        return [tuple(p) for p in self.swarm.patrol[self.fila, :n].tolist()]
+
+    @property
+    def image(self):
+        return self.swarm.animation_list[self.action][self.frame_index]
+
+    @property
+    def collision_rect(self):
+        return pygame.Rect(int(self.px), int(self.py), TILE_SIZE, TILE_SIZE)
+
+    @property
+    def hitbox_rect(self):
+        hx, hy, hw, hh = self.swarm._hitbox
+        return pygame.Rect(int(self.px) + hx, int(self.py) + hy, hw, hh)
+
+    def draw(self, surface, camera=None, alpha=1.0):
+        s, i = self.swarm, self.fila
+        x = int(s.prev_px[i] + (s.px[i] - s.prev_px[i]) * alpha)
+        y = int(s.prev_py[i] + (s.py[i] - s.prev_py[i]) * alpha)
+        img_rect = self.image.get_rect(
+            midbottom=(x + TILE_SIZE // 2, y + TILE_SIZE))
+        if camera is not None:
+            if not camera.visible(img_rect):
+                return
+            img_rect = camera.apply(img_rect)
+            surface.blit(camera.sprite(self.image), img_rect.topleft)
+            return
+        surface.blit(self.image, img_rect.topleft)
+
+
+class EnemySwarm:
+    def __init__(self, world, animation_frames, capacity=64, rng=None):
+        if np is None:
+            raise ImportError("EnemySwarm necesita numpy")
+        self.world = world
+        self.animation_list = animation_frames
+        # azar de la simulación si lo da (spawn) y uno de numpy derivado
+        self.rng = random if rng is None else rng
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        self.n = 0
+        self._vistas = []
+        self._alocar(capacity)
+
+        # hitbox relativa a (px, py), igual que la de Enemy
+        col = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)
+        shrink = int(TILE_SIZE * 0.3)
+        hit = col.inflate(-shrink, -shrink)
+        hit.center = col.center
+        self._hitbox = (hit.x, hit.y, hit.w, hit.h)
+
+        # cuadros de animación: cantidad y desplazamiento del dibujo
+        # (midbottom de la imagen = midbottom de la caja de colisión)
+        self._n_frames = np.array([len(a) for a in animation_frames])
+        max_frames = int(self._n_frames.max())
+        self._img_dx = np.zeros((len(animation_frames), max_frames), "i4")
+        self._img_dy = np.zeros_like(self._img_dx)
+        self._img_w = np.zeros_like(self._img_dx)
+        self._img_h = np.zeros_like(self._img_dx)
+        for a, cuadros in enumerate(animation_frames):
+            for f, img in enumerate(cuadros):
+                if img is None:   # simulación sin gráficos
+                    continue
+                r = img.get_rect(midbottom=col.midbottom)
+                self._img_dx[a, f], self._img_dy[a, f] = r.x, r.y
+                self._img_w[a, f], self._img_h[a, f] = r.w, r.h
+
+        # vistas numpy del mapa y de los campos (se rehacen con world.version)
+        self._version = None
+        self._paso = None
+        self._tablas = {}
+
+    # ---------- ALMACENAMIENTO ----------
+    def _alocar(self, capacity):
+        for nombre, dtype in _CAMPOS.items():
+            setattr(self, nombre, np.zeros(capacity, dtype))
+        self.patrol = np.zeros((capacity, MAX_PUNTOS_PATRULLA, 2), "i4")
+
+    def _crecer(self):
+        viejos = {nombre: getattr(self, nombre) for nombre in _CAMPOS}
+        patrol = self.patrol
+        self._alocar(2 * len(self.px))
+        for nombre, arr in viejos.items():
+            getattr(self, nombre)[:self.n] = arr[:self.n]
+        self.patrol[:self.n] = patrol[:self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self._vistas)
+
+    def __getitem__(self, i):
+        return self._vistas[i]
+
+    def __contains__(self, vista):
+        return vista.swarm is self and vista.fila is not None
+
+    # ---------- ALTAS / BAJAS ----------
+    def spawn(self, x_tile, y_tile, now=None):
+        if self.n == len(self.px):
+            self._crecer()
+        i = self.n
+        self.n += 1
+        if now is None:
+            now = pygame.time.get_ticks()
+
+        self.px[i] = self.prev_px[i] = x_tile * TILE_SIZE
+        self.py[i] = self.prev_py[i] = y_tile * TILE_SIZE
+        self.vx[i] = self.vy[i] = 0.0
+        self.speed[i] = ENEMY_SPEED
+        self.state[i] = PATRULLA
+        self.action[i] = ENEMY_IDLE
+        self.frame_index[i] = 0
+        self.last_anim_update[i] = now
+        self.dir_x[i], self.dir_y[i] = self.rng.choice(_DIRS)
+        self.last_dir_change[i] = now
+
+        puntos = self._generar_puntos_patrulla(x_tile, y_tile)
+        self.n_puntos[i] = len(puntos)
+        self.patrol[i, :len(puntos)] = puntos
+        self.patrol_index[i] = 0
+
+        vista = SwarmEnemy(self, i)
+        self._vistas.append(vista)
+        return vista
+
+    def _generar_puntos_patrulla(self, x_tile, y_tile):
+        # como Enemy, pero sin comprobar con A* (no se siguen caminos)
+        world = self.world
+        puntos = [(x_tile, y_tile)]
+        intentos = 0
+        while len(puntos) < MAX_PUNTOS_PATRULLA and intentos < 60:
+            intentos += 1
+            nx = x_tile + self.rng.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
+            ny = y_tile + self.rng.randint(-PATROL_RADIUS_TILES, PATROL_RADIUS_TILES)
+            if not world.inside(nx, ny) or not world.enemy_can_pass(nx, ny):
+                continue
+            if (nx, ny) not in puntos:
+                puntos.append((nx, ny))
+        return puntos
+
+    def remove(self, vista):
+        """Saca al enemigo en O(1): la última fila pasa a ocupar su lugar."""
+        i = vista.fila
+        if i is None:
+            return
+        ultimo = self.n - 1
+        if i != ultimo:
+            for nombre in _CAMPOS:
+                arr = getattr(self, nombre)
+                arr[i] = arr[ultimo]
+            self.patrol[i] = self.patrol[ultimo]
+            movida = self._vistas[ultimo]
+            movida.fila = i
+            self._vistas[i] = movida
+        self._vistas.pop()
+        self.n -= 1
+        vista.fila = None
+
+    # ---------- INTERFAZ DE SPATIAL HASH ----------
+    # las filas ya están "indexadas": insertar y actualizar no hacen nada
+    def insert(self, vista, rect):
+        pass
+
+    def update(self, vista, rect=None):
+        pass
+
+    def query(self, rect):
+        """Enemigos cuya hitbox se superpone con `rect` (en bloque)."""
+        n = self.n
+        hx, hy, hw, hh = self._hitbox
+        x = self.px[:n].astype(np.int64) + hx
+        y = self.py[:n].astype(np.int64) + hy
+        choca = ((x < rect.right) & (x + hw > rect.left) &
+                 (y < rect.bottom) & (y + hh > rect.top))
+        return [self._vistas[i] for i in np.flatnonzero(choca)]
+
+    def query_tile(self, tile_x, tile_y, tile_size=TILE_SIZE):
+        return self.query(pygame.Rect(tile_x * tile_size, tile_y * tile_size,
+                                      tile_size, tile_size))
+
+    # ---------- MAPA Y CAMPOS COMO ARRAYS ----------
+    def _sincronizar_mapa(self):
+        world = self.world
+        if self._version != world.version:
+            self._version = world.version
+            self._paso = np.frombuffer(world.paso_enemigo, np.uint8).reshape(
+                world.height, world.width)
+            self._tablas.clear()
+
+    def _tabla_campo(self, campo):
+        """(x0, y0, tabla_cerca, tabla_lejos) con las distancias de `campo`
+        en un array denso con 1 casilla de margen. tabla_cerca pone _LEJOS
+        fuera del campo; tabla_lejos pone radio + 1 en las transitables
+        (igual que CampoDistancias.siguiente_paso al alejarse)."""
+        clave = (campo.origen, campo.version)
+        guardada = self._tablas.get(id(campo))
+        if guardada is not None and guardada[0] == clave:
+            return guardada[1]
+
+        world = self.world
+        if campo.radio is None:
+            # campo completo: se lee el array('i') tal cual, con un borde
+            x0 = y0 = -1
+            dist = np.full((world.height + 2, world.width + 2), INALCANZABLE,
+                           np.int64)
+            dist[1:-1, 1:-1] = np.frombuffer(
+                campo.valores(), np.intc).reshape(world.height, world.width)
+            lejos = dist
+        else:
+            h = campo.radio + 2
+            ox, oy = campo.origen
+            x0, y0 = ox - h, oy - h
+            lado = 2 * h + 1
+            dist = np.empty((lado, lado), np.int64)
+            transitable = np.zeros((lado, lado), bool)
+            for ly in range(lado):
+                for lx in range(lado):
+                    x, y = x0 + lx, y0 + ly
+                    dist[ly, lx] = campo.distancia(x, y)
+                    transitable[ly, lx] = (world.inside(x, y) and
+                                           world.enemy_can_pass(x, y))
+            lejos = np.where(dist != INALCANZABLE, dist,
+                             np.where(transitable, campo.radio + 1,
+                                      INALCANZABLE))
+        cerca = np.where(dist != INALCANZABLE, dist, _LEJOS)
+
+        tabla = (x0, y0, cerca, lejos)
+        self._tablas[id(campo)] = (clave, tabla)
+        return tabla
+
+    def _pasos_campo(self, campo, tx, ty, alejarse=False):
+        """Siguiente casilla según el campo para cada (tx, ty).
+        Devuelve (paso_x, paso_y, ok); ok=False donde no hay paso."""
+        x0, y0, cerca, lejos = self._tabla_campo(campo)
+        tabla = lejos if alejarse else cerca
+        alto, ancho = tabla.shape
+
+        lx = tx - x0
+        ly = ty - y0
+        dentro = (lx >= 1) & (lx < ancho - 1) & (ly >= 1) & (ly < alto - 1)
+        lx = np.clip(lx, 1, ancho - 2)
+        ly = np.clip(ly, 1, alto - 2)
+
+        actual = cerca[ly, lx]
+        vecinos = np.stack([tabla[ly + dy, lx + dx]
+                            for dx, dy in zip(_VECINOS_X, _VECINOS_Y)])
+        if alejarse:
+            mejor = vecinos.argmax(axis=0)
+            mejora = vecinos.max(axis=0) > actual
+        else:
+            mejor = vecinos.argmin(axis=0)
+            mejora = vecinos.min(axis=0) < actual
+
+        ok = dentro & (actual != _LEJOS) & mejora
+        paso_x = tx + np.take(_VECINOS_X, mejor)
+        paso_y = ty + np.take(_VECINOS_Y, mejor)
+        return paso_x, paso_y, ok
+
+    # ---------- VELOCIDADES ----------
+    def _velocidad_hacia(self, idx, tx, ty, speed_factor, cx, cy):
+        dx = tx - cx[idx]
+        dy = ty - cy[idx]
+        dist = np.hypot(dx, dy)
+        escala = np.divide(self.speed[idx] * speed_factor, dist,
+                           out=np.zeros(len(idx)), where=dist > 0)
+        self.vx[idx] = dx * escala
+        self.vy[idx] = dy * escala
+
+    def _hacia_campo(self, idx, campo, cx, cy, destino_x, destino_y,
+                     speed_factor, alejarse=False):
+        """Seguir el campo; donde no hay paso, línea recta al destino."""
+        tx = cx[idx] // TILE_SIZE
+        ty = cy[idx] // TILE_SIZE
+        if campo is not None:
+            paso_x, paso_y, ok = self._pasos_campo(campo, tx, ty, alejarse)
+            destino_x = np.where(ok, paso_x * TILE_SIZE + TILE_SIZE // 2,
+                                 destino_x)
+            destino_y = np.where(ok, paso_y * TILE_SIZE + TILE_SIZE // 2,
+                                 destino_y)
+        self._velocidad_hacia(idx, destino_x, destino_y, speed_factor, cx, cy)
+
+    # ---------- THINK ----------
+    def _centros(self):
+        n = self.n
+        cx = self.px[:n].astype(np.int64) + TILE_SIZE // 2
+        cy = self.py[:n].astype(np.int64) + TILE_SIZE // 2
+        return cx, cy
+
+    def _think(self, player, now):
+        world = self.world
+        cx, cy = self._centros()
+        pcx, pcy = player.collision_rect.center
+        dx = pcx - cx
+        dy = pcy - cy
+        persigue = dx * dx + dy * dy <= ENEMY_VISION_RADIUS ** 2
+        tile_jugador = (pcx // TILE_SIZE, pcy // TILE_SIZE)
+
+        # dentro del radio pero con un muro en medio: no lo ve
+        vision = world.vision()
+        if vision is not None:
+            for i in np.flatnonzero(persigue).tolist():
+                if not vision.visible((int(cx[i]) // TILE_SIZE,
+                                       int(cy[i]) // TILE_SIZE), tile_jugador):
+                    persigue[i] = False
+
+        # CHASE: bajar por el campo de persecución (o línea recta)
+        idx = np.flatnonzero(persigue)
+        if len(idx):
+            campo = world.campo_persecucion(tile_jugador)
+            self._hacia_campo(idx, campo, cx, cy, pcx, pcy, 1.2)
+            # ya en el tile del jugador: directo a él
+            junto = ((cx[idx] // TILE_SIZE == tile_jugador[0]) &
+                     (cy[idx] // TILE_SIZE == tile_jugador[1]))
+            if junto.any():
+                self._velocidad_hacia(idx[junto], pcx, pcy, 1.2, cx, cy)
+
+        n = self.n
+        state = self.state[:n]
+
+        # lo perdió de vista -> RETURN al punto de patrulla más cercano
+        perdio = np.flatnonzero(~persigue & (state == PERSIGUE))
+        if len(perdio):
+            state[perdio] = VUELVE
+            centros = self.patrol[perdio] * TILE_SIZE + TILE_SIZE // 2
+            ddx = centros[:, :, 0] - cx[perdio, None]
+            ddy = centros[:, :, 1] - cy[perdio, None]
+            d2 = (ddx * ddx + ddy * ddy).astype(float)
+            validos = (np.arange(MAX_PUNTOS_PATRULLA) <
+                       self.n_puntos[perdio, None])
+            d2[~validos] = np.inf
+            self.patrol_index[perdio] = d2.argmin(axis=1)
+        state[persigue] = PERSIGUE
+
+        # poca patrulla (0 o 1 punto): wander
+        libre = ~persigue
+        wander = libre & (self.n_puntos[:n] <= 1)
+        idx = np.flatnonzero(wander &
+                             (now - self.last_dir_change[:n] > 800))
+        if len(idx):
+            elegidas = np.take(_DIRS, self.np_rng.integers(0, 4, len(idx)), axis=0)
+            self.dir_x[idx] = elegidas[:, 0]
+            self.dir_y[idx] = elegidas[:, 1]
+            self.last_dir_change[idx] = now
+        idx = np.flatnonzero(wander)
+        self.vx[idx] = self.dir_x[idx] * self.speed[idx] * 0.6
+        self.vy[idx] = self.dir_y[idx] * self.speed[idx] * 0.6
+
+        # RETURN / PATROL hacia el punto actual
+        idx = np.flatnonzero(libre & ~wander)
+        if len(idx):
+            punto = self.patrol[idx, self.patrol_index[idx]]
+            tx = punto[:, 0] * TILE_SIZE + TILE_SIZE // 2
+            ty = punto[:, 1] * TILE_SIZE + TILE_SIZE // 2
+            ddx = tx - cx[idx]
+            ddy = ty - cy[idx]
+            llego = ddx * ddx + ddy * ddy < 4 ** 2   # 4 píxeles
+
+            fin = idx[llego]
+            state[fin[state[fin] == VUELVE]] = PATRULLA
+            self.patrol_index[fin] = (self.patrol_index[fin] + 1) % \
+                self.n_puntos[fin]
+            self.vx[fin] = 0.0
+            self.vy[fin] = 0.0
+
+            sigue = ~llego
+            self._velocidad_hacia(idx[sigue], tx[sigue], ty[sigue], 0.7, cx, cy)
+
+    def _think_cazador(self, player):
+        world = self.world
+        cx, cy = self._centros()
+        pcx, pcy = player.collision_rect.center
+        dx = pcx - cx
+        dy = pcy - cy
+        fear_radius = FEAR_RADIUS_TILES * TILE_SIZE
+        huye = dx * dx + dy * dy <= fear_radius * fear_radius
+
+        # HUIR: subir por el mapa de huida (o alejarse en línea recta)
+        idx = np.flatnonzero(huye)
+        if len(idx):
+            tile_jugador = (pcx // TILE_SIZE, pcy // TILE_SIZE)
+            campo = world.campo_huida(tile_jugador)
+            lejos_x = 2 * cx[idx] - pcx
+            lejos_y = 2 * cy[idx] - pcy
+            self._hacia_campo(idx, campo, cx, cy, lejos_x, lejos_y, 1.1,
+                              alejarse=True)
+
+        # lejos del jugador: ir a la salida
+        idx = np.flatnonzero(~huye)
+        if len(idx):
+            if world.end is None:
+                self.vx[idx] = 0.0
+                self.vy[idx] = 0.0
+                return
+            ex, ey = world.end
+            self._hacia_campo(idx, world.campo_salida(), cx, cy,
+                              ex * TILE_SIZE + TILE_SIZE // 2,
+                              ey * TILE_SIZE + TILE_SIZE // 2, 0.8)
+
+    # ---------- MOVIMIENTO CON COLISIÓN ----------
+    def _mover(self, dt):
+        """Igual que Enemy._move_axis: primero x, después y; se avanza solo
+        si el centro de la caja queda en una casilla de enemigo."""
+        n = self.n
+        paso = self._paso
+        alto, ancho = paso.shape
+        px, py = self.px[:n], self.py[:n]
+
+        for pos, vel, eje_x in ((px, self.vx[:n], True), (py, self.vy[:n], False)):
+            nueva = pos + vel * dt
+            if eje_x:
+                tx = (nueva.astype(np.int64) + TILE_SIZE // 2) // TILE_SIZE
+                ty = (py.astype(np.int64) + TILE_SIZE // 2) // TILE_SIZE
+            else:
+                tx = (px.astype(np.int64) + TILE_SIZE // 2) // TILE_SIZE
+                ty = (nueva.astype(np.int64) + TILE_SIZE // 2) // TILE_SIZE
+            dentro = (tx >= 0) & (tx < ancho) & (ty >= 0) & (ty < alto)
+            libre = dentro & (paso[np.clip(ty, 0, alto - 1),
+                                   np.clip(tx, 0, ancho - 1)] == 1)
+            np.copyto(pos, nueva, where=libre & (vel != 0))
+
+    # ---------- ANIMACIÓN ----------
+    def _animar(self, now):
+        n = self.n
+        vx, vy = self.vx[:n], self.vy[:n]
+        accion = np.where(
+            (vx == 0) & (vy == 0), ENEMY_IDLE,
+            np.where(np.abs(vy) >= np.abs(vx),
+                     np.where(vy < 0, ENEMY_RUN_UP, ENEMY_RUN_DOWN),
+                     np.where(vx < 0, ENEMY_RUN_LEFT, ENEMY_RUN_RIGHT)))
+
+        cambia = accion != self.action[:n]
+        self.action[:n] = accion
+        self.frame_index[:n][cambia] = 0
+        self.last_anim_update[:n][cambia] = now
+
+        avanza = now - self.last_anim_update[:n] > ANIM_COOLDOWN
+        self.frame_index[:n][avanza] = (
+            (self.frame_index[:n][avanza] + 1) % self._n_frames[accion[avanza]])
+        self.last_anim_update[:n][avanza] = now
+
+    # ---------- UPDATE GENERAL ----------
+    def update_all(self, dt, player, speed=None, cazador=False, now=None):
+        """Un paso de toda la población (modo Escapa o Cazador)."""
+        if self.n == 0:
+            return
+        self._sincronizar_mapa()
+        if now is None:
+            now = pygame.time.get_ticks()
+        if speed is not None:
+            self.speed[:self.n] = speed
+        if cazador:
+            self._think_cazador(player)
+        else:
+            self._think(player, now)
+        self.prev_px[:self.n] = self.px[:self.n]
+        self.prev_py[:self.n] = self.py[:self.n]
+        self._mover(dt)
+        self._animar(now)
+
+    # ---------- DIBUJO ----------
+    def draw(self, surface, camera=None, alpha=1.0):
+        n = self.n
+        if n == 0:
+            return
+        accion = self.action[:n]
+        cuadro = self.frame_index[:n]
+        # entre la posición del paso anterior y la actual
+        px, py = self.px[:n], self.py[:n]
+        if alpha < 1.0:
+            px = self.prev_px[:n] + (px - self.prev_px[:n]) * alpha
+            py = self.prev_py[:n] + (py - self.prev_py[:n]) * alpha
+        x = px.astype(np.int64) + self._img_dx[accion, cuadro]
+        y = py.astype(np.int64) + self._img_dy[accion, cuadro]
+
+        frames = self.animation_list
+        if camera is not None:
+            vista = camera.rect
+            w = self._img_w[accion, cuadro]
+            h = self._img_h[accion, cuadro]
+            visibles = np.flatnonzero((x < vista.right) & (x + w > vista.left) &
+                                      (y < vista.bottom) & (y + h > vista.top))
+            if camera.escalada:
+                # mismo redondeo que Camera.apply_pos, con los cuadros escalados
+                ox, oy = camera.scale_pos(vista.x, vista.y)
+                x = np.rint(x * camera.sx).astype(np.int64) - ox
+                y = np.rint(y * camera.sy).astype(np.int64) - oy
+                frames = [[camera.sprite(img) for img in anim]
+                          for anim in frames]
+            else:
+                x = x - vista.x
+                y = y - vista.y
+        else:
+            visibles = range(n)
+
+        surface.blits([(frames[accion[i]][cuadro[i]], (int(x[i]), int(y[i])))
+                       for i in visibles], doreturn=False)
@@ -0,0 +1,140 @@
+"""Textos ya rasterizados para HUD, menús, ayudas y pantallas de puntajes.
+
+font.render es caro y casi todo lo que se escribe en pantalla se repite
+cuadro a cuadro. TextCache guarda:
+
+- render(): cada (fuente, texto, color) rasterizado, con desalojo LRU.
+- draw(): campos del HUD que cambian solo en sus números (score, tiempo);
+  se arman con las partes de texto de render() y cada dígito de una caché
+  de glifos, sobre una Surface fija por campo, así "Tiempo: 12.3s" no se
+  rasteriza ni se aloca de nuevo al cambiar.
+- panel(): pantallas enteras de texto fijo (menú, ayuda, resultados)
+  compuestas una vez en una sola Surface, también con LRU (la Surface del
+  panel desalojado se reusa para el nuevo).
+"""
+import re
+from collections import OrderedDict
+
+import pygame
+
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, TEXT_CACHE_SIZE,
+                       PANEL_CACHE_SIZE)
+
+_DIGITOS = re.compile(r"(\d+)")
+
+
+class TextCache:
+    def __init__(self, capacidad=TEXT_CACHE_SIZE, paneles=PANEL_CACHE_SIZE):
+        self.capacidad = capacidad
+        self.capacidad_paneles = paneles
+        self._textos = OrderedDict()    # (font, texto, color) -> Surface
+        self._paneles = OrderedDict()   # (font, líneas, tamaño, fondo) -> Surface
+        self._glifos = {}               # (font, dígito, color) -> Surface
+        self._campos = {}               # (font, color, pos) -> [texto, Surface, w, h]
+
+    def render(self, font, text, color):
+        clave = (font, text, color)
+        img = self._textos.get(clave)
+        if img is not None:
+            self._textos.move_to_end(clave)
+            return img
+        img = self._textos[clave] = font.render(text, True, color)
+        if len(self._textos) > self.capacidad:
+            self._textos.popitem(last=False)
+        return img
+
+    def draw(self, surface, font, text, color, pos):
+        """Dibuja un campo del HUD en una posición fija. Devuelve el ancho.
+
+        Cada campo tiene una sola Surface, del ancho máximo que tuvo su
+        texto. Mientras el texto no cambie se reusa tal cual; cuando cambia
+        se limpia y se vuelven a pegar las partes de texto de render() y los
+        dígitos de la caché de glifos, sin rasterizar ni crear Surfaces.
+        """
+        clave = (font, color, pos)
+        campo = self._campos.get(clave)
+        if campo is None:
+            campo = self._campos[clave] = [None, None, 0, 0]
+        if campo[0] != text:
+            self._componer(campo, font, text, color)
+        _, img, w, h = campo
+        surface.blit(img, pos, (0, 0, w, h))
+        return w
+
+    def _componer(self, campo, font, text, color):
+        partes = []
+        for i, parte in enumerate(_DIGITOS.split(text)):
+            if not parte:
+                continue
+            if i % 2 == 0:
+                partes.append(self.render(font, parte, color))
+                continue
+            for ch in parte:
+                clave = (font, ch, color)
+                img = self._glifos.get(clave)
+                if img is None:
+                    img = self._glifos[clave] = font.render(ch, True, color)
+                partes.append(img)
+
+        w = sum(p.get_width() for p in partes)
+        h = max((p.get_height() for p in partes), default=font.get_height())
+        img = campo[1]
+        if img is None or img.get_width() < w or img.get_height() < h:
+            # un poco de margen: "9.9s" -> "10.0s" no vuelve a crecer
+            img = pygame.Surface((w + w // 4 + 1, h), pygame.SRCALPHA)
+        else:
+            img.fill((0, 0, 0, 0))
+        x = 0
+        for p in partes:
+            # las partes no se pisan: MAX sobre el fondo vacío las copia tal cual
+            img.blit(p, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += p.get_width()
+        campo[:] = (text, img, w, h)
+
+    def panel(self, font, lines, size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+              background=(0, 0, 0)):
+        """Surface de `size` con todas las líneas dibujadas sobre `background`.
+
+        lines es una tupla de (texto, color, x, y); x = None centra la
+        línea. Con un fondo de 4 componentes (RGBA) el panel es translúcido.
+        """
+        clave = (font, lines, size, background)
+        img = self._paneles.get(clave)
+        if img is not None:
+            self._paneles.move_to_end(clave)
+            return img
+
+        alfa = len(background) == 4
+        img = None
+        if len(self._paneles) >= self.capacidad_paneles:
+            # el panel que se desaloja presta su Surface si es igual
+            _, vieja = self._paneles.popitem(last=False)
+            if vieja.get_size() == size and \
+                    bool(vieja.get_flags() & pygame.SRCALPHA) == alfa:
+                img = vieja
+        if img is None:
+            if alfa:
+                img = pygame.Surface(size, pygame.SRCALPHA)
+            else:
+                img = pygame.Surface(size).convert()
+        img.fill(background)
+        for text, color, x, y in lines:
+            if not text:
+                continue
+            txt = self.render(font, text, color)
+            if x is None:
+                x = (size[0] - txt.get_width()) // 2
+            img.blit(txt, (x, y))
+
+        self._paneles[clave] = img
+        return img
+
+    def clear(self):
+        self._textos.clear()
+        self._paneles.clear()
+        self._glifos.clear()
+        self._campos.clear()
+
+
+# caché compartida por todas las pantallas
+TEXTOS = TextCache()
@@ -77,3 +77,52 @@ class Salida(Casilla):
 
     def get_codigo(self):
         return SALIDA
+
+
+# ---------- TABLAS POR CÓDIGO ----------
+# Reglas de paso indexadas por código de casilla (para el grid compacto).
+PASO_JUGADOR = {
+    CAMINO: True,
+    MURO: False,
+    TUNEL: True,
+    LIANA: False,
+    SALIDA: True,
+}
+
+PASO_ENEMIGO = {
+    CAMINO: True,
+    MURO: False,
+    TUNEL: False,
+    LIANA: True,
+    SALIDA: True,
+}
+
+# casillas a través de las que se ve (línea de visión de los enemigos)
+DEJA_VER = {
+    CAMINO: True,
+    MURO: False,
+    TUNEL: True,
+    LIANA: True,
+    SALIDA: True,
+}
+
+CLASES_CASILLA = {
+    CAMINO: Camino,
+    MURO: Muro,
+    TUNEL: Tunel,
+    LIANA: Liana,
+    SALIDA: Salida,
+}
+
+
+def crear_casilla(codigo, x, y):
+    """Crea el objeto Casilla que corresponde a un código."""
+    return CLASES_CASILLA[codigo](x, y)
+
+
+def tabla_paso(reglas):
+    """Tabla de 256 bytes para bytearray.translate (1 = puede pasar)."""
+    tabla = bytearray(256)
+    for codigo, pasa in reglas.items():
+        tabla[codigo] = 1 if pasa else 0
+    return bytes(tabla)
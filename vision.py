@@ -0,0 +1,168 @@
+"""Línea de visión de los enemigos, cacheada por casilla.
+
+Un enemigo ve al jugador si está dentro de ENEMY_VISION_RADIUS y la línea
+(Bresenham) entre sus casillas no cruza ningún muro. La primera vez que se
+pregunta desde una casilla se trazan las líneas a todas las casillas de la
+ventana de radio y se guarda el resultado (un byte por casilla de la
+ventana); después ver o no ver es una lectura de tabla. Cuando cambia el
+mapa (world.version) la tabla se descarta.
+
+ChunkVisionTable hace lo mismo en un ChunkedWorld, que no tiene grid plano:
+lee las casillas con get_codigo y cada ventana guarda las versiones de los
+chunks que cubre, así un set_tile solo invalida las ventanas de su chunk.
+"""
+from tiles import DEJA_VER, tabla_paso
+from constants import ENEMY_VISION_RADIUS, TILE_SIZE
+
+_TABLA_VISTA = tabla_paso(DEJA_VER)
+
+# ventanas guardadas en un mundo por chunks (se descartan las más viejas)
+_MAX_VENTANAS = 16384
+
+
+def linea(x0, y0, x1, y1):
+    """Casillas de la línea de Bresenham entre (x0, y0) y (x1, y1), sin los
+    extremos."""
+    if x0 == x1 and y0 == y1:
+        return
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    x, y = x0, y0
+    while True:
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x += sx
+        if e2 <= dx:
+            err += dx
+            y += sy
+        if x == x1 and y == y1:
+            return
+        yield x, y
+
+
+class VisionTable:
+    def __init__(self, world, radio=None):
+        """radio en casillas; por defecto el que cubre ENEMY_VISION_RADIUS
+        entre centros de casilla."""
+        self.world = world
+        if radio is None:
+            radio = ENEMY_VISION_RADIUS // TILE_SIZE + 1
+        self.radio = radio
+        self.lado = 2 * radio + 1
+
+        self._filas = {}        # índice de casilla -> ventana (1 = se ve)
+        self._version = None
+        self._transparente = None
+
+    def _validar(self):
+        world = self.world
+        if self._version != world.version:
+            self._filas.clear()
+            self._transparente = world.grid.translate(_TABLA_VISTA)
+            self._version = world.version
+
+    def visible(self, origen, destino):
+        """True si desde la casilla `origen` se ve la casilla `destino`."""
+        sx, sy = origen
+        dx = destino[0] - sx
+        dy = destino[1] - sy
+        r = self.radio
+        if dx > r or dx < -r or dy > r or dy < -r:
+            return False
+        if not self.world.inside(sx, sy):
+            return False
+        return self._fila(sx, sy)[(dy + r) * self.lado + dx + r] == 1
+
+    def _fila(self, sx, sy):
+        self._validar()
+        i = sy * self.world.width + sx
+        fila = self._filas.get(i)
+        if fila is None:
+            fila = self._filas[i] = self._calcular(sx, sy)
+        return fila
+
+    def _calcular(self, sx, sy):
+        world = self.world
+        w = world.width
+        h = world.height
+        r = self.radio
+        transparente = self._transparente
+        fila = bytearray(self.lado * self.lado)
+
+        j = 0
+        for ty in range(sy - r, sy + r + 1):
+            for tx in range(sx - r, sx + r + 1):
+                if 0 <= tx < w and 0 <= ty < h:
+                    for x, y in linea(sx, sy, tx, ty):
+                        if not transparente[y * w + x]:
+                            break
+                    else:
+                        fila[j] = 1
+                j += 1
+        return bytes(fila)
+
+    def __len__(self):
+        """Casillas con la ventana ya calculada."""
+        return len(self._filas)
+
+
+class ChunkVisionTable(VisionTable):
+    def _fila(self, sx, sy):
+        # guardada = [world.version, firma de chunks, ventana]; si el mundo
+        # no cambió desde la última consulta no hace falta mirar los chunks
+        world = self.world
+        i = sy * world.width + sx
+        guardada = self._filas.get(i)
+        if guardada is not None:
+            if guardada[0] == world.version:
+                return guardada[2]
+            firma = self._firma(sx, sy)
+            if guardada[1] == firma:
+                guardada[0] = world.version
+                return guardada[2]
+        else:
+            firma = self._firma(sx, sy)
+            if len(self._filas) >= _MAX_VENTANAS:
+                del self._filas[next(iter(self._filas))]
+        guardada = self._filas[i] = [world.version, firma,
+                                     self._calcular(sx, sy)]
+        return guardada[2]
+
+    def _firma(self, sx, sy):
+        """Versiones de los chunks que toca la ventana de (sx, sy)."""
+        world = self.world
+        c = world.chunk_size
+        r = self.radio
+        cx0 = max(sx - r, 0) // c
+        cx1 = min(sx + r, world.width - 1) // c
+        cy0 = max(sy - r, 0) // c
+        cy1 = min(sy + r, world.height - 1) // c
+        version = world.version_chunk
+        if cx0 == cx1 and cy0 == cy1:
+            return version(cx0, cy0)
+        return tuple(version(cx, cy) for cy in range(cy0, cy1 + 1)
+                     for cx in range(cx0, cx1 + 1))
+
+    def _calcular(self, sx, sy):
+        world = self.world
+        w = world.width
+        h = world.height
+        r = self.radio
+        codigo = world.get_codigo
+        fila = bytearray(self.lado * self.lado)
+
+        j = 0
+        for ty in range(sy - r, sy + r + 1):
+            for tx in range(sx - r, sx + r + 1):
+                if 0 <= tx < w and 0 <= ty < h:
+                    for x, y in linea(sx, sy, tx, ty):
+                        if not _TABLA_VISTA[codigo(x, y)]:
+                            break
+                    else:
+                        fila[j] = 1
+                j += 1
+        return bytes(fila)
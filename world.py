@@ -1,114 +1,289 @@
 import random
+import struct
+import pygame
 from tiles import *
+from generators import get_generador, generar_tuneles_y_lianas
+from fields import CampoDistancias
+from pathfinding import PathFinder
+from vision import VisionTable
+from spawn import SpawnService
+from constants import MAZE_GENERATOR, FLEE_FIELD_RADIUS, PURSUIT_FIELD_RADIUS
 
 TILE_SIZE = 32
 
+# la capa estática del mapa se cachea en bloques de BLOQUE_TILES x BLOQUE_TILES
+BLOQUE_TILES = 16
+# bloques máximos en caché cuando se dibuja con cámara (los lejanos se descartan)
+MAX_BLOQUES_CAPA = 48
+
+# formato binario: magia, versión, ancho, alto, start x/y, end x/y, seed
+_MAGIA = b"LAB1"
+_VERSION = 1
+_CABECERA = struct.Struct("<4sHIIIIIIQ")
+
+_ALTO_NIBBLE = bytes((b >> 4) & 0x0F for b in range(256))
+_BAJO_NIBBLE = bytes(b & 0x0F for b in range(256))
+_A_ALTO = bytes((b << 4) & 0xF0 for b in range(256))
+
+
+def _empaquetar_nibbles(grid):
+    n = len(grid)
+    pares = (n + 1) // 2
+    altos = bytes(grid[0::2]).translate(_A_ALTO)
+    bajos = bytes(grid[1::2]).ljust(pares, b"\0")
+    # OR byte a byte de las dos mitades usando enteros grandes
+    return (int.from_bytes(altos, "big") |
+            int.from_bytes(bajos, "big")).to_bytes(pares, "big")
+
+
+def _desempaquetar_nibbles(datos, n):
+    datos = bytes(datos[:(n + 1) // 2])
+    grid = bytearray(2 * len(datos))
+    grid[0::2] = datos.translate(_ALTO_NIBBLE)
+    grid[1::2] = datos.translate(_BAJO_NIBBLE)
+    del grid[n:]
+    return grid
+
+
+_TABLA_JUGADOR = tabla_paso(PASO_JUGADOR)
+_TABLA_ENEMIGO = tabla_paso(PASO_ENEMIGO)
+
+
+# ------------------------------------------------------------
+# Vista de objetos Casilla sobre el grid compacto
+# ------------------------------------------------------------
+class _FilaTiles:
+    def __init__(self, world, y):
+        self.world = world
+        self.y = y
+
+    def __len__(self):
+        return self.world.width
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.world.width
+        if not 0 <= x < self.world.width:
+            raise IndexError("x fuera del mundo")
+        return crear_casilla(self.world.get_codigo(x, self.y), x, self.y)
+
+    def __setitem__(self, x, tile):
+        if x < 0:
+            x += self.world.width
+        if not 0 <= x < self.world.width:
+            raise IndexError("x fuera del mundo")
+        self.world.set_tile(x, self.y, tile)
+
+    def __iter__(self):
+        for x in range(self.world.width):
+            yield self[x]
+
+
+class _VistaTiles:
+    """world.tiles[y][x] sigue devolviendo objetos Casilla,
+    pero se crean al vuelo a partir del código guardado en el grid."""
+
+    def __init__(self, world):
+        self.world = world
+
+    def __len__(self):
+        return self.world.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.world.height
+        if not 0 <= y < self.world.height:
+            raise IndexError("y fuera del mundo")
+        return _FilaTiles(self.world, y)
+
+    def __iter__(self):
+        for y in range(self.world.height):
+            yield self[y]
+
+
 class World:
-    def __init__(self, width, height):
+    def __init__(self, width, height, seed=None):
         self.width = width
         self.height = height
 
-        # matriz de tiles
-        self.tiles = [[None for _ in range(width)] for _ in range(height)]
+        # semilla del mapa: si no se da, se sortea una (y queda guardada)
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+
+        # grid compacto: un byte por casilla con su código (CAMINO, MURO, ...)
+        self.grid = bytearray([MURO]) * (width * height)
+
+        # máscaras de paso precalculadas (1 = puede pasar)
+        self.paso_jugador = self.grid.translate(_TABLA_JUGADOR)
+        self.paso_enemigo = self.grid.translate(_TABLA_ENEMIGO)
+
+        # matriz de tiles (vista de objetos sobre el grid)
+        self.tiles = _VistaTiles(self)
 
         self.start = None
         self.end = None
 
+        # se incrementa con cada cambio del mapa (invalida cachés derivadas)
+        self.version = 0
+
+        # campos de distancia compartidos por todos los enemigos
+        self._campo_salida = None
+        self._campo_huida = None
+        self._campo_persecucion = None
+        self._pathfinder = None
+        self._vision = None
+        self._spawns = None
+
+        # capa estática pre-compuesta: (bx, by) -> Surface
+        self._capa = {}
+        self._capa_sprites = None
+        self._tiles_sucios = set()
+        # los mismos bloques a la escala de la cámara (dibujo directo en pantalla)
+        self._capa_escalada = {}
+        self._capa_escala = None
+
     # ------------------------------------------------------------
     # Utilidades
     # ------------------------------------------------------------
     def inside(self, x, y):
         return 0 <= x < self.width and 0 <= y < self.height
 
-    def set_tile(self, x, y, tile):
-        self.tiles[y][x] = tile
-
-    # ------------------------------------------------------------
-    # LABERINTO POR DFS
-    # ------------------------------------------------------------
-    def _generar_laberinto_dfs(self):
-        for y in range(self.height):
-            for x in range(self.width):
-                self.set_tile(x, y, Muro(x, y))
+    def get_codigo(self, x, y):
+        return self.grid[y * self.width + x]
 
-        # 2. Punto inicial
-        if self.width > 2 and self.height > 2:
-            sx, sy = 1, 1
-        else:
-            sx, sy = 0, 0
-
-        self.start = (sx, sy)
-        self.set_tile(sx, sy, Camino(sx, sy))
+    def set_codigo(self, x, y, codigo):
+        i = y * self.width + x
+        self.grid[i] = codigo
+        self.paso_jugador[i] = _TABLA_JUGADOR[codigo]
+        self.paso_enemigo[i] = _TABLA_ENEMIGO[codigo]
+        self.version += 1
+        if self._capa:
+            self._tiles_sucios.add((x, y))
 
-        stack = [(sx, sy)]
-        visited = {(sx, sy)}
+    def set_tile(self, x, y, tile):
+        self.set_codigo(x, y, tile.get_codigo())
 
-        dirs = [(2, 0), (-2, 0), (0, 2), (0, -2)]
+    def fila_codigos(self, y, x0, x1):
+        """Códigos de la fila y entre x0 (incluido) y x1 (excluido)."""
+        fila = y * self.width
+        return self.grid[fila + x0:fila + x1]
 
-        while stack:
-            x, y = stack[-1]
+    def player_can_pass(self, x, y):
+        return self.paso_jugador[y * self.width + x] == 1
 
-            vecinos = []
-            for dx, dy in dirs:
-                nx = x + dx
-                ny = y + dy
-                if 0 < nx < self.width - 1 and 0 < ny < self.height - 1:
-                    if (nx, ny) not in visited:
-                        vecinos.append((nx, ny, dx, dy))
+    def enemy_can_pass(self, x, y):
+        return self.paso_enemigo[y * self.width + x] == 1
 
-            if vecinos:
-                nx, ny, dx, dy = random.choice(vecinos)
-                mx = x + dx // 2
-                my = y + dy // 2
+    def ensure_around(self, rects, radius=1):
+        """Mundo completo en memoria: no hay nada que cargar."""
+        pass
 
-                self.set_tile(mx, my, Camino(mx, my))
-                self.set_tile(nx, ny, Camino(nx, ny))
+    def _recalcular_mascaras(self):
+        self.paso_jugador = self.grid.translate(_TABLA_JUGADOR)
+        self.paso_enemigo = self.grid.translate(_TABLA_ENEMIGO)
+        self.version += 1
 
-                visited.add((nx, ny))
-                stack.append((nx, ny))
-            else:
-                stack.pop()
+    # ------------------------------------------------------------
+    # GENERACIÓN COMPLETA DEL MUNDO
+    # ------------------------------------------------------------
+    def generate(self, generador=None, seed=None):
+        """Genera el laberinto con el algoritmo `generador` (ver
+        generators.GENERADORES; por defecto MAZE_GENERATOR). Con la misma
+        seed sale el mismo mapa; sin seed se usa la del mundo."""
+        if generador is None:
+            generador = MAZE_GENERATOR
+        if seed is not None:
+            self.seed = seed
+        rng = random.Random(self.seed)
+
+        self.grid[:] = get_generador(generador)(self.width, self.height, rng)
 
+        if self.width > 2 and self.height > 2:
+            self.start = (1, 1)
+        else:
+            self.start = (0, 0)
 
         ex, ey = self.width - 2, self.height - 2
         self.end = (ex, ey)
-        self.set_tile(ex, ey, Camino(ex, ey))
+        self.grid[ey * self.width + ex] = SALIDA
+
+        generar_tuneles_y_lianas(self.grid, self.width, self.height, rng,
+                                 excluir=(self.start, self.end))
+        self._recalcular_mascaras()
+        self.invalidar_capa()
 
     # ------------------------------------------------------------
-    # TÚNELES Y LIANAS EN MUROS
+    # CAMPOS DE DISTANCIA
     # ------------------------------------------------------------
-    def _generar_tuneles_y_lianas(self):
-        for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-
-                if (x, y) == self.start or (x, y) == self.end:
-                    continue
-
-                tile = self.tiles[y][x]
-
-                if not isinstance(tile, Muro):
-                    continue
-
-                arriba = self.tiles[y - 1][x]
-                abajo = self.tiles[y + 1][x]
-
-                if isinstance(arriba, Camino) and isinstance(abajo, Camino):
-                    r = random.random()
-                    if r < 0.06:
-                        self.set_tile(x, y, Tunel(x, y))
-                    elif r < 0.12:
-                        self.set_tile(x, y, Liana(x, y))
+    def campo_salida(self):
+        """Distancia a la salida por casillas de enemigo (se hace una vez)."""
+        if self.end is None:
+            return None
+        if self._campo_salida is None:
+            self._campo_salida = CampoDistancias(self)
+        self._campo_salida.actualizar(self.end)
+        return self._campo_salida
+
+    def campo_huida(self, tile_jugador):
+        """Distancia al jugador (acotada); solo se rehace si cambia de tile."""
+        if self._campo_huida is None:
+            self._campo_huida = CampoDistancias(self, radio=FLEE_FIELD_RADIUS)
+        self._campo_huida.actualizar(tile_jugador)
+        return self._campo_huida
+
+    def campo_persecucion(self, tile_jugador):
+        """Distancia al jugador para los cazadores de Escapa. Es uno solo
+        para todos y se actualiza (incremental) al cambiar de tile."""
+        if self._campo_persecucion is None:
+            self._campo_persecucion = CampoDistancias(
+                self, radio=PURSUIT_FIELD_RADIUS)
+        self._campo_persecucion.actualizar(tile_jugador)
+        return self._campo_persecucion
+
+    def pathfinder(self):
+        """Servicio A* compartido por todos los enemigos de este mundo."""
+        if self._pathfinder is None:
+            self._pathfinder = PathFinder(self)
+        return self._pathfinder
+
+    def vision(self):
+        """Línea de visión de los enemigos (tabla por casilla, compartida)."""
+        if self._vision is None:
+            self._vision = VisionTable(self)
+        return self._vision
+
+    def spawns(self):
+        """Casillas de spawn de enemigos (compartido)."""
+        if self._spawns is None:
+            self._spawns = SpawnService(self)
+        return self._spawns
 
     # ------------------------------------------------------------
-    # GENERACIÓN COMPLETA DEL MUNDO
+    # SERIALIZACIÓN BINARIA
     # ------------------------------------------------------------
-    def generate(self):
-        self._generar_laberinto_dfs()
-
-        ex, ey = self.end
-        self.set_tile(ex, ey, Salida(ex, ey))
-
-        self._generar_tuneles_y_lianas()
+    def to_bytes(self):
+        """Cabecera fija + grid empaquetado a 2 casillas por byte (nibbles)."""
+        cabecera = _CABECERA.pack(_MAGIA, _VERSION, self.width, self.height,
+                                  self.start[0], self.start[1],
+                                  self.end[0], self.end[1], self.seed)
+        return cabecera + _empaquetar_nibbles(self.grid)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = memoryview(data)
+        (magia, version, width, height,
+         sx, sy, ex, ey, seed) = _CABECERA.unpack_from(data)
+        if magia != _MAGIA or version != _VERSION:
+            raise ValueError("datos de mapa inválidos o de otra versión")
+
+        world = cls(width, height, seed)
+        world.grid[:] = _desempaquetar_nibbles(data[_CABECERA.size:],
+                                               width * height)
+        world.start = (sx, sy)
+        world.end = (ex, ey)
+        world._recalcular_mascaras()
+        return world
 
     # ------------------------------------------------------------
     # COLISIONES
@@ -120,7 +295,7 @@ class World:
         if not self.inside(tile_x, tile_y):
             return False
 
-        return self.tiles[tile_y][tile_x].puede_pasar_jugador()
+        return self.paso_jugador[tile_y * self.width + tile_x] == 1
 
     def can_enemy_rect_move(self, rect):
         tile_x = rect.centerx // TILE_SIZE
@@ -129,7 +304,7 @@ class World:
         if not self.inside(tile_x, tile_y):
             return False
 
-        return self.tiles[tile_y][tile_x].puede_pasar_enemigo()
+        return self.paso_enemigo[tile_y * self.width + tile_x] == 1
 
     def get_tile_at_rect_center(self, rect):
         tile_x = rect.centerx // TILE_SIZE
@@ -139,11 +314,92 @@ class World:
         return self.tiles[tile_y][tile_x]
 
     # ------------------------------------------------------------
-    # DIBUJO
+    # DIBUJO (CAPA ESTÁTICA CACHEADA)
     # ------------------------------------------------------------
-    def draw(self, surface, sprites):
-        for y in range(self.height):
-            for x in range(self.width):
-                tile = self.tiles[y][x]
-                img = sprites[tile.get_codigo()]
-                surface.blit(img, (x * TILE_SIZE, y * TILE_SIZE))
+    def invalidar_capa(self):
+        self._capa = {}
+        self._capa_escalada = {}
+        self._tiles_sucios = set()
+
+    def _construir_bloque(self, bx, by, sprites):
+        x0 = bx * BLOQUE_TILES
+        y0 = by * BLOQUE_TILES
+        x1 = min(x0 + BLOQUE_TILES, self.width)
+        y1 = min(y0 + BLOQUE_TILES, self.height)
+
+        bloque = pygame.Surface(((x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE))
+        if pygame.display.get_surface() is not None:
+            bloque = bloque.convert()
+
+        for y in range(y0, y1):
+            py = (y - y0) * TILE_SIZE
+            for i, codigo in enumerate(self.fila_codigos(y, x0, x1)):
+                bloque.blit(sprites[codigo], (i * TILE_SIZE, py))
+        return bloque
+
+    def _repintar_sucios(self, sprites):
+        # solo se repintan las casillas que cambiaron dentro de bloques ya hechos
+        for x, y in self._tiles_sucios:
+            clave = (x // BLOQUE_TILES, y // BLOQUE_TILES)
+            bloque = self._capa.get(clave)
+            if bloque is None:
+                continue
+            # la versión escalada se rehace desde el bloque ya repintado
+            self._capa_escalada.pop(clave, None)
+            img = sprites[self.get_codigo(x, y)]
+            bloque.blit(img, ((x % BLOQUE_TILES) * TILE_SIZE,
+                              (y % BLOQUE_TILES) * TILE_SIZE))
+        self._tiles_sucios = set()
+
+    def draw(self, surface, sprites, camera=None):
+        if sprites is not self._capa_sprites:
+            self.invalidar_capa()
+            self._capa_sprites = sprites
+        if self._tiles_sucios:
+            self._repintar_sucios(sprites)
+
+        bloques_x = (self.width + BLOQUE_TILES - 1) // BLOQUE_TILES
+        bloques_y = (self.height + BLOQUE_TILES - 1) // BLOQUE_TILES
+        paso = BLOQUE_TILES * TILE_SIZE
+
+        if camera is None:
+            bx0, by0, bx1, by1 = 0, 0, bloques_x, bloques_y
+            ox, oy = 0, 0
+        else:
+            # solo los bloques que tocan la vista
+            bx0, by0, bx1, by1 = camera.tile_range(paso, bloques_x, bloques_y)
+            ox, oy = camera.rect.x, camera.rect.y
+
+        escalada = camera is not None and camera.escalada
+        if escalada and self._capa_escala != (camera.sx, camera.sy):
+            self._capa_escalada = {}
+            self._capa_escala = (camera.sx, camera.sy)
+
+        for by in range(by0, by1):
+            for bx in range(bx0, bx1):
+                bloque = self._capa.get((bx, by))
+                if bloque is None:
+                    bloque = self._construir_bloque(bx, by, sprites)
+                    self._capa[(bx, by)] = bloque
+                if not escalada:
+                    surface.blit(bloque, (bx * paso - ox, by * paso - oy))
+                    continue
+
+                x, y = bx * paso, by * paso
+                img = self._capa_escalada.get((bx, by))
+                if img is None:
+                    # bordes desde coordenadas absolutas: sin costuras entre bloques
+                    x0, y0 = camera.scale_pos(x, y)
+                    x1, y1 = camera.scale_pos(x + bloque.get_width(),
+                                              y + bloque.get_height())
+                    img = pygame.transform.scale(bloque, (x1 - x0, y1 - y0))
+                    self._capa_escalada[(bx, by)] = img
+                surface.blit(img, camera.apply_pos(x, y))
+
+        if camera is not None and len(self._capa) > MAX_BLOQUES_CAPA:
+            # descartar bloques fuera de la vista para acotar la memoria
+            for clave in list(self._capa):
+                bx, by = clave
+                if not (bx0 <= bx < bx1 and by0 <= by < by1):
+                    del self._capa[clave]
+                    self._capa_escalada.pop(clave, None)